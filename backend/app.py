@@ -1,20 +1,32 @@
 # app.py
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import datetime
+import json
+import os
+import time
+from typing import Dict, List, Optional, Set
 import pytz
 from database import Database
 from graph_connector import GraphConnector
 
-from nlp_processor import NLPProcessor
-from relation_processor import RelationProcessor
 from src.give import get_word_definition
+from src.dictionary_index import DictionaryIndex
 # from src.relation_extractor import cleanup
 # from recommend import ArticleRecommender
-from src.fetch_content import fetch_content
+from src.fetch_content import fetch_content_async
+from src.async_fetcher import AsyncFetcher
+from src.fetch_cache import FetchCache
 from src.pkm_processor import PKMProcessor
+from src.link_candidates import CorpusLinkIndex
+from src.result_cache import ResultCache, compute_cache_version, content_key, url_key
+from src.component_loader import ComponentLoader, ComponentNotReady
+from src.concurrency import ConcurrencyLimiter, ConcurrencyLimitExceeded
 
 app = FastAPI()
 
@@ -22,6 +34,10 @@ class InputText(BaseModel):
     # text: str = None
     url: str = None
 
+class BulkInput(BaseModel):
+    urls: List[str]
+    save: bool = True
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -30,123 +46,775 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-nlp_processor = NLPProcessor()
-relation_processor = RelationProcessor(
-    model_path='results/models/hgnn_model.pth',
-    pmi_path='data/pairwise_pmi_values3.json'
-)
+DICTIONARY_PATH = "./data/json/dictionary.json"
+# 정의 검색용 사전 색인은 시작 시 한 번만 생성 (파일 변경 시 자동 재로딩)
+dictionary_index = DictionaryIndex.shared(DICTIONARY_PATH)
+
+HGNN_MODEL_PATH = 'results/models/hgnn_model.pth'
+PMI_PATH = 'data/pairwise_pmi_values3.json'
+EMBEDDING_TABLE_DIR = 'data/embeddings/kf-deberta'
+TFIDF_MODEL_PATH = 'data/models/tfidf_vectorizer.joblib'
+# 멀티 워커 모드: src/shared_state 로 내보낸 어휘/특징 CSR/L 디렉터리 (없으면 PMI 파일에서 직접 생성)
+SHARED_STATE_DIR = os.getenv("SHARED_STATE_DIR")
+# fork 전에 부모 프로세스에서 미리 로드할 구성 요소 (gunicorn.conf.py 에서 설정)
+PRELOAD_COMPONENTS = [name.strip() for name in os.getenv("PRELOAD_COMPONENTS", "").split(",") if name.strip()]
+# /service/stream 응답 형식 (한 줄에 JSON 하나)
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# 모델 로드 대기 중 503 응답에 실어 보낼 재시도 간격(초)
+RETRY_AFTER_SECONDS = 5
+# /save_article 쓰기 지연 모드 (1 이면 버퍼에 모아 SAVE_BATCH_SIZE 개 또는 SAVE_FLUSH_INTERVAL_MS 마다 묶음 기록)
+SAVE_WRITE_BEHIND = os.getenv("SAVE_WRITE_BEHIND", "0") == "1"
+SAVE_BATCH_SIZE = int(os.getenv("SAVE_BATCH_SIZE", "50"))
+SAVE_FLUSH_INTERVAL_MS = int(os.getenv("SAVE_FLUSH_INTERVAL_MS", "200"))
+# /articles/page: 선택 가능한 필드, 기본 필드(목록 화면에는 본문/그래프 제외), 페이지 크기
+ARTICLE_FIELDS = ("title", "date", "url", "content", "hypergraph_data", "created_at")
+ARTICLE_LIST_FIELDS = ("title", "date", "url", "created_at")
+DEFAULT_ARTICLES_PAGE_SIZE = 20
+MAX_ARTICLES_PAGE_SIZE = 100
+# GET /articles 스트리밍 시 한 번에 읽는 기사 수 (문서 간 엣지도 이 단위로 조회)
+ARTICLES_STREAM_BATCH_SIZE = int(os.getenv("ARTICLES_STREAM_BATCH_SIZE", "200"))
+
+
+# 무거운 모듈(koalanlp, torch, transformers, keybert ...)은 로더 스레드 안에서 import
+def load_jvm():
+    from nlp_processor import initialize_jvm
+    initialize_jvm()
+
+
+def load_encoder():
+    from src.embedding_table import EmbeddingTable
+    from src.encoder_service import EncoderService
+    return EncoderService(embedding_table=EmbeddingTable.load(EMBEDDING_TABLE_DIR))
+
+
+def load_nlp_processor(_, encoder):
+    from nlp_processor import NLPProcessor
+    return NLPProcessor(encoder=encoder, tfidf_model_path=TFIDF_MODEL_PATH)
+
+
+def load_relation_processor():
+    from relation_processor import RelationProcessor
+    return RelationProcessor(
+        model_path=HGNN_MODEL_PATH,
+        pmi_path=PMI_PATH,
+        shared_state_dir=SHARED_STATE_DIR
+    )
+
+
+# JVM / 인코더 / HGNN 은 서로 독립적이므로 동시에 로드하고, NLP 처리기는 JVM 과 인코더를 기다림
+components = ComponentLoader()
+components.register("jvm", load_jvm)
+components.register("encoder", load_encoder)
+components.register("relation_processor", load_relation_processor)
+components.register("nlp_processor", load_nlp_processor, depends_on=("jvm", "encoder"))
+
+# JVM 은 fork 후 자식 프로세스에서 쓸 수 없으므로 미리 로드할 수 없음 (워커마다 시작)
+if "jvm" in PRELOAD_COMPONENTS or "nlp_processor" in PRELOAD_COMPONENTS:
+    raise ValueError("jvm / nlp_processor 는 워커 프로세스에서 로드해야 합니다")
+components.preload(PRELOAD_COMPONENTS)
+
+# 분석 결과 캐시: 모델/PMI/사전 파일이 바뀌면 버전이 달라져 이전 결과는 무효화
+CACHE_VERSION_FILES = [
+    HGNN_MODEL_PATH,
+    PMI_PATH,
+    DICTIONARY_PATH,
+    TFIDF_MODEL_PATH,
+    f"{EMBEDDING_TABLE_DIR}/terms.json",
+]
+# 2단계 캐시 저장소로 MongoDB analysis_cache 컬렉션(Database) 사용
+result_cache = ResultCache(compute_cache_version(CACHE_VERSION_FILES), store=Database)
+
+# 분석 단계(DAON 태깅, 트랜스포머, HGNN)를 실행하는 스레드 수와 동시에 받을 분석 요청 수
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "8"))
+FETCH_CONNECT_TIMEOUT_SECONDS = float(os.getenv("FETCH_CONNECT_TIMEOUT_SECONDS", "3"))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FETCH_TIMEOUT_SECONDS", "10"))
+FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT", "4"))
+FETCH_MAX_RETRIES = int(os.getenv("FETCH_MAX_RETRIES", "2"))
+FETCH_CACHE_DIR = os.getenv("FETCH_CACHE_DIR", "data/cache/fetch")
+FETCH_CACHE_TTL_SECONDS = float(os.getenv("FETCH_CACHE_TTL_SECONDS", "3600"))
+
+# /service/bulk: 요청당 URL 수, 동시 크롤링 수, 크롤링→분석 큐 크기, 분석 워커 수, insert_many 묶음 크기
+MAX_BULK_URLS = int(os.getenv("MAX_BULK_URLS", "300"))
+BULK_FETCH_CONCURRENCY = int(os.getenv("BULK_FETCH_CONCURRENCY", "16"))
+BULK_QUEUE_SIZE = int(os.getenv("BULK_QUEUE_SIZE", "32"))
+BULK_ANALYSIS_WORKERS = int(os.getenv("BULK_ANALYSIS_WORKERS", str(ANALYSIS_WORKERS)))
+BULK_SAVE_BATCH_SIZE = int(os.getenv("BULK_SAVE_BATCH_SIZE", "20"))
+
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis")
+analysis_limiter = ConcurrencyLimiter(MAX_CONCURRENT_ANALYSES)
+fetcher: AsyncFetcher = None
+# 저장 후 문서 간 연결 작업 (응답과 별개로 실행). 후보 목록 조회와 PMI 계산이 몰리지 않도록 한 번에 하나씩 처리
+link_tasks: Set["asyncio.Task"] = set()
+link_lock: Optional[asyncio.Lock] = None
+# 저장된 전체 기사의 연결 색인 (후보 색인 + 출현 수 합계). 처음 연결할 때 한 번 만들고 저장/삭제 때 갱신
+link_index: Optional[CorpusLinkIndex] = None
+link_index_synced_at: Optional[datetime.datetime] = None
+# 삭제된 기사 id. 연결 계산이 스레드에서 색인을 읽는 중일 수 있어 다음 동기화 때 link_lock 안에서 제거
+link_index_removed: Set[str] = set()
+# 다른 워커가 저장한 기사를 반영할 때 다시 읽는 겹침 구간 (쓰기 지연 버퍼는 updated_at 보다 늦게 기록될 수 있음)
+LINK_INDEX_SYNC_OVERLAP_SECONDS = int(os.getenv("LINK_INDEX_SYNC_OVERLAP_SECONDS", "60"))
+# 기사 페이지 디스크 캐시 (TTL 이후에는 조건부 요청으로 재검증)
+fetch_cache = FetchCache(FETCH_CACHE_DIR, FETCH_CACHE_TTL_SECONDS)
 # recommender = ArticleRecommender()
 
 @app.post("/service")
 async def main(input: InputText):
     local_tz = pytz.timezone("Asia/Seoul")
+    print("request_time:", datetime.datetime.now(local_tz))
+    result_cache.set_version(compute_cache_version(CACHE_VERSION_FILES))
+
+    # 같은 URL 은 크롤링 없이 캐시된 결과 반환 (동시 처리 한도와 무관)
+    cached, tier = await lookup_url_cache(input)
+    if cached is not None:
+        cached.update(response_time=datetime.datetime.now(local_tz).isoformat(), timings={}, cache=tier)
+        return JSONResponse(cached)
+
+    # 크롤링과 분석은 동시 처리 한도 안에서만 수행 (초과 시 429)
+    with analysis_limiter.slot():
+        try:
+            events = [event async for event in iter_service_events(input)]
+        except ComponentNotReady:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    result = events_to_result(events)
+    result["response_time"] = datetime.datetime.now(local_tz).isoformat()
+    return JSONResponse(result)
+
+
+@app.post("/service/stream")
+async def service_stream(input: InputText):
+    """
+    /service 의 단계별 스트리밍 버전 (NDJSON, 한 줄에 한 단계)
+    article → nodes → edges → connector_edges → definitions → done 순서로
+    각 단계가 끝나는 즉시 전송. 오류는 {"stage": "error"} 줄로 전달
+    """
+    result_cache.set_version(compute_cache_version(CACHE_VERSION_FILES))
+
+    cached, tier = await lookup_url_cache(input)
+    if cached is not None:
+        events = cached_events(cached) + [("done", {"timings": {}, "cache": tier})]
+        return StreamingResponse(iter_ndjson(events), media_type=NDJSON_MEDIA_TYPE)
+
+    # 한도 초과 여부는 스트림을 시작하기 전에 판단하여 429 로 응답
+    analysis_limiter.acquire()
+    released = False
+
+    def release():
+        # 스트림 종료 시와 응답 후 백그라운드 작업 양쪽에서 불릴 수 있으므로 한 번만 반납
+        nonlocal released
+        if not released:
+            released = True
+            analysis_limiter.release()
+
+    async def stream():
+        try:
+            async for line in iter_ndjson(iter_service_events(input)):
+                yield line
+        except Exception as e:
+            yield encode_event("error", {"detail": str(e)})
+        finally:
+            release()
+
+    # 스트림이 시작되기 전에 연결이 끊겨 생성기가 실행되지 않아도 응답 처리 후 슬롯을 반납
+    return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE, background=BackgroundTask(release))
+
+
+@app.post("/service/bulk")
+async def service_bulk(input: BulkInput):
+    """
+    URL 목록 일괄 분석 (+ 저장)
+    크롤링(동시 BULK_FETCH_CONCURRENCY 개) → 제한된 큐 → 분석 워커(BULK_ANALYSIS_WORKERS 개) → insert_many 묶음 저장
+    URL 별 상태와 전체 처리량을 반환
+    """
+    urls = list(dict.fromkeys(url.strip() for url in input.urls if url and url.strip()))
+    if not urls:
+        raise HTTPException(status_code=400, detail="urls 가 비어 있습니다")
+    if len(urls) > MAX_BULK_URLS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BULK_URLS}개의 URL 만 처리할 수 있습니다")
+
+    result_cache.set_version(compute_cache_version(CACHE_VERSION_FILES))
+    # 일괄 작업 하나가 분석 슬롯 하나를 차지 (동시에 여러 일괄 작업이 몰리면 429)
+    with analysis_limiter.slot():
+        return await run_bulk_pipeline(urls, input.save)
+
+
+async def run_bulk_pipeline(urls: List[str], save: bool) -> dict:
+    started = time.perf_counter()
+    statuses = {url: {"url": url, "status": "pending"} for url in urls}
+    # 분석이 밀리면 큐가 차서 크롤링이 멈춤 (메모리에 쌓이는 기사 수 제한)
+    queue: "asyncio.Queue" = asyncio.Queue(maxsize=BULK_QUEUE_SIZE)
+    fetch_semaphore = asyncio.Semaphore(BULK_FETCH_CONCURRENCY)
+    save_buffer: List[tuple] = []
+    save_lock = asyncio.Lock()
+    stage_ms = {"fetch": 0.0, "analysis": 0.0, "save": 0.0}
+
+    async def flush(force: bool = False):
+        async with save_lock:
+            if not save_buffer or (not force and len(save_buffer) < BULK_SAVE_BATCH_SIZE):
+                return
+            batch = list(save_buffer)
+            save_buffer.clear()
+            save_started = time.perf_counter()
+            try:
+                # 문서 간 연결은 저장 후 훅(schedule_link)이 백그라운드에서 처리
+                article_ids = await Database.save_articles([article for _, article in batch])
+                for (url, _), article_id in zip(batch, article_ids):
+                    statuses[url].update(status="saved", article_id=article_id)
+            except Exception as e:
+                print(f"일괄 저장 중 오류 발생: {e}")
+                for url, _ in batch:
+                    statuses[url].update(status="save_failed", error=str(e))
+            stage_ms["save"] += (time.perf_counter() - save_started) * 1000
+
+    async def fetch_one(url: str):
+        async with fetch_semaphore:
+            fetch_started = time.perf_counter()
+            try:
+                cached, tier = await lookup_url_cache(InputText(url=url))
+                article = None if cached is not None else await fetch_article(url)
+            except Exception as e:
+                statuses[url].update(status="fetch_failed", error=str(e))
+                return
+            finally:
+                stage_ms["fetch"] += (time.perf_counter() - fetch_started) * 1000
+        await queue.put((url, article, cached, tier))
+
+    async def analysis_worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            url, article, cached, tier = item
+            analysis_started = time.perf_counter()
+            try:
+                if cached is not None:
+                    result = dict(cached, cache=tier)
+                else:
+                    result = events_to_result([event async for event in iter_article_events(article, url)])
+                statuses[url].update(status="analyzed", title=result.get("title", ""), cache=result.get("cache"))
+            except Exception as e:
+                statuses[url].update(status="analysis_failed", error=str(e))
+                continue
+            finally:
+                stage_ms["analysis"] += (time.perf_counter() - analysis_started) * 1000
+
+            if not has_article_content(result.get("content", "")):
+                statuses[url]["status"] = "no_content"
+            elif save:
+                save_buffer.append((url, result))
+                await flush()
+
+    workers = [asyncio.create_task(analysis_worker()) for _ in range(BULK_ANALYSIS_WORKERS)]
+    try:
+        await asyncio.gather(*(fetch_one(url) for url in urls))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+    await flush(force=True)
+
+    elapsed = time.perf_counter() - started
+    counts: Dict[str, int] = {}
+    for status in statuses.values():
+        counts[status["status"]] = counts.get(status["status"], 0) + 1
+    succeeded = counts.get("saved", 0) + counts.get("analyzed", 0)
+    return {
+        "results": [statuses[url] for url in urls],
+        "summary": {
+            "total": len(urls),
+            "succeeded": succeeded,
+            "failed": len(urls) - succeeded,
+            "status_counts": counts,
+            "elapsed_seconds": round(elapsed, 2),
+            "articles_per_minute": round(succeeded / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            # 단계별 누적 시간 (동시 실행되므로 합이 경과 시간보다 클 수 있음)
+            "stage_ms": {stage: round(ms, 1) for stage, ms in stage_ms.items()}
+        }
+    }
+
+
+def encode_event(stage: str, payload: dict) -> str:
+    return json.dumps(dict(payload, stage=stage), ensure_ascii=False) + "\n"
+
+
+async def iter_ndjson(events):
+    """(단계, 데이터) 목록 또는 비동기 이터레이터를 NDJSON 줄로 변환"""
+    if hasattr(events, "__aiter__"):
+        async for stage, payload in events:
+            yield encode_event(stage, payload)
+    else:
+        for stage, payload in events:
+            yield encode_event(stage, payload)
+
+
+async def lookup_url_cache(input: InputText):
+    if not input.url:
+        return None, None
+    cached, tier = await result_cache.get(url_key(input.url))
+    if cached is not None:
+        print(f"\n캐시 적중({tier}): {input.url}")
+    return cached, tier
+
+
+async def iter_service_events(input: InputText):
+    """
+    /service 와 /service/stream 이 공유하는 단계 이벤트 생성기
+    크롤링 → (본문 캐시 또는 분석 단계) → done. 분석이 끝나면 결과를 캐시에 저장
+    """
+    article = await fetch_article(input.url)
+    async for event in iter_article_events(article, input.url):
+        yield event
+
+
+async def fetch_article(input_url: str) -> dict:
+    """기사 크롤링 (디스크 캐시 / 조건부 요청 사용)"""
     title = ""
     date = ""
     url = ""
     content = ""
 
-    print("request_time:", datetime.datetime.now(local_tz))
-
-    if input.url:
-        print("\nurl입력: ", input.url)
-        article_data = fetch_content(input.url)
+    if input_url:
+        print("\nurl입력: ", input_url)
+        article_data = await fetch_content_async(input_url, fetcher, fetch_cache)
         print("\n크롤링 완료\n")
 
         if isinstance(article_data, dict):
             content = article_data.get("content", "No content found.")
             title = article_data.get("title", "No title found.")
             date = article_data.get("date", "No date found.")
-            url = article_data.get("url", input.url)
+            url = article_data.get("url", input_url)
 
     print("received_title:\n", title)
     print("received_date:\n", date)
     print("received_url:\n", url)
     print("received_text:\n", content)
 
-    try:
-        # 1. NLP 처리 및 그래프 생성
-        graph_data = nlp_processor.process_text(content)
-        print("\nresult:", graph_data)
+    return {"title": title, "date": date, "url": url, "content": content}
 
-        # 2. 관계 분류
-        enhanced_graph = relation_processor.classify_relations(graph_data)
-        print("\nenhanced result:", enhanced_graph)
 
-        # 3. 고립 그래프 연결
-        connector = GraphConnector(enhanced_graph, content)  # content 전달
-        final_graph = connector.connect_isolated_graphs(relation_processor)
-        print("\nfinal result:", final_graph)
+async def iter_article_events(article: dict, input_url: str = None):
+    """크롤링된 기사의 분석 단계 이벤트 (본문 캐시 → 분석 단계 → done)"""
+    content = article["content"]
+    timings = {}
+    cache_keys = [url_key(input_url)] if input_url else []
 
-        # 키워드 정의 처리
-        cur_unique_keywords = [node["id"] for node in enhanced_graph["nodes"]]
-        cur_unique_keywords = list(set(cur_unique_keywords))
+    # URL 이 달라도 본문이 같으면 분석 결과 재사용
+    cached, tier = await result_cache.get(content_key(content)) if content else (None, None)
+    if cached is not None:
+        print(f"\n캐시 적중({tier}): 본문 해시")
+        events = cached_events(dict(cached, **article))
+    else:
+        tier = "miss"
+        events = [("article", article)]
+        yield events[0]
 
-        # cur_unique_keywords의 정의를 제공해야 함.
-        try:
-            definitions = get_word_definition(cur_unique_keywords, "./data/json/dictionary.json")
-            if definitions is None:
-                definitions = {}  # 정의를 찾지 못한 경우 빈 딕셔너리 반환
-            print(f"정의 결과: {definitions}")
-        except Exception as e:
-            print(f"정의 검색 중 오류 발생: {str(e)}")
-            definitions = {}  # 오류 발생 시 빈 딕셔너리로 처리
-
-        # recommendations = recommender.recommend(cur_unique_keywords)
-        # print("\nrecommendations:", recommendations)
-
-        return JSONResponse({
-            "hypergraph_data": final_graph,
-            # "hypergraph_data": enhanced_graph,
-            # "recommendations": recommendations,
-            "response_time": datetime.datetime.now(local_tz).isoformat(),
-            "title": title,
-            "date": date,
-            "url": url,
-            "content": content,
-            "definitions": definitions
-        })
+        # CPU 를 쓰는 분석 단계는 이벤트 루프 밖의 분석 전용 스레드 풀에서 한 단계씩 실행
+        loop = asyncio.get_running_loop()
+        stages = iter_analysis_stages(content, timings)
+        while True:
+            event = await loop.run_in_executor(analysis_executor, next, stages, None)
+            if event is None:
+                break
+            events.append(event)
+            yield event
+        cache_keys.append(content_key(content))
+
+    # 본문 추출에 실패한 경우("No content found ...")는 캐시하지 않음
+    if has_article_content(content):
+        await result_cache.put(cache_keys, events_to_result(events))
+
+    if cached is not None:
+        for event in events:
+            yield event
+    yield "done", {"timings": timings, "cache": tier}
+
+
+def has_article_content(content: str) -> bool:
+    return bool(content) and not content.startswith("No content found")
+
+
+def iter_analysis_stages(content: str, timings: dict):
+    """본문 분석 파이프라인 (NLP → 관계 분류 → 그래프 연결 → 용어 정의), 단계마다 (단계, 데이터) 생성"""
+    nlp_processor = components.get("nlp_processor")
+    relation_processor = components.get("relation_processor")
+
+    # 1. NLP 처리 및 그래프 생성
+    graph_data = nlp_processor.process_text(content, timings=timings)
+    print("\nresult:", graph_data)
+    print(f"문장 분리 시간: {timings.get('segmentation_ms')} ms")
+    yield "nodes", {"nodes": graph_data["nodes"]}
+
+    # 2. 관계 분류
+    enhanced_graph = relation_processor.classify_relations(graph_data)
+    print("\nenhanced result:", enhanced_graph)
+    # 그래프 연결 단계가 같은 edges 리스트에 엣지를 추가하므로 복사해서 전달
+    categorized_edges = list(enhanced_graph["edges"])
+    yield "edges", {"edges": categorized_edges}
+
+    # 3. 고립 그래프 연결
+    connector = GraphConnector(enhanced_graph, content)  # content 전달
+    final_graph = connector.connect_isolated_graphs(relation_processor)
+    print("\nfinal result:", final_graph)
+    yield "connector_edges", {"edges": final_graph["edges"][len(categorized_edges):]}
+
+    # 키워드 정의 처리
+    cur_unique_keywords = [node["id"] for node in enhanced_graph["nodes"]]
+    cur_unique_keywords = list(set(cur_unique_keywords))
+
+    # cur_unique_keywords의 정의를 제공해야 함.
+    try:
+        definitions = get_word_definition(cur_unique_keywords, DICTIONARY_PATH)
+        if definitions is None:
+            definitions = {}  # 정의를 찾지 못한 경우 빈 딕셔너리 반환
+        print(f"정의 결과: {definitions}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        print(f"정의 검색 중 오류 발생: {str(e)}")
+        definitions = {}  # 오류 발생 시 빈 딕셔너리로 처리
+
+    # recommendations = recommender.recommend(cur_unique_keywords)
+    # print("\nrecommendations:", recommendations)
+    yield "definitions", {"definitions": definitions}
+
+
+def events_to_result(events) -> dict:
+    """단계 이벤트를 /service 응답 형식으로 합침"""
+    result = {"hypergraph_data": {"nodes": [], "edges": []}, "definitions": {}}
+    for stage, payload in events:
+        if stage == "article":
+            result.update(payload)
+        elif stage == "nodes":
+            result["hypergraph_data"]["nodes"] = payload["nodes"]
+        elif stage in ("edges", "connector_edges"):
+            result["hypergraph_data"]["edges"] = result["hypergraph_data"]["edges"] + payload["edges"]
+        elif stage == "definitions":
+            result["definitions"] = payload["definitions"]
+        elif stage == "done":
+            result.update(payload)
+    return result
+
+
+def cached_events(result: dict) -> list:
+    """캐시된 /service 결과를 단계 이벤트로 변환 (그래프 연결 단계 엣지는 pmi_score 로 구분)"""
+    hypergraph_data = result["hypergraph_data"]
+    edges = hypergraph_data["edges"]
+    return [
+        ("article", {key: result.get(key, "") for key in ("title", "date", "url", "content")}),
+        ("nodes", {"nodes": hypergraph_data["nodes"]}),
+        ("edges", {"edges": [edge for edge in edges if "pmi_score" not in edge]}),
+        ("connector_edges", {"edges": [edge for edge in edges if "pmi_score" in edge]}),
+        ("definitions", {"definitions": result.get("definitions", {})})
+    ]
+
+
+@app.exception_handler(ComponentNotReady)
+async def component_not_ready_handler(request, exc: ComponentNotReady):
+    # 모델 로드 중에는 503 + Retry-After 로 응답 (캐시 적중 요청은 로드 전에도 처리됨)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "component": exc.name, "state": exc.state},
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+    )
+
+@app.exception_handler(ConcurrencyLimitExceeded)
+async def concurrency_limit_handler(request, exc: ConcurrencyLimitExceeded):
+    # 분석 요청이 한도만큼 진행 중이면 대기열에 쌓지 않고 바로 거절
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "limit": exc.limit},
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+    )
 
 @app.on_event("startup")
 async def startup_db_client():
+    global fetcher, link_lock
+    # 모델 로드는 백그라운드에서 진행하고 서버는 바로 요청을 받음
+    components.start()
+    fetcher = AsyncFetcher(
+        connect_timeout=FETCH_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=FETCH_TIMEOUT_SECONDS,
+        per_host_limit=FETCH_PER_HOST_LIMIT,
+        max_retries=FETCH_MAX_RETRIES
+    )
+    link_lock = asyncio.Lock()
+    Database.article_saved_hooks.append(schedule_link)
+    Database.article_deleted_hooks.append(unindex_article)
     await Database.connect_db()
+    await Database.ensure_indexes()
+    # 파이프라인/모델 파일이 바뀌어 더 이상 쓰이지 않는 이전 버전 분석 결과 삭제
+    result_cache.set_version(compute_cache_version(CACHE_VERSION_FILES))
+    try:
+        deleted = await Database.delete_stale_cached_results(result_cache.version)
+        print(f"이전 버전 분석 결과 캐시 {deleted}건 삭제")
+    except Exception as e:
+        print(f"이전 버전 캐시 삭제 중 오류 발생: {e}")
+    if SAVE_WRITE_BEHIND:
+        Database.enable_write_behind(max_batch=SAVE_BATCH_SIZE, max_delay=SAVE_FLUSH_INTERVAL_MS / 1000)
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # 쓰기 지연 버퍼를 먼저 기록하고, 그로 인해 예약된 것까지 문서 간 연결을 마친 뒤 DB 연결 종료
+    if Database.write_buffer is not None:
+        try:
+            await Database.write_buffer.flush()
+        except Exception as e:
+            print(f"쓰기 버퍼 기록 실패: {e}")
+    if link_tasks:
+        await asyncio.gather(*link_tasks, return_exceptions=True)
     await Database.close_db()
-    nlp_processor.cleanup()
+    await fetcher.aclose()
+    analysis_executor.shutdown(wait=False)
+    encoder = components.get_if_ready("encoder")
+    if encoder is not None:
+        encoder.close()
+    nlp_processor = components.get_if_ready("nlp_processor")
+    if nlp_processor is not None:
+        nlp_processor.cleanup()
+
+@app.get("/healthz")
+async def healthz():
+    # 프로세스 생존 여부 (모델 로드와 무관)
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    # 모든 구성 요소가 로드되었는지와 구성 요소별 로드 시간
+    status = components.status()
+    if not status["ready"]:
+        return JSONResponse(status_code=503, content=status,
+                            headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    return status
+
+@app.get("/metrics/batching")
+async def batching_metrics():
+    # 인코더 마이크로 배칭의 배치 크기 / 지연 시간 히스토그램
+    return components.get("encoder").batching_stats()
+
+@app.get("/metrics/concurrency")
+async def concurrency_metrics():
+    # 진행 중 / 거절된 분석 요청 수
+    return analysis_limiter.stats()
+
+@app.get("/metrics/fetch")
+async def fetch_metrics():
+    # 기사 요청 수 / 재시도 / 실패 / 받은 바이트와 디스크 캐시 적중률
+    return dict(fetcher.stats(), cache=fetch_cache.stats())
+
+@app.get("/metrics/database")
+async def database_metrics():
+    # 쓰기 지연 버퍼 상태 (대기 건수, 묶음 수, 재시도/실패)
+    write_buffer = Database.write_buffer
+    return {"write_behind": write_buffer.stats() if write_buffer is not None else None}
+
+@app.get("/metrics/cache")
+async def cache_metrics():
+    # 분석 결과 캐시 적중 현황
+    return result_cache.stats()
+
+def schedule_link(article_id: str, article: dict) -> None:
+    """Database 저장 훅: 기록이 끝난 기사의 문서 간 연결을 백그라운드 작업으로 예약"""
+    task = asyncio.get_running_loop().create_task(link_saved_article(article_id, article))
+    link_tasks.add(task)
+    task.add_done_callback(link_tasks.discard)
+
+
+def unindex_article(article_id: str) -> None:
+    """Database 삭제 훅: 다음 동기화 때 연결 색인에서 기사 제거"""
+    if link_index is not None:
+        link_index_removed.add(article_id)
+
+
+async def sync_link_index() -> CorpusLinkIndex:
+    """
+    연결 색인을 DB 와 맞춤. 처음에는 전체 기사를 한 번 읽고, 이후에는 마지막 동기화 이후 저장된 기사만 읽는다
+    (다른 워커가 저장한 기사 반영). 다른 워커가 삭제한 기사는 연결 중에 없는 것이 확인되면 제거한다.
+    """
+    global link_index, link_index_synced_at
+    started = datetime.datetime.utcnow()
+    if link_index is None:
+        articles = await Database.get_link_candidates()
+        index = CorpusLinkIndex()
+        for article in articles:
+            PKMProcessor.index_article(index, article)
+        link_index = index
+        print(f"문서 간 연결 색인 생성: {len(index)}건")
+    else:
+        while link_index_removed:
+            link_index.remove(link_index_removed.pop())
+        since = link_index_synced_at - datetime.timedelta(seconds=LINK_INDEX_SYNC_OVERLAP_SECONDS)
+        for article in await Database.get_link_candidates(since=since):
+            PKMProcessor.index_article(link_index, article)
+    link_index_synced_at = started
+    return link_index
+
+
+async def link_saved_article(article_id: str, article: dict) -> int:
+    """
+    저장한 기사와 기존 기사들 사이의 문서 간 엣지만 계산해 교체 (전체 쌍 재계산 없음)
+    article_id 는 DB 에 기록된 id (같은 URL 을 다시 저장한 경우 기존 문서 id), article 은 기록한 문서
+    연결 색인에서 후보 문서를 고르고, DB 에서는 공출현 근거 문서의 본문 통계만 읽는다.
+    연결에 실패해도 저장은 유지하고, 누락된 엣지는 /articles/cross_edges/rebuild 로 다시 만들 수 있다.
+    """
+    relation_processor = components.get_if_ready("relation_processor")
+    if relation_processor is None:
+        print(f"관계 분류 모델이 준비되지 않아 문서 간 연결을 건너뜀: {article_id}")
+        return 0
+    try:
+        async with link_lock:
+            index = await sync_link_index()
+            # 본문 통계는 저장할 때 계산해 둔 것을 그대로 사용
+            article = {
+                "_id": article_id,
+                "hypergraph_data": article["hypergraph_data"],
+                "text_stats": article["text_stats"]
+            }
+            PKMProcessor.index_article(index, article)
+            pkm_processor = PKMProcessor(relation_processor)
+            loop = asyncio.get_running_loop()
+            # 다른 워커가 삭제한 기사가 색인에 남아 있으면 제거하고 다시 계산 (보통 한 번에 끝남)
+            for _ in range(3):
+                evidence_ids = index.evidence_docs(article_id, index.candidates(article_id)) - {article_id}
+                evidence = await Database.get_link_candidates(ids=list(evidence_ids))
+                missing = evidence_ids - {doc["_id"] for doc in evidence}
+                # 문서 간 PMI 계산은 CPU 작업이므로 이벤트 루프 밖에서 실행
+                edges = await loop.run_in_executor(analysis_executor, pkm_processor.link_indexed_article,
+                                                   article, index, evidence)
+                sources = {edge["source_doc"] for edge in edges}
+                missing |= sources - set(await Database.get_existing_article_ids(list(sources)))
+                if not missing:
+                    break
+                for missing_id in missing:
+                    index.remove(missing_id)
+            await Database.replace_cross_edges(article_id, edges)
+        return len(edges)
+    except Exception as e:
+        print(f"문서 간 연결 중 오류 발생: {e}")
+        return 0
+
 
 @app.post("/save_article")
 async def save_article(article_data: dict):
+    # 문서 간 연결은 기록이 끝난 뒤 저장 훅(schedule_link)이 백그라운드에서 처리
     article_id = await Database.save_article(article_data)
     print("\n저장 성공")
     return {"message": "Article saved successfully", "article_id": article_id}
 
 @app.get("/articles")
 async def get_articles():
-    try:
-        # 1. 기존 문서들 가져오기
-        articles = await Database.get_all_articles()
-        if not articles:
-            return []
+    """
+    전체 기사 + 저장 시 갱신해 둔 문서 간 엣지를 JSON 배열로 스트리밍 (목록 조회 시 PMI 재계산 없음)
+    기사는 DB 커서에서 ARTICLES_STREAM_BATCH_SIZE 건씩 읽고, 엣지는 그 묶음에 닿는 것만 조회하므로
+    전체 기사와 엣지를 한 번에 메모리에 올리지 않는다.
+    """
+    async def encode_batch(batch: List[dict]) -> List[str]:
+        cross_edges = await Database.get_cross_edges([article["_id"] for article in batch])
+        return [json.dumps(article, ensure_ascii=False, default=encode_json_value)
+                for article in PKMProcessor.attach_cross_edges(batch, cross_edges)]
 
-        # return articles
+    async def batches():
+        batch = []
+        # 본문 통계는 문서 간 연결 계산에만 쓰므로 목록에서는 제외
+        async for article in Database.iter_articles({"text_stats": 0}, batch_size=ARTICLES_STREAM_BATCH_SIZE):
+            batch.append(article)
+            if len(batch) == ARTICLES_STREAM_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
-        # 2. PKM 프로세서로 문서 간 연결 처리
+    async def stream():
+        yield "["
+        first = True
         try:
-            pkm_processor = PKMProcessor(relation_processor)
-            integrated_articles = pkm_processor.process_articles(articles)
-            print("\nintegrated_articles:", integrated_articles)
-            return integrated_articles
+            async for batch in batches():
+                for line in await encode_batch(batch):
+                    yield ("" if first else ",") + line
+                    first = False
         except Exception as e:
-            print(f"Error processing articles: {str(e)}")
-            # 오류 발생시 원본 articles 반환
-            return articles
+            # 응답이 이미 시작되어 상태 코드를 바꿀 수 없음. 잘린 목록이 정상 응답처럼 보이지 않도록 배열을 닫지 않고 중단
+            print(f"Error in get_articles: {str(e)}")
+            raise
+        yield "]"
 
+    # DB 연결 실패는 스트림을 시작하기 전에 500 으로 응답
+    try:
+        if not Database.connected:
+            await Database.connect_db()
     except Exception as e:
         print(f"Error in get_articles: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(stream(), media_type="application/json")
+
+@app.post("/articles/cross_edges/rebuild")
+async def rebuild_cross_edges():
+    """저장된 문서 간 엣지를 전체 문서 기준으로 다시 계산 (기존 데이터 이전 / 누락 복구용)"""
+    global link_index, link_index_synced_at
+    pkm_processor = PKMProcessor(components.get("relation_processor"))
+    async with link_lock:
+        started = datetime.datetime.utcnow()
+        articles = await Database.get_link_candidates()
+        loop = asyncio.get_running_loop()
+        edges = await loop.run_in_executor(analysis_executor, pkm_processor.find_all_edges, articles)
+        await Database.replace_all_cross_edges(edges)
+        # 읽은 전체 기사로 연결 색인도 새로 만듦 (다른 프로세스의 삭제 / 정리 반영)
+        index = CorpusLinkIndex()
+        for article in articles:
+            PKMProcessor.index_article(index, article)
+        link_index, link_index_synced_at = index, started
+        link_index_removed.clear()
+    return {"articles": len(articles), "cross_edges": len(edges)}
+
+def parse_article_projection(fields: Optional[str], default_fields) -> Dict[str, int]:
+    """"title,url" 형식의 필드 목록 → MongoDB projection"""
+    names = [name.strip() for name in fields.split(",") if name.strip()] if fields else list(default_fields)
+    unknown = [name for name in names if name not in ARTICLE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 필드입니다: {unknown}")
+    return {name: 1 for name in names}
+
+
+def encode_json_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} 는 JSON 으로 변환할 수 없습니다")
+
+
+@app.get("/articles/page")
+async def get_articles_page(limit: int = DEFAULT_ARTICLES_PAGE_SIZE, cursor: Optional[str] = None,
+                            fields: Optional[str] = None):
+    """
+    커서 기반 기사 목록 (저장 순서). 응답의 next_cursor 를 다음 요청의 cursor 로 전달
+    fields 를 지정하지 않으면 본문/그래프를 뺀 목록용 필드만 반환
+    """
+    if not 1 <= limit <= MAX_ARTICLES_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit 은 1~{MAX_ARTICLES_PAGE_SIZE} 사이여야 합니다")
+    projection = parse_article_projection(fields, ARTICLE_LIST_FIELDS)
+    try:
+        articles, next_cursor = await Database.get_articles_page(limit, cursor, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": articles, "next_cursor": next_cursor}
+
+
+@app.get("/articles/export")
+async def export_articles(fields: Optional[str] = None):
+    """전체 기사를 JSON 배열로 스트리밍 (DB 커서에서 읽는 대로 한 건씩 전송)"""
+    projection = parse_article_projection(fields, ARTICLE_FIELDS)
+
+    async def stream():
+        yield "["
+        first = True
+        async for article in Database.iter_articles(projection):
+            yield ("" if first else ",") + json.dumps(article, ensure_ascii=False, default=encode_json_value)
+            first = False
+        yield "]"
+
+    return StreamingResponse(stream(), media_type="application/json")
+
 
 @app.delete("/articles/{article_id}")
 async def delete_article(article_id: str):
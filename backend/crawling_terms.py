@@ -1,62 +1,204 @@
-import requests
+# crawling_terms.py
+# 한경 경제용어사전 크롤러
+# - 초성별 목록을 동시에 요청 (전체 요청 속도는 --rate 로 제한)
+# - 일시적인 오류는 지수 백오프 + 지터로 재시도 (AsyncFetcher)
+# - 페이지마다 용어를 JSONL 에 바로 추가하고 체크포인트 갱신 → 중단 후 다시 실행하면 마지막 페이지 다음부터 이어서 수집
+# - 수집이 끝나면 JSONL 을 합쳐 기존 형식의 JSON({용어(표현): 정의}) 으로 저장
+#
+# 사용 예:
+#   python crawling_terms.py --words ㄱ ㄴ ㄷ --concurrency 3 --rate 2
+#   python crawling_terms.py --base-url http://127.0.0.1:8001/work/economyPhonemeList   # 로컬 스텁 서버
+import argparse
+import asyncio
 import json
+import os
 import time
+from typing import Dict, List, Optional
+
+from src.async_fetcher import AsyncFetcher, FetchError
 
 # AJAX 요청을 위한 기본 URL
-url = 'https://dic.hankyung.com/work/economyPhonemeList'
-words = ['ㅇ']
-terms_dict = {}
+DEFAULT_BASE_URL = os.getenv("TERMS_BASE_URL", "https://dic.hankyung.com/work/economyPhonemeList")
+INITIAL_CONSONANTS = ['ㄱ', 'ㄴ', 'ㄷ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅅ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+DEFAULT_TERMS_PATH = "economy_terms.jsonl"
+DEFAULT_CHECKPOINT_PATH = "economy_terms.checkpoint.json"
+DEFAULT_OUTPUT_PATH = "economy_terms.json"
+
+
+class RateLimiter:
+    """요청 시작 간격을 1/rate 초 이상으로 유지 (모든 초성 작업이 공유)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+                now = self._next_at
+            self._next_at = now + self.interval
+
+
+def format_term(term: dict) -> tuple:
+    """API 항목 → (용어(한자, 영어 표현...), 정의)"""
+    name = term['WORD']
+    definition = term['CONTENT1']
+
+    # 영어 표현 및 한자 가져오기
+    expressions = [term[field] for field in ('CHINESE', 'EWORD1', 'EWORD2', 'SIMPLE') if term.get(field)]
+
+    # 표현이 있을 경우() 형식으로 추가
+    if expressions:
+        return "{}({})".format(name, ", ".join(expressions)), definition
+    return name, definition
+
+
+class Checkpoint:
+    """초성별 마지막으로 저장한 페이지 / 완료 여부 (원자적 교체로 기록)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.words: Dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.words = json.load(f).get("words", {})
+
+    def last_page(self, word: str) -> int:
+        return self.words.get(word, {}).get("page", 0)
+
+    def is_done(self, word: str) -> bool:
+        return self.words.get(word, {}).get("done", False)
+
+    def update(self, word: str, page: int, done: bool = False) -> None:
+        self.words[word] = {"page": page, "done": done}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"words": self.words}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
 
+class TermsCrawler:
+    def __init__(self, fetcher: AsyncFetcher, base_url: str, terms_path: str, checkpoint: Checkpoint,
+                 concurrency: int = 4, rate: float = 4.0):
+        self.fetcher = fetcher
+        self.base_url = base_url
+        self.terms_path = terms_path
+        self.checkpoint = checkpoint
+        self.rate_limiter = RateLimiter(rate)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._terms_file = None
 
-def fetch_terms(word, page):
-    for attempt in range(10):  # 최대 5회 재시도
+    async def fetch_page(self, word: str, page: int) -> Optional[list]:
+        await self.rate_limiter.wait()
+        response = await self.fetcher.post(self.base_url, data={'word': word, 'page': page})
         try:
-            response = requests.post(url, data={'word': word, 'page': page})
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Error: {response.status_code}")
-                return None
-        except requests.exceptions.RequestException as e:
-            print(f"요청 실패: {e}, {attempt + 1}회 재시도 중...")
-            time.sleep(5)  # 5초 후 재시도
-    return None
-
-
-# 모든 글자에 대해 용어 가져오기
-for word in words:
-    page = 0
-    while True:
-        page += 1
-        terms_data = fetch_terms(word, page)
-        if terms_data and len(terms_data) > 0:
-            for term in terms_data:
-                name = term['WORD']
-                definition = term['CONTENT1']
-
-                # 영어 표현 및 한자 가져오기
-                expressions = []
-                if 'CHINESE' in term and term['CHINESE']:
-                    expressions.append(term['CHINESE'])
-                if 'EWORD1' in term and term['EWORD1']:
-                    expressions.append(term['EWORD1'])
-                if 'EWORD2' in term and term['EWORD2']:
-                    expressions.append(term['EWORD2'])
-                if 'SIMPLE' in term and term['SIMPLE']:
-                    expressions.append(term['SIMPLE'])
-
-                # 표현이 있을 경우() 형식으로 추가
-                if expressions:
-                    expressions_part = "({})".format(", ".join(expressions))
-                    terms_dict[f"{name}{expressions_part}"] = definition
-                else:
-                    terms_dict[name] = definition
-        else:
-            print(f"{word}에 대한 용어가 더 이상 없습니다.")
-            break
-
-# JSON 파일로 저장
-with open('economy_terms.json', 'w', encoding='utf-8') as json_file:
-    json.dump(terms_dict, json_file, ensure_ascii=False, indent=4)
-
-print("모든 경제 용어가 'economy_terms.json' 파일에 저장되었습니다.")
+            return response.json()
+        except ValueError:
+            raise FetchError(f"JSON 이 아닌 응답: {word} {page}페이지")
+
+    def append_terms(self, word: str, page: int, terms: list) -> None:
+        """페이지의 용어를 JSONL 에 추가하고 디스크에 반영한 뒤 체크포인트 갱신 (체크포인트가 데이터보다 앞서지 않도록)"""
+        for term in terms:
+            name, definition = format_term(term)
+            self._terms_file.write(json.dumps({"word": word, "page": page, "term": name,
+                                               "definition": definition}, ensure_ascii=False) + "\n")
+        self._terms_file.flush()
+        os.fsync(self._terms_file.fileno())
+        self.checkpoint.update(word, page)
+
+    async def crawl_word(self, word: str) -> int:
+        """초성 하나의 목록을 빈 페이지가 나올 때까지 수집. 수집한 페이지 수 반환"""
+        if self.checkpoint.is_done(word):
+            print(f"{word}: 이미 완료됨, 건너뜀")
+            return 0
+
+        async with self._semaphore:
+            page = self.checkpoint.last_page(word)
+            if page:
+                print(f"{word}: {page}페이지 다음부터 이어서 수집")
+            fetched = 0
+            while True:
+                page += 1
+                try:
+                    terms = await self.fetch_page(word, page)
+                except FetchError as e:
+                    # 완료로 표시하지 않으므로 다시 실행하면 이 페이지부터 재시도
+                    print(f"{word}: {page}페이지 요청 실패, 중단: {e}")
+                    return fetched
+                if not terms:
+                    self.checkpoint.update(word, page - 1, done=True)
+                    print(f"{word}에 대한 용어가 더 이상 없습니다.")
+                    return fetched
+                self.append_terms(word, page, terms)
+                fetched += 1
+
+    async def run(self, words: List[str]) -> None:
+        with open(self.terms_path, 'a', encoding='utf-8') as self._terms_file:
+            await asyncio.gather(*(self.crawl_word(word) for word in words))
+
+
+def export_json(terms_path: str, output_path: str) -> int:
+    """JSONL → {용어: 정의} JSON. 재시작으로 중복 기록된 항목은 나중 것이 남음"""
+    terms_dict = {}
+    if os.path.exists(terms_path):
+        with open(terms_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:  # 중단 시점에 잘린 마지막 줄
+                    continue
+                terms_dict[record["term"]] = record["definition"]
+
+    with open(output_path, 'w', encoding='utf-8') as json_file:
+        json.dump(terms_dict, json_file, ensure_ascii=False, indent=4)
+    return len(terms_dict)
+
+
+async def main_async(args) -> None:
+    fetcher = AsyncFetcher(connect_timeout=args.connect_timeout,
+                           read_timeout=args.timeout,
+                           per_host_limit=args.concurrency,
+                           max_retries=args.max_retries,
+                           backoff_base=args.backoff_base,
+                           backoff_max=args.backoff_max)
+    crawler = TermsCrawler(fetcher, args.base_url, args.terms, Checkpoint(args.checkpoint),
+                           concurrency=args.concurrency, rate=args.rate)
+    started = time.perf_counter()
+    try:
+        await crawler.run(args.words)
+    finally:
+        await fetcher.aclose()
+    print(f"크롤링 시간: {time.perf_counter() - started:.1f}초, 요청 통계: {fetcher.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한경 경제용어사전 크롤러 (중단 후 이어서 수집 가능)")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--words", nargs="+", default=INITIAL_CONSONANTS, help="수집할 초성")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 수집할 초성 수")
+    parser.add_argument("--rate", type=float, default=4.0, help="초당 최대 요청 수 (0 이면 제한 없음)")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--backoff-base", type=float, default=1.0)
+    parser.add_argument("--backoff-max", type=float, default=30.0)
+    parser.add_argument("--connect-timeout", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=20.0)
+    parser.add_argument("--terms", default=DEFAULT_TERMS_PATH, help="용어를 추가 기록할 JSONL")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_PATH)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+    # JSON 파일로 저장
+    count = export_json(args.terms, args.output)
+    print(f"모든 경제 용어({count}개)가 '{args.output}' 파일에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
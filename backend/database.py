@@ -1,31 +1,78 @@
 # database.py
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
-from typing import Optional, List
+from pymongo import ASCENDING, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
+from typing import AsyncIterator, Callable, Dict, Optional, List, Tuple
+import asyncio
 import datetime
 import os
 
+from src.text_stats import compute_text_stats
+from src.url_utils import url_hash
+from src.write_behind import WriteBehindBuffer
+
+# 연결 설정 (docker-compose 에서는 MONGO_URI=mongodb://mongodb:27017, 로컬은 mongodb://localhost:27017)
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://finwise.p-e.kr:27017")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "articles_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+# 분석 결과 캐시 보관 기간 (created_at 기준 TTL 인덱스, 0 이면 만료 없음)
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# 쓰기 지연 버퍼가 기록한 클라이언트 id → 실제 문서 id (이미 저장된 URL 이라 기존 문서가 갱신된 경우)
+MAX_ID_ALIASES = 10000
+
+# 페이지 단위 목록 / 내보내기 정렬 순서 (저장 순서, created_at 이 같으면 _id 로 구분)
+ARTICLE_SORT = [("created_at", ASCENDING), ("_id", ASCENDING)]
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def encode_article_cursor(article: dict) -> str:
+    """마지막 문서의 (created_at, _id) → "<epoch ms>-<ObjectId>" 커서"""
+    created_ms = (article["created_at"] - EPOCH) // datetime.timedelta(milliseconds=1)
+    return f"{created_ms}-{article['_id']}"
+
+
+def decode_article_cursor(cursor: str) -> Tuple[datetime.datetime, ObjectId]:
+    """커서 → (created_at, _id). 형식이 잘못되면 ValueError"""
+    try:
+        created_ms, object_id = cursor.split("-", 1)
+        return EPOCH + datetime.timedelta(milliseconds=int(created_ms)), ObjectId(object_id)
+    except Exception:
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+
 
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     article_collection = None
+    cache_collection = None
+    cross_edge_collection = None
     connected: bool = False
+    write_buffer: Optional[WriteBehindBuffer] = None
+    _id_aliases: Dict[str, str] = {}
+    # 기사가 DB 에 기록된 뒤 (저장된 id, 기록한 문서) 로 호출 (쓰기 지연 모드에서는 묶음 기록 후)
+    article_saved_hooks: List[Callable[[str, dict], None]] = []
+    # 기사가 DB 에서 삭제된 뒤 (삭제된 id) 로 호출
+    article_deleted_hooks: List[Callable[[str], None]] = []
 
     @classmethod
     async def connect_db(cls):
         try:
-            # docker-compose.yml
-            # mongo_uri = os.getenv('MONGO_URI', 'mongodb://mongodb:27017/finwise')
-            # cls.client = AsyncIOMotorClient(mongo_uri)
-            # cls.article_collection = cls.client.finwise.articles
-
-            # server standalone
-            cls.client = AsyncIOMotorClient("mongodb://finwise.p-e.kr:27017")
-            cls.article_collection = cls.client.articles_db.articles
-
-            # local
-            # cls.client = AsyncIOMotorClient("mongodb://localhost:27017")
-            # cls.article_collection = cls.client.articles_db.articles
+            cls.client = AsyncIOMotorClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS
+            )
+            db = cls.client[MONGO_DB_NAME]
+            cls.article_collection = db.articles
+            cls.cache_collection = db.analysis_cache
+            cls.cross_edge_collection = db.cross_edges
 
             # 연결 테스트
             await cls.client.admin.command('ping')
@@ -38,9 +85,17 @@ class Database:
 
     @classmethod
     async def close_db(cls):
+        # 쓰기 지연 버퍼에 남은 기사를 먼저 기록
+        if cls.write_buffer is not None:
+            try:
+                await cls.write_buffer.close()
+            except Exception as e:
+                print(f"쓰기 버퍼 기록 실패, {cls.write_buffer.stats()['pending']}건 저장되지 않음: {e}")
+            cls.write_buffer = None
+
         if cls.client and cls.connected:
             try:
-                await cls.client.close()
+                cls.client.close()
                 cls.connected = False
                 print("MongoDB 연결이 안전하게 종료되었습니다.")
             except Exception as e:
@@ -48,43 +103,386 @@ class Database:
         else:
             print("MongoDB 클라이언트가 없거나 이미 연결이 종료되었습니다.")
 
+    @classmethod
+    def enable_write_behind(cls, max_batch: int = 50, max_delay: float = 0.2, max_pending: int = 1000):
+        """
+        save_article 을 쓰기 지연 모드로 전환 (이벤트 루프 안에서 호출)
+        문서를 버퍼에 넣고 클라이언트에서 만든 id 로 바로 응답, 묶음 upsert 는 백그라운드에서 수행
+        """
+        cls.write_buffer = WriteBehindBuffer(cls._write_buffered_articles, max_batch=max_batch,
+                                             max_delay=max_delay, max_pending=max_pending)
+        cls.write_buffer.start()
+
+    @classmethod
+    async def _write_buffered_articles(cls, articles: List[dict]):
+        if not cls.connected:
+            await cls.connect_db()
+        ids = await cls._upsert_articles(articles)
+        for article, article_id in zip(articles, ids):
+            if article_id is not None and article_id != str(article["_id"]):
+                cls._id_aliases[str(article["_id"])] = article_id
+        while len(cls._id_aliases) > MAX_ID_ALIASES:
+            cls._id_aliases.pop(next(iter(cls._id_aliases)))
+        cls._notify_saved(articles, ids)
+
+    @classmethod
+    def _notify_deleted(cls, article_id: str) -> None:
+        for hook in cls.article_deleted_hooks:
+            try:
+                hook(article_id)
+            except Exception as e:
+                print(f"기사 삭제 후 처리 중 오류 발생 ({article_id}): {e}")
+
+    @classmethod
+    def _notify_saved(cls, articles: List[dict], ids: List[Optional[str]]) -> None:
+        """
+        기록한 문서마다 article_saved_hooks 호출 (id 는 갱신된 기존 문서면 그 문서의 id)
+        같은 문서가 한 묶음에 여러 번 있으면 실제로 남은 마지막 것만 전달한다.
+        """
+        saved = {}
+        for article, article_id in zip(articles, ids):
+            if article_id is not None:
+                saved[article_id] = article
+        for article_id, article in saved.items():
+            for hook in cls.article_saved_hooks:
+                try:
+                    hook(article_id, article)
+                except Exception as e:
+                    print(f"기사 저장 후 처리 중 오류 발생 ({article_id}): {e}")
+
+    @classmethod
+    def resolve_article_id(cls, article_id: str) -> str:
+        return cls._id_aliases.get(article_id, article_id)
+
+    @classmethod
+    async def ensure_indexes(cls):
+        """
+        시작 시 인덱스 생성 (이미 있으면 그대로 둠)
+        - url_hash: 정규화 URL 해시 unique (같은 기사 중복 저장 방지, url 이 없는 문서는 제외)
+        - created_at, _id: /articles/page 커서 정렬
+        - updated_at: 마지막 동기화 이후 저장된 기사만 연결 색인에 반영
+        - cross_edges.source_doc / target_doc: 기사 삭제·재연결 시 엣지 조회
+        - analysis_cache.created_at: ANALYSIS_CACHE_TTL_SECONDS 가 지난 분석 결과 캐시 자동 삭제 (TTL)
+        기존 데이터에 중복이 남아 있으면 unique 인덱스 생성이 실패하므로 src/dedup_articles.py 로 먼저 정리
+        """
+        if not cls.connected:
+            await cls.connect_db()
+
+        await cls.article_collection.create_index(ARTICLE_SORT, name="created_at_id")
+        await cls.article_collection.create_index("updated_at", name="updated_at")
+        if ANALYSIS_CACHE_TTL_SECONDS > 0:
+            try:
+                await cls.cache_collection.create_index("created_at", name="created_at_ttl",
+                                                        expireAfterSeconds=ANALYSIS_CACHE_TTL_SECONDS)
+            except OperationFailure:
+                # 보관 기간을 바꾼 경우 기존 TTL 인덱스 값만 갱신
+                await cls.client[MONGO_DB_NAME].command(
+                    "collMod", cls.cache_collection.name,
+                    index={"name": "created_at_ttl", "expireAfterSeconds": ANALYSIS_CACHE_TTL_SECONDS}
+                )
+        await cls.cross_edge_collection.create_index("source_doc")
+        await cls.cross_edge_collection.create_index("target_doc")
+        try:
+            await cls.article_collection.create_index(
+                "url_hash", name="url_hash_unique", unique=True,
+                partialFilterExpression={"url_hash": {"$type": "string"}}
+            )
+        except OperationFailure as e:
+            print(f"url_hash unique 인덱스 생성 실패 (중복 문서 정리 필요: python -m src.dedup_articles): {e}")
+
     @classmethod
     async def save_article(cls, article_data: dict) -> str:
+        """
+        기사 저장. 같은 URL(정규화 기준)의 기사가 이미 있으면 내용을 갱신하고 기존 id 를 반환
+        (created_at 은 처음 저장한 시각 유지)
+        쓰기 지연 모드에서는 버퍼에 넣고 클라이언트에서 만든 id 를 바로 반환
+        기록이 끝나면 article_saved_hooks 를 저장된 id 로 호출 (쓰기 지연 모드에서는 묶음 기록 후)
+        """
+        # 본문 통계 계산(본문 길이 × 노드 수)은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        article = await asyncio.get_running_loop().run_in_executor(None, cls._article_document, article_data)
+        if cls.write_buffer is not None:
+            await cls.write_buffer.put(article)
+            return str(article["_id"])
+
         if not cls.connected:
             await cls.connect_db()
 
+        if "url_hash" not in article:
+            result = await cls.article_collection.insert_one(article)
+            article_id = str(result.inserted_id)
+        else:
+            update = cls._upsert_update(article)
+            saved = await cls.article_collection.find_one_and_update(
+                {"url_hash": article["url_hash"]}, update,
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            article_id = str(saved["_id"])
+        cls._notify_saved([article], [article_id])
+        return article_id
+
+    @classmethod
+    async def save_articles(cls, articles_data: List[dict]) -> List[str]:
+        """여러 기사를 한 번의 bulk_write 로 저장 (save_article 과 같은 upsert, 입력 순서대로 id 반환)"""
+        if not cls.connected:
+            await cls.connect_db()
+        if not articles_data:
+            return []
+        articles = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: [cls._article_document(article_data) for article_data in articles_data])
+        ids = await cls._upsert_articles(articles)
+        cls._notify_saved(articles, ids)
+        return ids
+
+    @staticmethod
+    def _upsert_update(article: dict) -> dict:
+        """url_hash 기준 upsert. 새 문서일 때만 클라이언트 id 와 created_at 을 기록"""
+        fields = {key: value for key, value in article.items() if key not in ("_id", "created_at")}
+        return {"$set": fields, "$setOnInsert": {"_id": article["_id"], "created_at": article["created_at"]}}
+
+    @classmethod
+    async def _upsert_articles(cls, articles: List[dict]) -> List[Optional[str]]:
+        # 같은 URL 이 한 묶음에 여러 번 있으면 마지막 것만 기록 (unordered upsert 끼리 충돌하지 않도록)
+        keys = []
+        operations = {}
+        for article in articles:
+            if "url_hash" in article:
+                key = article["url_hash"]
+                operations[key] = UpdateOne({"url_hash": key}, cls._upsert_update(article), upsert=True)
+            else:
+                key = article["_id"]
+                operations[key] = InsertOne(article)
+            keys.append(key)
+
+        operation_keys = list(operations)
+        result = await cls.article_collection.bulk_write(list(operations.values()), ordered=False)
+
+        # 새로 삽입된 문서는 클라이언트 id 를 그대로 쓰고, 갱신된 문서는 url_hash 로 기존 id 조회
+        ids = {key: str(key) for key in operation_keys if isinstance(key, ObjectId)}
+        for index, upserted_id in result.upserted_ids.items():
+            ids[operation_keys[index]] = str(upserted_id)
+        missing = [key for key in operation_keys if key not in ids]
+        if missing:
+            async for document in cls.article_collection.find({"url_hash": {"$in": missing}},
+                                                              {"_id": 1, "url_hash": 1}):
+                ids[document["url_hash"]] = str(document["_id"])
+        return [ids.get(key) for key in keys]
+
+    @staticmethod
+    def _article_document(article_data: dict) -> dict:
+        now = datetime.datetime.utcnow()
         article = {
+            # 쓰기 지연 모드에서 기록 전에 id 를 돌려줄 수 있도록 클라이언트에서 생성
+            "_id": ObjectId(),
             "title": article_data["title"],
             "date": article_data["date"],
             "url": article_data["url"],
             "content": article_data["content"],
             "hypergraph_data": article_data["hypergraph_data"],
+            # 문서 간 PMI 용 본문 통계 (토큰 수, 노드별 출현 수/위치)
+            "text_stats": compute_text_stats(
+                article_data["content"], [node["id"] for node in article_data["hypergraph_data"].get("nodes", [])]
+            ),
             # "recommendations": article_data["recommendations"],
-            "created_at": datetime.datetime.utcnow()
+            "created_at": now,
+            # 마지막 저장 시각 (같은 URL 을 다시 저장하면 갱신, 워커별 연결 색인 동기화에 사용)
+            "updated_at": now
         }
-        result = await cls.article_collection.insert_one(article)
-        return str(result.inserted_id)
+        if article["url"]:
+            article["url_hash"] = url_hash(article["url"])
+        return article
 
     @classmethod
     async def get_all_articles(cls) -> List[dict]:
         if not cls.connected:
             await cls.connect_db()
 
-        cursor = cls.article_collection.find({})
+        # 본문 통계는 문서 간 연결 계산에만 쓰므로 목록에서는 제외
+        cursor = cls.article_collection.find({}, {"text_stats": 0})
         articles = await cursor.to_list(length=None)
         for article in articles:
             article["_id"] = str(article["_id"])
         return articles
 
+    @classmethod
+    async def get_articles_page(cls, limit: int, cursor: Optional[str] = None,
+                                projection: Optional[Dict[str, int]] = None) -> Tuple[List[dict], Optional[str]]:
+        """
+        (created_at, _id) 순 커서 페이지 조회. skip 대신 마지막 문서 다음부터 조회하므로
+        컬렉션이 커져도 페이지마다 인덱스 범위만 읽는다.
+        반환: (문서 목록, 다음 페이지 커서 또는 None)
+        """
+        if not cls.connected:
+            await cls.connect_db()
+
+        query = {}
+        if cursor:
+            created_at, object_id = decode_article_cursor(cursor)
+            query = {"$or": [
+                {"created_at": {"$gt": created_at}},
+                {"created_at": created_at, "_id": {"$gt": object_id}}
+            ]}
+        if projection:
+            # 다음 커서를 만들 수 있도록 정렬 키는 항상 포함
+            projection = dict(projection, created_at=1)
+
+        # 한 건 더 읽어 다음 페이지 존재 여부 확인
+        articles = await cls.article_collection.find(query, projection).sort(ARTICLE_SORT) \
+            .limit(limit + 1).to_list(length=limit + 1)
+        next_cursor = encode_article_cursor(articles[limit - 1]) if len(articles) > limit else None
+        articles = articles[:limit]
+        for article in articles:
+            article["_id"] = str(article["_id"])
+        return articles, next_cursor
+
+    @classmethod
+    async def iter_articles(cls, projection: Optional[Dict[str, int]] = None,
+                            batch_size: int = 100) -> AsyncIterator[dict]:
+        """전체 기사를 커서로 한 묶음씩 읽어 하나씩 반환 (전체를 메모리에 올리지 않음)"""
+        if not cls.connected:
+            await cls.connect_db()
+
+        cursor = cls.article_collection.find({}, projection).sort(ARTICLE_SORT).batch_size(batch_size)
+        async for article in cursor:
+            article["_id"] = str(article["_id"])
+            yield article
+
     @classmethod
     async def delete_article(cls, article_id: str) -> bool:
         if not cls.connected:
             await cls.connect_db()
 
+        if cls.write_buffer is not None:
+            def buffered(article: dict) -> bool:
+                return str(article["_id"]) == article_id
+
+            # 기록 중인 기사는 기록이 끝난 뒤 DB 에서 삭제 (먼저 지우면 뒤늦은 기록으로 기사가 되살아남)
+            await cls.write_buffer.wait_written(buffered)
+            # 아직 기록되지 않은 기사(기록에 실패해 되돌아온 경우 포함)는 버퍼에서 제거
+            if cls.write_buffer.remove(buffered):
+                await cls.delete_cross_edges(article_id)
+                return True
+
         try:
-            object_id = ObjectId(article_id)
-            result = await cls.article_collection.delete_one({"_id": object_id})
+            article_id = cls.resolve_article_id(article_id)
+            result = await cls.article_collection.delete_one({"_id": ObjectId(article_id)})
+            await cls.delete_cross_edges(article_id)
+            if result.deleted_count > 0:
+                cls._notify_deleted(article_id)
             return result.deleted_count > 0
         except Exception as e:
             print(f"Error deleting article: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    @classmethod
+    async def get_link_candidates(cls, exclude_id: Optional[str] = None, ids: Optional[List[str]] = None,
+                                  since: Optional[datetime.datetime] = None) -> List[dict]:
+        """
+        문서 간 연결 계산용 기사 목록 (본문 통계와 노드만, 저장 순서)
+        - ids: 이 기사들만 (저장 시 연결에서 후보 / 공출현 근거 문서만 읽을 때)
+        - since: updated_at 이 이 시각 이후인 기사만 (다른 워커가 저장한 기사를 연결 색인에 반영할 때)
+        본문 통계가 없는 이전 기사만 본문을 함께 읽는다.
+        """
+        if not cls.connected:
+            await cls.connect_db()
+
+        query = {}
+        if exclude_id and ObjectId.is_valid(exclude_id):
+            query["_id"] = {"$ne": ObjectId(exclude_id)}
+        if ids is not None:
+            query["_id"] = {"$in": [ObjectId(article_id) for article_id in ids if ObjectId.is_valid(article_id)]}
+        if since is not None:
+            query["updated_at"] = {"$gte": since}
+        articles = []
+        async for article in cls.article_collection.find(
+                query, {"text_stats": 1, "hypergraph_data.nodes": 1, "created_at": 1}).sort(ARTICLE_SORT):
+            article["_id"] = str(article["_id"])
+            articles.append(article)
+
+        legacy_ids = [ObjectId(article["_id"]) for article in articles if "text_stats" not in article]
+        if legacy_ids:
+            contents = {}
+            async for article in cls.article_collection.find({"_id": {"$in": legacy_ids}}, {"content": 1}):
+                contents[str(article["_id"])] = article.get("content", "")
+            for article in articles:
+                if "text_stats" not in article:
+                    article["content"] = contents.get(article["_id"], "")
+        return articles
+
+    @classmethod
+    async def get_existing_article_ids(cls, ids: List[str]) -> List[str]:
+        """주어진 id 중 DB 에 남아 있는 기사 id"""
+        if not cls.connected:
+            await cls.connect_db()
+
+        object_ids = [ObjectId(article_id) for article_id in ids if ObjectId.is_valid(article_id)]
+        return [str(article["_id"]) async for article in
+                cls.article_collection.find({"_id": {"$in": object_ids}}, {"_id": 1})]
+
+    @classmethod
+    async def get_cross_edges(cls, article_ids: Optional[List[str]] = None) -> List[dict]:
+        """문서 간 엣지 조회. article_ids 를 주면 그 기사들 중 하나에 닿는 엣지만 조회"""
+        if not cls.connected:
+            await cls.connect_db()
+
+        query = {}
+        if article_ids is not None:
+            query = {"$or": [{"source_doc": {"$in": article_ids}}, {"target_doc": {"$in": article_ids}}]}
+        return await cls.cross_edge_collection.find(query, {"_id": 0}).to_list(length=None)
+
+    @classmethod
+    async def replace_cross_edges(cls, article_id: str, edges: List[dict]):
+        """한 기사의 문서 간 엣지를 새로 계산한 것으로 교체"""
+        await cls.delete_cross_edges(article_id)
+        if edges:
+            await cls.cross_edge_collection.insert_many([dict(edge) for edge in edges], ordered=False)
+
+    @classmethod
+    async def replace_all_cross_edges(cls, edges: List[dict]):
+        """전체 문서 간 엣지 재구성"""
+        if not cls.connected:
+            await cls.connect_db()
+
+        await cls.cross_edge_collection.delete_many({})
+        if edges:
+            await cls.cross_edge_collection.insert_many([dict(edge) for edge in edges], ordered=False)
+
+    @classmethod
+    async def delete_cross_edges(cls, article_id: str) -> int:
+        if not cls.connected:
+            await cls.connect_db()
+
+        result = await cls.cross_edge_collection.delete_many(
+            {"$or": [{"source_doc": article_id}, {"target_doc": article_id}]}
+        )
+        return result.deleted_count
+
+    @classmethod
+    async def get_cached_result(cls, key: str, version: str) -> Optional[dict]:
+        """분석 결과 캐시 조회 (버전이 다른 항목은 없는 것으로 취급)"""
+        if not cls.connected:
+            await cls.connect_db()
+
+        entry = await cls.cache_collection.find_one({"_id": key, "version": version})
+        return entry["result"] if entry else None
+
+    @classmethod
+    async def save_cached_result(cls, key: str, version: str, result: dict):
+        if not cls.connected:
+            await cls.connect_db()
+
+        await cls.cache_collection.replace_one(
+            {"_id": key},
+            {"_id": key, "version": version, "result": result, "created_at": datetime.datetime.utcnow()},
+            upsert=True
+        )
+
+    @classmethod
+    async def delete_stale_cached_results(cls, version: str) -> int:
+        """현재 버전이 아닌 캐시 항목 삭제"""
+        if not cls.connected:
+            await cls.connect_db()
+
+        result = await cls.cache_collection.delete_many({"version": {"$ne": version}})
+        return result.deleted_count
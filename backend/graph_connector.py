@@ -1,5 +1,5 @@
 # graph_connector.py
-from typing import Dict, List, Tuple, Set
+from typing import List, Tuple, Set
 from collections import defaultdict
 import re
 import numpy as np
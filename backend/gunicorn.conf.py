@@ -0,0 +1,29 @@
+# gunicorn.conf.py
+# 멀티 프로세스 배포 설정 (코어당 워커 1개)
+#   python -m src.shared_state                # 공유 상태 내보내기 (PMI 변경 시 다시 실행)
+#   gunicorn -c gunicorn.conf.py app:app
+# - preload_app: 부모 프로세스에서 app 을 import 하면서 인코더/HGNN 을 미리 로드하고 fork 하여
+#   모델 가중치를 워커들이 copy-on-write 로 공유
+# - 특징 행렬 / L / 어휘 임베딩 테이블은 mmap 파일이므로 페이지 캐시를 공유
+# - JVM(DAON) 과 마이크로 배처 스레드는 fork 후 워커마다 시작
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "300"))
+
+# app import 전에 설정되어야 하는 환경 변수
+# 공유 상태를 아직 내보내지 않았으면 설정하지 않음 (워커가 PMI 파일에서 직접 생성)
+if os.path.exists(os.path.join("data/shared/relation", "manifest.json")):
+    os.environ.setdefault("SHARED_STATE_DIR", "data/shared/relation")
+os.environ.setdefault("PRELOAD_COMPONENTS", "encoder,relation_processor")
+# 워커가 코어 하나씩을 쓰므로 프로세스당 연산 스레드는 1개, 분석 스레드도 1개
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("ANALYSIS_WORKERS", "1")
+
+keyfile = os.getenv("SSL_KEYFILE")
+certfile = os.getenv("SSL_CERTFILE")
@@ -2,82 +2,68 @@ from koalanlp.proc import Tagger
 from koalanlp import API
 from koalanlp.Util import initialize, finalize
 from koalanlp.types import POS
-from collections import Counter, defaultdict
-import kss
-from typing import List, Dict, Tuple, Any
-from keybert import KeyBERT
-from transformers import AutoTokenizer, AutoModel
+import threading
+import time
+from typing import List, Dict, Tuple, Any, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
-import torch
-from sentence_transformers import util
-import json
+from src.embedding_table import EmbeddingTable, DEFAULT_TABLE_DIR
+from src.encoder_service import EncoderService
+from src.dictionary_index import DictionaryIndex
+from src.sentence_segmenter import split_sentences
+from src.pair_counter import VerbPairCounter, DEFAULT_MAX_NOUNS_PER_SENTENCE
+from src.tfidf_model import TfidfModel, DEFAULT_MODEL_PATH as DEFAULT_TFIDF_MODEL_PATH
 
 _jvm_initialized = False
 
 
+def initialize_jvm():
+    """KoalaNLP(DAON) JVM 시작. 인코더 로드와 병렬로 미리 시작할 수 있도록 분리"""
+    global _jvm_initialized
+    if not _jvm_initialized:
+        try:
+            initialize(
+                java_options="-Xmx4g -Dfile.encoding=UTF-8 --add-opens=java.base/java.util=ALL-UNNAMED --add-opens=java.base/java.lang=ALL-UNNAMED --add-opens=java.base/java.lang.reflect=ALL-UNNAMED",
+                DAON="LATEST"
+            )
+            _jvm_initialized = True
+        except Exception as e:
+            if "JVM cannot be initialized more than once" not in str(e):
+                raise e
+
+
 class NLPProcessor:
-    def __init__(self):
+    def __init__(self, encoder: Optional[EncoderService] = None,
+                 embedding_table_dir: str = DEFAULT_TABLE_DIR,
+                 dictionary_file_path: str = "dictionary.json",
+                 tfidf_model_path: str = DEFAULT_TFIDF_MODEL_PATH):
         self.initialize_nlp()
-        self.tokenizer = AutoTokenizer.from_pretrained("upskyy/kf-deberta-multitask")
-        self.model = AutoModel.from_pretrained("upskyy/kf-deberta-multitask").to(
-            "cuda" if torch.cuda.is_available() else "cpu")
-        self.keybert_model = KeyBERT("multi-qa-mpnet-base-cos-v1")
+        # kf-deberta / KeyBERT(mpnet) 인코더는 공유 임베딩 서비스 사용
+        self.encoder = encoder or EncoderService(
+            embedding_table=EmbeddingTable.load(embedding_table_dir)
+        )
+        # 코퍼스에서 학습된 TF-IDF 모델 (없으면 문서 단위 fit_transform 으로 대체)
+        self.tfidf_model = TfidfModel.load(tfidf_model_path)
         self.tfidf_vectorizer = TfidfVectorizer(
             min_df=1,
             max_features=1000,
             token_pattern=r'(?u)\b\w+\b'
         )
-        self.dictionary_file_path = "dictionary.json"
-        self.dictionary = self.load_dictionary()
-        self.economic_terms_cache = {}
+        self.dictionary_file_path = dictionary_file_path
+        # 사전 색인은 정의 검색(src/give)과 공유
+        self.dictionary_index = DictionaryIndex.shared(self.dictionary_file_path)
 
     def initialize_nlp(self):
-        global _jvm_initialized
-        if not _jvm_initialized:
-            try:
-                initialize(
-                    java_options="-Xmx4g -Dfile.encoding=UTF-8 --add-opens=java.base/java.util=ALL-UNNAMED --add-opens=java.base/java.lang=ALL-UNNAMED --add-opens=java.base/java.lang.reflect=ALL-UNNAMED",
-                    DAON="LATEST"
-                )
-                _jvm_initialized = True
-            except Exception as e:
-                if "JVM cannot be initialized more than once" not in str(e):
-                    raise e
+        initialize_jvm()
         self.tagger = Tagger(API.DAON)
-
-    def load_dictionary(self):
-        try:
-            with open(self.dictionary_file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except FileNotFoundError:
-            return {}
+        # 분석 스레드 풀에서 동시에 호출되므로 태거 호출은 직렬화
+        self._tagger_lock = threading.Lock()
 
     def is_economic_term(self, term: str) -> bool:
-        if term in self.economic_terms_cache:
-            return self.economic_terms_cache[term]
-
-        term_cleaned = term.replace(" ", "").lower()
-
-        result = False
-        if term_cleaned in self.dictionary:
-            result = True
-        else:
-            for key in self.dictionary.keys():
-                key_cleaned = key.split("(")[0].replace(" ", "").lower()
-                if key_cleaned == term_cleaned:
-                    result = True
-                    break
-                if "(" in key:
-                    inside_parentheses = key.split("(")[1].rstrip(")").lower()
-                    if any(item.strip() == term_cleaned for item in inside_parentheses.split(",")):
-                        result = True
-                        break
-
-        self.economic_terms_cache[term] = result
-        return result
+        return self.dictionary_index.contains(term)
 
     def extract_verbs_and_nouns(self, sentence: Any) -> Tuple[List[str], List[str]]:
-        analyzed = self.tagger(sentence)
+        with self._tagger_lock:
+            analyzed = self.tagger(sentence)
         verbs = []
         nouns = []
         for sent in analyzed:
@@ -101,37 +87,48 @@ class NLPProcessor:
                         verbs.append(combined_verb)
         return list(set(verbs)), list(set(nouns))
 
-    def preprocess_text(self, text: str) -> Dict:
-        # 1. TF-IDF 점수 미리 계산
-        tfidf_matrix = self.tfidf_vectorizer.fit_transform([text])
-        feature_names = self.tfidf_vectorizer.get_feature_names_out()
-        tfidf_scores = dict(zip(feature_names, tfidf_matrix.toarray()[0]))
+    def preprocess_text(self, text: str, candidates: Optional[List[str]] = None) -> Dict:
+        # 1. TF-IDF 점수 미리 계산 (학습된 코퍼스 IDF 로 transform 만 수행)
+        if self.tfidf_model is not None:
+            tfidf_scores = self.tfidf_model.scores(text)
+        else:
+            tfidf_matrix = self.tfidf_vectorizer.fit_transform([text])
+            feature_names = self.tfidf_vectorizer.get_feature_names_out()
+            tfidf_scores = dict(zip(feature_names, tfidf_matrix.toarray()[0]))
 
         word_count = len(text.split())
         top_n = min(10, max(5, word_count // 100))
         max_pairs_per_verb = min(5, max(3, word_count // 200))
 
-        # 2. KeyBERT 키워드 미리 추출
-        keybert_results = dict(self.keybert_model.extract_keywords(text, top_n))
+        # 2. KeyBERT 키워드 미리 추출 (후보는 태거가 찾은 명사로 제한)
+        if candidates is None:
+            _, candidates = self.extract_verbs_and_nouns(text)
+        keybert_results = dict(self.encoder.extract_keywords(text, candidates, top_n))
 
-        # 3. DeBERTa text embedding 미리 계산
-        text_encoding = self.tokenizer(
-            text,
-            padding=True,
-            truncation=True,
-            max_length=512,
-            return_tensors='pt'
-        ).to(self.model.device)
-
-        with torch.no_grad():
-            text_embedding = self.model(**text_encoding).last_hidden_state.mean(dim=1)
+        # 3. DeBERTa text embedding 미리 계산 (정규화된 벡터)
+        text_embedding = self.encoder.deberta_document(text)
 
         return {
             'tfidf_scores': tfidf_scores,
             'keybert_results': keybert_results,
-            'text_embedding': text_embedding
+            'text_embedding': text_embedding,
+            'term_similarities': {}
         }
 
+    def calculate_term_similarities(self, preprocessed_data: Dict, terms) -> Dict[str, float]:
+        """본문과 용어들의 DeBERTa 코사인 유사도 (어휘 테이블 조회 + OOV 용어만 일괄 모델 계산)"""
+        terms = [term for term in dict.fromkeys(terms)
+                 if term not in preprocessed_data['term_similarities']]
+        if not terms:
+            return preprocessed_data['term_similarities']
+
+        vectors = self.encoder.deberta_terms(terms)
+        similarities = vectors @ preprocessed_data['text_embedding']
+        preprocessed_data['term_similarities'].update(
+            (term, float(score)) for term, score in zip(terms, similarities)
+        )
+        return preprocessed_data['term_similarities']
+
     def calculate_node_importance(self, preprocessed_data: Dict, node_term: str) -> float:
         importance_scores = []
 
@@ -143,22 +140,9 @@ class NLPProcessor:
         keybert_score = preprocessed_data['keybert_results'].get(node_term, 0.0)
         importance_scores.append(keybert_score)
 
-        # 3. DeBERTa 유사도
+        # 3. DeBERTa 유사도 (어휘 테이블에 있는 용어는 내적만 수행)
         try:
-            term_encoding = self.tokenizer(
-                node_term,
-                padding=True,
-                truncation=True,
-                max_length=128,
-                return_tensors='pt'
-            ).to(self.model.device)
-
-            with torch.no_grad():
-                term_embedding = self.model(**term_encoding).last_hidden_state.mean(dim=1)
-                similarity = util.pytorch_cos_sim(
-                    preprocessed_data['text_embedding'],
-                    term_embedding
-                )[0][0].item()
+            similarity = self.calculate_term_similarities(preprocessed_data, [node_term])[node_term]
             importance_scores.append(similarity)
         except Exception:
             pass
@@ -174,76 +158,38 @@ class NLPProcessor:
         final_importance = sum(valid_scores) / len(valid_scores)
         return round(final_importance, 3)
 
-    def process_text(self, text: str, top_n: int = 5, max_pairs_per_verb: int = 3) -> Dict:
-        # 전처리 데이터 미리 계산
-        preprocessed_data = self.preprocess_text(text)
+    def process_text(self, text: str, top_n: int = 5, max_pairs_per_verb: int = 3,
+                     timings: Optional[Dict[str, float]] = None,
+                     max_nouns_per_sentence: int = DEFAULT_MAX_NOUNS_PER_SENTENCE) -> Dict:
+        # 문장 분리 (규칙 기반 + 애매한 문단만 kss, 문단 해시 캐시)
+        segmentation_started = time.perf_counter()
+        sentences = split_sentences(text)
+        if timings is not None:
+            timings['segmentation_ms'] = round((time.perf_counter() - segmentation_started) * 1000, 2)
 
-        sentences = list(kss.split_sentences(text))
-        relationships = []
-        nodes_counter = Counter()
-        verb_counter = Counter()
-        verb_pairs = defaultdict(Counter)
+        # 문장별 형태소 분석은 한 번만 수행하여 재사용
+        tagged_sentences = [self.extract_verbs_and_nouns(sentence) for sentence in sentences]
+
+        # 전처리 데이터 미리 계산 (KeyBERT 후보는 태거가 찾은 명사)
+        candidates = [noun for _, nouns in tagged_sentences for noun in nouns]
+        preprocessed_data = self.preprocess_text(text, candidates)
 
         # 경제 용어 노드 우선 수집
         economic_terms = set()
-        for sentence in sentences:
-            _, nouns = self.extract_verbs_and_nouns(sentence)
+        for _, nouns in tagged_sentences:
             for noun in nouns:
                 if self.is_economic_term(noun):
                     economic_terms.add(noun)
 
-        for sentence in sentences:
-            verbs, nouns = self.extract_verbs_and_nouns(sentence)
-            if len(nouns) < 2:
-                continue
-
-            filtered_verbs = [verb for verb in verbs if len(verb) >= 2]
-            if not filtered_verbs:
-                continue
-
-            # 경제 용어가 포함된 문장 우선 처리
-            has_economic_term = any(term in nouns for term in economic_terms)
-            if has_economic_term:
-                verb_counter.update(filtered_verbs)
-                noun_pairs = [(nouns[i], nouns[j])
-                              for i in range(len(nouns))
-                              for j in range(i + 1, len(nouns))
-                              if nouns[i] in economic_terms or nouns[j] in economic_terms]
-
-                nodes_counter.update(nouns)
-
-                for verb in filtered_verbs:
-                    for noun1, noun2 in noun_pairs:
-                        if noun1 != noun2:
-                            pair = tuple(sorted([noun1, noun2]))
-                            verb_pairs[verb][pair] += 2
-            else:
-                verb_counter.update(filtered_verbs)
-                noun_pairs = [(nouns[i], nouns[j])
-                              for i in range(len(nouns))
-                              for j in range(i + 1, len(nouns))]
-
-                nodes_counter.update(nouns)
-
-                for verb in filtered_verbs:
-                    for noun1, noun2 in noun_pairs:
-                        if noun1 != noun2:
-                            pair = tuple(sorted([noun1, noun2]))
-                            verb_pairs[verb][pair] += 1
-
-        top_verbs = dict(verb_counter.most_common(top_n))
+        # 동사별 명사쌍 빈도 (정수 id 배열로 집계, 문장당 후보 명사 수 제한)
+        pair_counter = VerbPairCounter(economic_terms, max_nouns_per_sentence)
+        pair_counter.add_sentences(tagged_sentences)
+
+        top_verbs = dict(pair_counter.verb_counter.most_common(top_n))
         filtered_relationships = []
 
         for verb in top_verbs:
-            pairs = verb_pairs[verb].most_common()
-            economic_pairs = [(pair, count) for pair, count in pairs
-                              if any(self.is_economic_term(term) for term in pair)]
-            normal_pairs = [(pair, count) for pair, count in pairs
-                            if not any(self.is_economic_term(term) for term in pair)]
-
-            selected_pairs = (economic_pairs + normal_pairs)[:max_pairs_per_verb]
-
-            for pair, _ in selected_pairs:
+            for pair in pair_counter.select_pairs(verb, max_pairs_per_verb):
                 filtered_relationships.append({
                     "verb": verb,
                     "keywords": list(pair)
@@ -259,6 +205,12 @@ class NLPProcessor:
         economic_nodes = set(term for term in used_nodes if self.is_economic_term(term))
         other_nodes = used_nodes - economic_nodes
 
+        # 노드 용어 유사도를 한 번에 계산 (OOV 용어만 배치로 모델 호출)
+        try:
+            self.calculate_term_similarities(preprocessed_data, sorted(used_nodes))
+        except Exception:
+            pass
+
         for term in sorted(economic_nodes):
             importance = self.calculate_node_importance(preprocessed_data, term)
             nodes.append({
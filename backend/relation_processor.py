@@ -9,6 +9,7 @@ from src.matrix_processor4 import (
 import json
 import numpy as np
 from scipy.sparse import csr_matrix
+from src.shared_state import extract_keywords, load_relation_state
 
 
 class RelationProcessor:
@@ -20,30 +21,38 @@ class RelationProcessor:
         7: "위험및위기", 8: "기술및혁신"
     }
 
-    def __init__(self, model_path: str, pmi_path: str):
-        # PMI 데이터와 키워드 초기화
+    def __init__(self, model_path: str, pmi_path: str, shared_state_dir: str = None):
         self.pmi_path = pmi_path
-        with open(self.pmi_path, 'r', encoding='utf-8') as f:
-            pmi_data = json.load(f)
-        self.keywords = self._extract_keywords(pmi_data)
-        self.keyword_to_idx = {kw: idx for idx, kw in enumerate(self.keywords)}
-
-        # 행렬 구조 초기화
-        self.feature_matrix = create_feature_matrix(pmi_path, self.keywords, self.keyword_to_idx)
-        H, W = create_hypergraph_structure(pmi_path, self.keywords, self.keyword_to_idx)
-        self.L = generate_normalized_laplacian(H, W)
+        state = None
+        if shared_state_dir:
+            # 멀티 워커 모드: 내보낸 어휘/특징 CSR/L 을 mmap 으로 열어 프로세스 간에 공유
+            try:
+                state = load_relation_state(shared_state_dir)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"공유 상태 로드 실패, PMI 파일에서 생성: {shared_state_dir} ({e})")
+        if state is not None:
+            self.keywords = state.keywords
+            self.keyword_to_idx = {kw: idx for idx, kw in enumerate(self.keywords)}
+            self.feature_matrix = state.feature_matrix
+            self.L = state.laplacian
+        else:
+            # PMI 데이터와 키워드 초기화
+            with open(self.pmi_path, 'r', encoding='utf-8') as f:
+                pmi_data = json.load(f)
+            # 공유 상태와 같은 정렬 순서 (키워드 인덱스가 워커 / 모드와 무관하게 같도록)
+            self.keywords = extract_keywords(pmi_data)
+            self.keyword_to_idx = {kw: idx for idx, kw in enumerate(self.keywords)}
+
+            # 행렬 구조 초기화
+            self.feature_matrix = create_feature_matrix(pmi_path, self.keywords, self.keyword_to_idx)
+            H, W = create_hypergraph_structure(pmi_path, self.keywords, self.keyword_to_idx)
+            self.L = generate_normalized_laplacian(H, W)
+        self._L_sparse = None
 
         # HGNN 모델 초기화
         self.model = self._initialize_model(model_path)
         self.model.eval()
 
-    def _extract_keywords(self, pmi_data: dict) -> list:
-        """PMI 데이터에서 키워드 추출"""
-        keywords = {kw for pairs in pmi_data.values()
-                    for pair in pairs.keys()
-                    for kw in pair.split(" | ")}
-        return list(keywords)
-
     def _initialize_model(self, model_path: str) -> HGNN:
         """HGNN 모델 초기화"""
         model = HGNN(
@@ -69,9 +78,11 @@ class RelationProcessor:
 
     def classify_relations(self, graph_data: dict) -> dict:
         """그래프 데이터의 관계 분류"""
-        L_sparse = self._convert_to_sparse_tensor(self.L)
         device = next(self.model.parameters()).device
-        L_sparse = L_sparse.to(device)
+        # L 희소 텐서는 요청마다 만들지 않고 한 번만 변환
+        if self._L_sparse is None or self._L_sparse.device != device:
+            self._L_sparse = self._convert_to_sparse_tensor(self.L).to(device)
+        L_sparse = self._L_sparse
 
         # 엣지 정보를 카테고리와 함께 확장
         enhanced_edges = []
@@ -92,8 +103,9 @@ class RelationProcessor:
                 )
 
                 # 특징 벡터 계산
+                # 조밀 행렬 / CSR 모두 (1, n) 평균 벡터로 변환
                 mean_features = torch.from_numpy(
-                    self.feature_matrix[indices].mean(axis=0)
+                    np.asarray(self.feature_matrix[indices].mean(axis=0)).ravel()
                 ).float().to(device)
 
                 for idx in indices:
@@ -0,0 +1,111 @@
+# src/async_fetcher.py
+# 기사 페이지용 비동기 HTTP 클라이언트
+# - 프로세스 공용 연결 풀 (호스트별 keep-alive 연결 재사용)
+# - gzip / deflate / br 압축 협상 (br 은 brotli 패키지가 있으면 httpx 가 자동 협상)
+# - 연결 / 읽기 시간 제한
+# - 일시적인 오류(연결 실패, 시간 초과, 429/5xx)는 지수 백오프 + 지터로 제한 횟수만큼 재시도
+# - 호스트별 동시 요청 수 제한 (한 언론사에 요청이 몰리지 않도록)
+import asyncio
+import random
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class FetchError(RuntimeError):
+    """재시도 후에도 페이지를 가져오지 못한 경우"""
+
+
+class AsyncFetcher:
+    """연결 풀 / 시간 제한 / 재시도 / 호스트별 동시성 제한을 가진 페이지 요청기"""
+
+    def __init__(self,
+                 connect_timeout: float = 3.0,
+                 read_timeout: float = 10.0,
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 per_host_limit: int = 4,
+                 max_retries: int = 2,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 8.0,
+                 user_agent: str = DEFAULT_USER_AGENT,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections),
+            headers={"User-Agent": user_agent},
+            follow_redirects=True,
+            transport=transport
+        )
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats = {"requests": 0, "retries": 0, "failures": 0, "bytes": 0}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = (urlsplit(url).hostname or "").lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """지수 백오프 + full jitter. 서버가 Retry-After(초)를 주면 그 값을 우선 (최대 backoff_max)"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        GET 요청. 2xx/3xx(조건부 요청의 304 포함) 응답을 반환하고, 재시도 후에도 실패하면 FetchError
+        4xx(429 제외)는 재시도하지 않는다.
+        """
+        return await self.request("GET", url, headers=headers)
+
+    async def post(self, url: str, data: Optional[Dict[str, object]] = None,
+                   headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """폼 POST 요청 (재시도 / 실패 규칙은 get 과 같음)"""
+        return await self.request("POST", url, headers=headers, data=data)
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      data: Optional[Dict[str, object]] = None) -> httpx.Response:
+        async with self._host_semaphore(url):
+            for attempt in range(self.max_retries + 1):
+                response = None
+                self._stats["requests"] += 1
+                try:
+                    response = await self._client.request(method, url, headers=headers, data=data)
+                except httpx.TransportError as e:  # 연결 실패, 시간 초과 등
+                    error = str(e) or type(e).__name__
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        if response.is_error:
+                            self._stats["failures"] += 1
+                            raise FetchError(f"Failed to fetch the URL: HTTP {response.status_code} ({url})")
+                        self._stats["bytes"] += len(response.content)
+                        return response
+                    error = f"HTTP {response.status_code}"
+
+                if attempt == self.max_retries:
+                    self._stats["failures"] += 1
+                    raise FetchError(f"Failed to fetch the URL after {attempt + 1} attempts: {error} ({url})")
+                self._stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt, response))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, hosts=len(self._host_semaphores))
+
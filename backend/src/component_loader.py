@@ -0,0 +1,151 @@
+# src/component_loader.py
+# 무거운 구성 요소(JVM, 인코더, HGNN 등)를 백그라운드에서 병렬로 로드하는 로더
+# - 서버는 로드 완료를 기다리지 않고 바로 포트를 열고, 준비 상태는 /readyz 로 확인
+# - 서로 독립적인 구성 요소는 동시에 로드하고, 의존 관계가 있으면 선행 요소 완료 후 로드
+# - 구성 요소별 상태 / 로드 시간 / 오류를 기록
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class ComponentNotReady(Exception):
+    """구성 요소가 아직 로드 중이거나 로드에 실패한 경우"""
+
+    def __init__(self, name: str, state: str, error: Optional[str] = None):
+        self.name = name
+        self.state = state
+        self.error = error
+        message = f"{name} 구성 요소가 준비되지 않았습니다 ({state})"
+        if error:
+            message += f": {error}"
+        super().__init__(message)
+
+
+class _Component:
+    def __init__(self, name: str, factory: Callable[..., Any], depends_on: Sequence[str]):
+        self.name = name
+        self.factory = factory
+        self.depends_on = tuple(depends_on)
+        self.state = "pending"
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.load_ms: Optional[float] = None
+        self.done = threading.Event()
+
+
+class ComponentLoader:
+    """이름 → 팩토리 등록 후 start() 로 백그라운드 병렬 로드"""
+
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[..., Any], depends_on: Sequence[str] = ()) -> None:
+        """
+        구성 요소 등록. factory 는 depends_on 순서대로 선행 구성 요소 값을 인자로 받는다.
+        """
+        if name in self._components:
+            raise ValueError(f"이미 등록된 구성 요소입니다: {name}")
+        self._components[name] = _Component(name, factory, depends_on)
+
+    def preload(self, names: Sequence[str]) -> None:
+        """
+        지정한 구성 요소를 호출한 스레드에서 바로 로드 (선행 구성 요소도 함께 지정해야 함).
+        gunicorn preload_app 처럼 fork 전에 부모 프로세스에서 읽기 전용 모델을 올려 두면
+        워커들이 copy-on-write 로 메모리를 공유한다. 로드 스레드는 fork 후 복제되지 않으므로
+        나머지 구성 요소는 워커에서 start() 로 로드한다.
+        """
+        for name in names:
+            component = self._components[name]
+            pending = [dependency for dependency in component.depends_on
+                       if not self._components[dependency].done.is_set()]
+            if pending:
+                raise ValueError(f"{name} 의 선행 구성 요소를 먼저 로드해야 합니다: {pending}")
+            if not component.done.is_set():
+                self._load(component)
+
+    def start(self) -> None:
+        """구성 요소마다 스레드를 하나씩 띄워 로드 (이미 시작했거나 미리 로드된 요소는 무시)"""
+        with self._lock:
+            if self._started_at is not None:
+                return
+            self._started_at = time.perf_counter()
+        for component in self._components.values():
+            if component.done.is_set():
+                continue
+            threading.Thread(target=self._load, args=(component,),
+                             name=f"load-{component.name}", daemon=True).start()
+        self._mark_finished()
+
+    def _load(self, component: _Component) -> None:
+        try:
+            args = [self.wait(dependency) for dependency in component.depends_on]
+            component.state = "loading"
+            started = time.perf_counter()
+            print(f"[로더] {component.name} 로드 시작")
+            component.value = component.factory(*args)
+            component.load_ms = round((time.perf_counter() - started) * 1000, 1)
+            component.state = "ready"
+            print(f"[로더] {component.name} 로드 완료: {component.load_ms} ms")
+        except Exception as e:
+            component.state = "failed"
+            component.error = str(e)
+            print(f"[로더] {component.name} 로드 실패: {e}")
+        finally:
+            component.done.set()
+            self._mark_finished()
+
+    def _mark_finished(self) -> None:
+        with self._lock:
+            if self._started_at is None or self._finished_at is not None:
+                return
+            if all(component.done.is_set() for component in self._components.values()):
+                self._finished_at = time.perf_counter()
+                print(f"[로더] 전체 로드 완료: {self._elapsed_ms(self._finished_at)} ms")
+
+    def _elapsed_ms(self, until: float) -> float:
+        return round((until - self._started_at) * 1000, 1)
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> Any:
+        """구성 요소가 로드될 때까지 대기 후 반환 (실패/시간 초과 시 ComponentNotReady)"""
+        component = self._components[name]
+        if not component.done.wait(timeout):
+            raise ComponentNotReady(name, component.state)
+        if component.state != "ready":
+            raise ComponentNotReady(name, component.state, component.error)
+        return component.value
+
+    def get(self, name: str) -> Any:
+        """대기하지 않고 반환. 준비되지 않았으면 ComponentNotReady"""
+        component = self._components[name]
+        if component.state != "ready":
+            raise ComponentNotReady(name, component.state, component.error)
+        return component.value
+
+    def get_if_ready(self, name: str) -> Any:
+        component = self._components.get(name)
+        return component.value if component is not None and component.state == "ready" else None
+
+    def is_ready(self, names: Optional[List[str]] = None) -> bool:
+        names = names or list(self._components)
+        return all(self._components[name].state == "ready" for name in names)
+
+    def status(self) -> Dict[str, Any]:
+        """구성 요소별 상태와 로드 시간"""
+        now = time.perf_counter()
+        return {
+            "ready": self.is_ready(),
+            "started": self._started_at is not None,
+            "elapsed_ms": self._elapsed_ms(self._finished_at or now) if self._started_at else None,
+            "components": {
+                name: {
+                    "state": component.state,
+                    "load_ms": component.load_ms,
+                    "depends_on": list(component.depends_on),
+                    "error": component.error
+                }
+                for name, component in self._components.items()
+            }
+        }
@@ -0,0 +1,56 @@
+# src/concurrency.py
+# 요청 동시 처리 제한 (한도를 넘으면 대기열에 쌓지 않고 즉시 거절하여 429 로 응답)
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """동시 처리 한도 초과"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"동시 분석 요청 한도({limit})를 초과했습니다. 잠시 후 다시 시도해 주세요.")
+
+
+class ConcurrencyLimiter:
+    """진행 중인 작업 수를 세고 한도를 넘는 요청은 거절"""
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("동시 처리 한도는 1 이상이어야 합니다")
+        self.limit = limit
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._stats = {"accepted": 0, "rejected": 0, "peak_in_flight": 0}
+
+    def acquire(self) -> None:
+        """처리 슬롯 확보. 한도 초과 시 ConcurrencyLimitExceeded (성공하면 release() 필요)"""
+        with self._lock:
+            if self._in_flight >= self.limit:
+                self._stats["rejected"] += 1
+                raise ConcurrencyLimitExceeded(self.limit)
+            self._in_flight += 1
+            self._stats["accepted"] += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    @contextmanager
+    def slot(self):
+        """작업 하나의 처리 구간. 한도 초과 시 ConcurrencyLimitExceeded"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, limit=self.limit, in_flight=self._in_flight)
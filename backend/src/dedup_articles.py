@@ -0,0 +1,100 @@
+# src/dedup_articles.py
+# 저장된 기사 중복 정리 (일회성 마이그레이션)
+# - 모든 문서에 url_hash(정규화 URL 의 sha256)를 채움
+# - 같은 url_hash 의 문서가 여러 개면 가장 최근에 저장된 것(created_at, _id 기준)만 남기고 삭제
+#   (삭제한 문서에 닿는 문서 간 엣지(cross_edges)도 함께 삭제)
+# - 정리 후 Database.ensure_indexes() 로 url_hash unique / created_at 인덱스 생성
+#
+# 사용 예 (backend 디렉터리에서):
+#   python -m src.dedup_articles --dry-run
+#   python -m src.dedup_articles
+import argparse
+import asyncio
+from typing import Dict, List
+
+from pymongo import UpdateOne
+
+from src.url_utils import url_hash
+
+
+def plan_dedup(articles: List[dict]) -> Dict[str, list]:
+    """
+    (_id, url, url_hash, created_at) 문서 목록 → 정리 계획
+    - set_hash: [(_id, url_hash)] url_hash 가 없거나 다른 문서
+    - delete: [_id] 중복이라 삭제할 문서
+    url 이 비어 있는 문서는 건드리지 않는다.
+    """
+    groups: Dict[str, List[dict]] = {}
+    for article in articles:
+        if article.get("url"):
+            groups.setdefault(url_hash(article["url"]), []).append(article)
+
+    set_hash, delete = [], []
+    for digest, group in groups.items():
+        group.sort(key=lambda article: (article.get("created_at") is not None,
+                                        article.get("created_at"), article["_id"]))
+        keep = group[-1]
+        delete.extend(article["_id"] for article in group[:-1])
+        if keep.get("url_hash") != digest:
+            set_hash.append((keep["_id"], digest))
+    return {"set_hash": set_hash, "delete": delete}
+
+
+async def dedup_articles(collection, dry_run: bool = False, batch_size: int = 500,
+                         cross_edge_collection=None) -> Dict[str, int]:
+    """
+    motor 컬렉션(또는 같은 인터페이스의 대체 객체)에 정리 계획 적용
+    삭제를 먼저 하고 url_hash 를 채우므로 unique 인덱스가 이미 있어도 충돌하지 않는다.
+    cross_edge_collection 을 주면 삭제한 문서에 닿는 문서 간 엣지도 삭제 (엣지의 문서 id 는 문자열)
+    """
+    articles = []
+    async for article in collection.find({}, {"_id": 1, "url": 1, "url_hash": 1, "created_at": 1}):
+        articles.append(article)
+    plan = plan_dedup(articles)
+
+    summary = {"scanned": len(articles), "deleted": len(plan["delete"]), "hash_updated": len(plan["set_hash"]),
+               "cross_edges_deleted": 0}
+    if dry_run:
+        return summary
+
+    for start in range(0, len(plan["delete"]), batch_size):
+        deleted_ids = plan["delete"][start:start + batch_size]
+        await collection.delete_many({"_id": {"$in": deleted_ids}})
+        if cross_edge_collection is not None:
+            doc_ids = [str(article_id) for article_id in deleted_ids]
+            result = await cross_edge_collection.delete_many(
+                {"$or": [{"source_doc": {"$in": doc_ids}}, {"target_doc": {"$in": doc_ids}}]}
+            )
+            summary["cross_edges_deleted"] += result.deleted_count
+    for start in range(0, len(plan["set_hash"]), batch_size):
+        await collection.bulk_write([UpdateOne({"_id": article_id}, {"$set": {"url_hash": digest}})
+                                     for article_id, digest in plan["set_hash"][start:start + batch_size]],
+                                    ordered=False)
+    return summary
+
+
+async def main_async(dry_run: bool) -> None:
+    from database import Database
+
+    await Database.connect_db()
+    try:
+        summary = await dedup_articles(Database.article_collection, dry_run=dry_run,
+                                       cross_edge_collection=Database.cross_edge_collection)
+        print(f"검사 {summary['scanned']}건, 중복 삭제 {summary['deleted']}건, url_hash 갱신 {summary['hash_updated']}건, "
+              f"문서 간 엣지 삭제 {summary['cross_edges_deleted']}건" + (" (dry-run, 변경 없음)" if dry_run else ""))
+        if not dry_run:
+            await Database.ensure_indexes()
+            print("인덱스 생성 완료")
+    finally:
+        await Database.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 기사 URL 중복 정리")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 정리 대상 건수만 출력")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
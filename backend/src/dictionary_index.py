@@ -0,0 +1,121 @@
+# src/dictionary_index.py
+# 경제 용어 사전(dictionary.json) 색인
+# 사전 키를 한 번만 정규화하여 "표제어 / 괄호 안 별칭 → 사전 키" 해시 색인을 만들고,
+# 경제 용어 판별(NLPProcessor)과 정의 검색(src/give)이 같은 색인을 공유한다.
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+def normalize_word(word: str) -> str:
+    """띄어쓰기 제거 + 소문자화 (기존 검색과 동일한 정규화)"""
+    return word.replace(" ", "").lower()
+
+
+def build_alias_index(data: Dict[str, str]) -> Dict[str, str]:
+    """
+    정규화된 표제어와 괄호 안 별칭을 사전 키로 매핑
+
+    기존 선형 검색은 사전 순서대로 키를 돌며 처음 일치한 키를 반환했으므로,
+    같은 표제어/별칭이 여러 키에 있으면 먼저 나온 키를 유지한다(setdefault).
+    """
+    aliases: Dict[str, str] = {}
+    for key in data:
+        # 괄호 앞의 용어
+        aliases.setdefault(key.split("(")[0].replace(" ", "").lower(), key)
+
+        # 괄호 안의 용어 (쉼표로 구분된 별칭)
+        if "(" in key:
+            inside_parentheses = key.split("(")[1].rstrip(")").lower()
+            for item in inside_parentheses.split(","):
+                aliases.setdefault(item.strip(), key)
+    return aliases
+
+
+class DictionaryIndex:
+    """경제 용어 사전 색인 (O(1) 조회, 파일 변경 시 자동 재로딩)"""
+
+    _shared: Dict[str, "DictionaryIndex"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, file_path: str, reload_interval: float = 5.0):
+        self.file_path = file_path
+        self.reload_interval = reload_interval
+        self.version = 0
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._index: Tuple[Dict[str, str], Dict[str, str]] = ({}, {})
+        self.reload()
+
+    @classmethod
+    def shared(cls, file_path: str) -> "DictionaryIndex":
+        """파일 경로별로 프로세스에서 하나만 만들어 공유하는 색인"""
+        key = os.path.abspath(file_path)
+        with cls._shared_lock:
+            index = cls._shared.get(key)
+            if index is None:
+                index = cls(file_path)
+                cls._shared[key] = index
+            return index
+
+    @property
+    def data(self) -> Dict[str, str]:
+        self._maybe_reload()
+        return self._index[0]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def reload(self) -> None:
+        """사전 파일을 읽어 색인을 다시 만듦. 파일이 없으면 빈 사전"""
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.file_path)
+                with open(self.file_path, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
+            except FileNotFoundError:
+                mtime, data = None, {}
+
+            # 색인 교체는 튜플 한 번의 대입으로 수행하여 조회 중인 스레드에 영향이 없도록 함
+            self._index = (data, build_alias_index(data))
+            self._mtime = mtime
+            self._last_check = time.monotonic()
+            self.version += 1
+            if data:
+                print(f"경제 용어 사전 색인 완료: {len(data)}개 ({self.file_path})")
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.file_path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self.reload()
+
+    def _lookup(self, word: str) -> Tuple[Dict[str, str], Optional[str]]:
+        self._maybe_reload()
+        data, aliases = self._index
+        word_cleaned = normalize_word(word)
+
+        # 이미 사전에 있는 경우
+        if word_cleaned in data:
+            return data, word_cleaned
+        return data, aliases.get(word_cleaned)
+
+    def find_key(self, word: str) -> Optional[str]:
+        """단어에 해당하는 사전 키 (없으면 None)"""
+        return self._lookup(word)[1]
+
+    def contains(self, word: str) -> bool:
+        return self.find_key(word) is not None
+
+    def definition(self, word: str) -> Optional[str]:
+        data, key = self._lookup(word)
+        return data[key] if key is not None else None
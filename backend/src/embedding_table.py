@@ -0,0 +1,221 @@
+# src/embedding_table.py
+# 경제 어휘(관계 분류 PMI 키워드 전체 + 사전 용어)의 kf-deberta 임베딩을 오프라인으로 미리 계산해
+# float16 행렬로 저장하고, 서비스에서는 memory-map 으로 용어별 조회만 수행
+import argparse
+import json
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from src.shared_state import extract_keywords
+
+DEFAULT_MODEL_NAME = "upskyy/kf-deberta-multitask"
+DEFAULT_TABLE_DIR = "data/embeddings/kf-deberta"
+EMBEDDINGS_FILE = "embeddings.npy"
+TERMS_FILE = "terms.json"
+
+
+def mean_pool(last_hidden_state: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+    """패딩 토큰을 제외한 평균 풀링 (배치 크기 1 에서의 .mean(dim=1) 과 동일한 값)"""
+    mask = attention_mask.unsqueeze(-1).to(last_hidden_state.dtype)
+    summed = (last_hidden_state * mask).sum(dim=1)
+    return summed / mask.sum(dim=1).clamp(min=1e-9)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (코사인 유사도를 내적으로 계산하기 위함)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def encode_texts(tokenizer, model, texts: List[str], max_length: int = 128,
+                 batch_size: int = 64) -> np.ndarray:
+    """텍스트 목록을 배치 단위로 인코딩하여 (n, hidden) float32 행렬 반환"""
+    chunks = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        encoding = tokenizer(
+            batch,
+            padding=True,
+            truncation=True,
+            max_length=max_length,
+            return_tensors='pt'
+        ).to(model.device)
+        with torch.no_grad():
+            output = model(**encoding).last_hidden_state
+            pooled = mean_pool(output, encoding['attention_mask'])
+        chunks.append(pooled.float().cpu().numpy())
+    if not chunks:
+        return np.zeros((0, model.config.hidden_size), dtype=np.float32)
+    return np.vstack(chunks)
+
+
+class EmbeddingTable:
+    """용어 → L2 정규화된 임베딩 행 (float16, memory-mapped) 조회 테이블"""
+
+    def __init__(self, terms: List[str], embeddings: np.ndarray):
+        self.terms = terms
+        self.term_to_idx = {term: idx for idx, term in enumerate(terms)}
+        self.embeddings = embeddings
+
+    @classmethod
+    def load(cls, table_dir: str = DEFAULT_TABLE_DIR) -> Optional["EmbeddingTable"]:
+        """저장된 테이블 로드. 테이블이 없으면 None 을 반환하여 모델 계산으로 대체"""
+        embeddings_path = os.path.join(table_dir, EMBEDDINGS_FILE)
+        terms_path = os.path.join(table_dir, TERMS_FILE)
+        if not (os.path.exists(embeddings_path) and os.path.exists(terms_path)):
+            print(f"어휘 임베딩 테이블이 없습니다: {table_dir} (모델 계산으로 대체)")
+            return None
+
+        with open(terms_path, 'r', encoding='utf-8') as f:
+            terms = json.load(f)["terms"]
+        embeddings = np.load(embeddings_path, mmap_mode='r')
+        if embeddings.shape[0] != len(terms):
+            raise ValueError(
+                f"임베딩 행 수({embeddings.shape[0]})와 용어 수({len(terms)})가 일치하지 않습니다: {table_dir}"
+            )
+        print(f"어휘 임베딩 테이블 로드: {len(terms)}개 용어, 차원 {embeddings.shape[1]}")
+        return cls(terms, embeddings)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.term_to_idx
+
+    @property
+    def dim(self) -> int:
+        return self.embeddings.shape[1]
+
+    def get(self, term: str) -> Optional[np.ndarray]:
+        """정규화된 float32 임베딩 반환. 어휘 밖 용어는 None"""
+        idx = self.term_to_idx.get(term)
+        if idx is None:
+            return None
+        return np.asarray(self.embeddings[idx], dtype=np.float32)
+
+    def lookup(self, terms: List[str]) -> Tuple[np.ndarray, List[int]]:
+        """
+        용어 목록의 임베딩 행렬과 어휘 밖(OOV) 용어의 위치를 반환
+        OOV 위치의 행은 0 으로 채워져 있으므로 호출자가 모델 결과로 채워야 함
+        """
+        vectors = np.zeros((len(terms), self.dim), dtype=np.float32)
+        missing = []
+        known_positions = []
+        known_rows = []
+        for position, term in enumerate(terms):
+            idx = self.term_to_idx.get(term)
+            if idx is None:
+                missing.append(position)
+            else:
+                known_positions.append(position)
+                known_rows.append(idx)
+        if known_rows:
+            # memmap 에서 필요한 행만 한 번에 읽음
+            vectors[known_positions] = self.embeddings[np.array(known_rows)]
+        return vectors, missing
+
+
+def embed_terms(terms: List[str], table: Optional[EmbeddingTable],
+                encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+    """
+    정규화된 용어 임베딩. 테이블에 있는 용어는 조회하고 어휘 밖 용어만 encode_fn 으로 계산
+
+    encode_fn 은 텍스트 목록을 (n, hidden) 행렬로 인코딩하는 함수 (encode_texts 또는 마이크로 배처)
+    """
+    if table is not None:
+        vectors, missing = table.lookup(terms)
+    else:
+        vectors, missing = None, list(range(len(terms)))
+
+    if missing:
+        oov_vectors = normalize_rows(encode_fn([terms[idx] for idx in missing]))
+        if vectors is None:
+            return oov_vectors
+        vectors[missing] = oov_vectors
+    return vectors
+
+
+def collect_vocabulary(pmi_path: str, terms_path: str, keywords_path: Optional[str] = None) -> List[str]:
+    """
+    관계 분류(HGNN) PMI 키워드 전체 + 사전 용어 (+ 추가 키워드 목록)를 순서를 유지하며 중복 제거하여 합침
+    PMI 키워드 순서는 shared_state.extract_keywords 와 같다.
+    """
+    vocabulary: Dict[str, None] = {}
+    with open(pmi_path, 'r', encoding='utf-8') as f:
+        for keyword in extract_keywords(json.load(f)):
+            vocabulary.setdefault(keyword, None)
+    with open(terms_path, 'r', encoding='utf-8') as f:
+        for term in json.load(f)["terms"]:
+            vocabulary.setdefault(term, None)
+    if keywords_path:
+        with open(keywords_path, 'r', encoding='utf-8') as f:
+            for keyword in json.load(f)["unique_keywords"]:
+                vocabulary.setdefault(keyword, None)
+    return [term for term in vocabulary if term and term.strip()]
+
+
+def build_embedding_table(terms: Iterable[str], table_dir: str, tokenizer, model,
+                          batch_size: int = 64, max_length: int = 128) -> str:
+    """
+    어휘 전체를 배치 단위로 임베딩하여 float16 행렬로 저장
+
+    행렬은 임시 파일에 먼저 기록한 뒤 교체하므로, 기존 테이블을 memory-map 중인
+    프로세스가 있어도 안전하게 갱신할 수 있다.
+    """
+    terms = list(terms)
+    os.makedirs(table_dir, exist_ok=True)
+    embeddings_path = os.path.join(table_dir, EMBEDDINGS_FILE)
+    terms_path = os.path.join(table_dir, TERMS_FILE)
+    tmp_embeddings_path = embeddings_path + ".tmp"
+    tmp_terms_path = terms_path + ".tmp"
+
+    matrix = np.lib.format.open_memmap(
+        tmp_embeddings_path, mode='w+', dtype=np.float16,
+        shape=(len(terms), model.config.hidden_size)
+    )
+    for start in range(0, len(terms), batch_size):
+        batch = terms[start:start + batch_size]
+        vectors = encode_texts(tokenizer, model, batch, max_length=max_length, batch_size=batch_size)
+        matrix[start:start + len(batch)] = normalize_rows(vectors).astype(np.float16)
+        print(f"임베딩 진행: {min(start + batch_size, len(terms))}/{len(terms)}")
+    matrix.flush()
+    del matrix
+
+    with open(tmp_terms_path, 'w', encoding='utf-8') as f:
+        json.dump({"model": getattr(model.config, "_name_or_path", ""), "terms": terms},
+                  f, ensure_ascii=False)
+
+    os.replace(tmp_embeddings_path, embeddings_path)
+    os.replace(tmp_terms_path, terms_path)
+    print(f"어휘 임베딩 테이블 저장 완료: {table_dir} ({len(terms)}개 용어)")
+    return table_dir
+
+
+def main():
+    from transformers import AutoTokenizer, AutoModel
+
+    parser = argparse.ArgumentParser(description="경제 어휘 임베딩 테이블 생성")
+    parser.add_argument("--pmi", default="data/pairwise_pmi_values3.json")
+    parser.add_argument("--terms", default="data/json/article_terms.json")
+    parser.add_argument("--keywords", default=None, help="추가로 포함할 키워드 목록 (unique_keywords 형식)")
+    parser.add_argument("--output", default=DEFAULT_TABLE_DIR)
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    model = AutoModel.from_pretrained(args.model).to(
+        "cuda" if torch.cuda.is_available() else "cpu")
+    model.eval()
+
+    terms = collect_vocabulary(args.pmi, args.terms, args.keywords)
+    print(f"임베딩 대상 어휘: {len(terms)}개")
+    build_embedding_table(terms, args.output, tokenizer, model, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
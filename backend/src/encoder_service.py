@@ -0,0 +1,176 @@
+# src/encoder_service.py
+# kf-deberta(문서/용어 임베딩)와 mpnet(KeyBERT) 인코더를 한 곳에서 관리하는 임베딩 서비스
+# - 모델은 프로세스당 한 번만 로드
+# - 같은 텍스트는 모델별로 한 번만 인코딩 (LRU 캐시)
+# - KeyBERT 에는 태거가 찾은 명사 후보와 미리 계산한 임베딩을 전달
+# - 동시 요청의 forward 는 마이크로 배처로 묶어서 실행
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import torch
+from keybert import KeyBERT
+from sentence_transformers import SentenceTransformer
+from sklearn.feature_extraction.text import CountVectorizer
+from transformers import AutoTokenizer, AutoModel
+
+from src.embedding_table import (
+    DEFAULT_MODEL_NAME, EmbeddingTable, embed_terms, encode_texts, normalize_rows
+)
+from src.micro_batcher import MicroBatcher
+
+DEFAULT_KEYBERT_MODEL_NAME = "multi-qa-mpnet-base-cos-v1"
+
+
+class _LRUCache:
+    """스레드 안전한 소형 LRU 캐시"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: np.ndarray) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class EncoderService:
+    """kf-deberta / mpnet 임베딩 서비스 (텍스트당 모델별 1회 실행)"""
+
+    def __init__(self,
+                 deberta_name: str = DEFAULT_MODEL_NAME,
+                 keybert_name: str = DEFAULT_KEYBERT_MODEL_NAME,
+                 embedding_table: Optional[EmbeddingTable] = None,
+                 document_cache_size: int = 256,
+                 term_cache_size: int = 50000,
+                 max_batch_size: int = 16,
+                 max_term_batch_size: int = 128,
+                 max_wait_ms: float = 5.0):
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.tokenizer = AutoTokenizer.from_pretrained(deberta_name)
+        self.model = AutoModel.from_pretrained(deberta_name).to(device)
+        self.model.eval()
+        self.sentence_model = SentenceTransformer(keybert_name, device=device)
+        self.keybert_model = KeyBERT(self.sentence_model)
+        self.embedding_table = embedding_table
+
+        self._document_cache = _LRUCache(document_cache_size)
+        self._mpnet_term_cache = _LRUCache(term_cache_size)
+
+        # 모델/입력 종류별 마이크로 배처 (문서와 짧은 용어를 한 배치에 섞어 패딩하지 않도록 분리)
+        self._batchers = {
+            "deberta_document": MicroBatcher(
+                lambda texts: encode_texts(self.tokenizer, self.model, texts,
+                                           max_length=512, batch_size=max_batch_size),
+                name="deberta_document", max_batch_size=max_batch_size, max_wait_ms=max_wait_ms
+            ),
+            "deberta_term": MicroBatcher(
+                lambda texts: encode_texts(self.tokenizer, self.model, texts,
+                                           max_length=128, batch_size=max_term_batch_size),
+                name="deberta_term", max_batch_size=max_term_batch_size, max_wait_ms=max_wait_ms
+            ),
+            "mpnet_document": MicroBatcher(
+                lambda texts: self._mpnet_encode(texts, batch_size=max_batch_size),
+                name="mpnet_document", max_batch_size=max_batch_size, max_wait_ms=max_wait_ms
+            ),
+            "mpnet_term": MicroBatcher(
+                lambda texts: self._mpnet_encode(texts, batch_size=max_term_batch_size),
+                name="mpnet_term", max_batch_size=max_term_batch_size, max_wait_ms=max_wait_ms
+            )
+        }
+
+    # --- kf-deberta ---
+    def deberta_document(self, text: str) -> np.ndarray:
+        """정규화된 문서 임베딩 (max_length=512)"""
+        return self._cached_document(
+            ("deberta", _text_key(text)),
+            lambda: normalize_rows(self._batchers["deberta_document"].encode([text]))[0]
+        )
+
+    def deberta_terms(self, terms: List[str]) -> np.ndarray:
+        """정규화된 용어 임베딩 (어휘 테이블 우선, OOV 용어만 모델 계산)"""
+        return embed_terms(terms, self.embedding_table, self._batchers["deberta_term"].encode)
+
+    # --- mpnet (KeyBERT) ---
+    def mpnet_document(self, text: str) -> np.ndarray:
+        return self._cached_document(
+            ("mpnet", _text_key(text)),
+            lambda: self._batchers["mpnet_document"].encode([text])[0]
+        )
+
+    def mpnet_terms(self, terms: List[str]) -> np.ndarray:
+        """후보 용어 임베딩. 기사마다 반복되는 명사가 많으므로 용어 단위로 캐싱"""
+        vectors: List[Optional[np.ndarray]] = [self._mpnet_term_cache.get(term) for term in terms]
+        missing = [idx for idx, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = self._batchers["mpnet_term"].encode([terms[idx] for idx in missing])
+            for idx, vector in zip(missing, encoded):
+                self._mpnet_term_cache.put(terms[idx], vector)
+                vectors[idx] = vector
+        if not vectors:
+            return np.zeros((0, self.sentence_model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def extract_keywords(self, text: str, candidates: List[str], top_n: int) -> List[Tuple[str, float]]:
+        """
+        KeyBERT 키워드 추출
+
+        CountVectorizer 로 후보를 다시 만들지 않고 태거가 찾은 명사만 후보로 사용하며,
+        문서/후보 임베딩은 미리 계산하여 전달하므로 KeyBERT 내부에서는 인코더를 실행하지 않음
+        """
+        candidates = [candidate for candidate in dict.fromkeys(candidates)
+                      if candidate and candidate in text]
+        if not text or not candidates:
+            return []
+
+        vectorizer = CountVectorizer(
+            vocabulary=candidates,
+            analyzer=lambda doc: [candidate for candidate in candidates if candidate in doc]
+        )
+        return self.keybert_model.extract_keywords(
+            text,
+            top_n=top_n,
+            vectorizer=vectorizer,
+            doc_embeddings=self.mpnet_document(text).reshape(1, -1),
+            word_embeddings=self.mpnet_terms(candidates)
+        )
+
+    def batching_stats(self) -> Dict[str, Dict]:
+        """배치 크기 / 지연 시간 히스토그램"""
+        return {name: batcher.stats() for name, batcher in self._batchers.items()}
+
+    def close(self) -> None:
+        for batcher in self._batchers.values():
+            batcher.close()
+
+    # --- 내부 ---
+    def _mpnet_encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        return np.asarray(
+            self.sentence_model.encode(texts, batch_size=batch_size, convert_to_numpy=True,
+                                       show_progress_bar=False),
+            dtype=np.float32
+        )
+
+    def _cached_document(self, key: Tuple[str, str], compute: Callable[[], np.ndarray]) -> np.ndarray:
+        vector = self._document_cache.get(key)
+        if vector is None:
+            vector = compute()
+            self._document_cache.put(key, vector)
+        return vector
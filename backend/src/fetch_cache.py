@@ -0,0 +1,84 @@
+# src/fetch_cache.py
+# 기사 페이지 요청 캐시 (로컬 디스크, 정규화 URL 해시별 JSON 파일)
+# - 추출 결과 {title, date, content, url} 와 ETag / Last-Modified 를 저장
+# - TTL 안의 항목은 요청/파싱 없이 바로 사용 (fresh hit)
+# - TTL 이 지나면 If-None-Match / If-Modified-Since 로 조건부 요청, 304 면 파싱 없이 재사용
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from src.url_utils import normalize_url, url_hash
+
+DEFAULT_CACHE_DIR = "data/cache/fetch"
+
+
+class FetchCache:
+    """정규화 URL 단위의 추출 결과 디스크 캐시"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl_seconds: float = 3600.0):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {"fresh_hits": 0, "revalidated": 0, "misses": 0, "stale_refetched": 0, "stores": 0}
+
+    def _path(self, url: str) -> str:
+        digest = url_hash(url)
+        return os.path.join(self.cache_dir, digest[:2], digest + ".json")
+
+    def get(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict[str, str]:
+        """저장된 검증자로 조건부 요청 헤더 구성"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _write(self, url: str, entry: Dict) -> None:
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def put(self, url: str, article: Dict, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        self._write(url, {
+            "url": normalize_url(url),
+            "article": article,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time()
+        })
+        self.record("stores")
+
+    def refresh(self, url: str, entry: Dict) -> None:
+        """304 응답 후 TTL 을 다시 시작"""
+        self._write(url, dict(entry, fetched_at=time.time()))
+
+    def record(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["fresh_hits"] + stats["revalidated"] + stats["misses"] + stats["stale_refetched"]
+        # 다운로드/파싱을 건너뛴 비율 (fresh hit + 304)
+        stats["hit_ratio"] = round((stats["fresh_hits"] + stats["revalidated"]) / lookups, 3) if lookups else 0.0
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
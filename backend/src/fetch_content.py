@@ -1,31 +1,80 @@
 # src/fetch_content.py
+import asyncio
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Optional
+from src.async_fetcher import AsyncFetcher
+from src.fetch_cache import FetchCache
+
+try:
+    import lxml  # noqa: F401  (C 로 구현된 파서, 없으면 html.parser 사용)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# 동기 요청용 공용 세션 (keep-alive 연결 재사용) 과 (연결, 읽기) 시간 제한
+_session = requests.Session()
+REQUEST_TIMEOUT = (3.0, 10.0)
+
+def parse_content(html, url, restrict=True):
+    """
+    Parses an article page with the site-specific parser for the URL.
+    With restrict=True only the elements the site parser reads are built into the tree.
+    """
+    for domain, site_parser in SITE_PARSERS:
+        if domain in url:
+            # HTML 파싱 (lxml 이 있으면 lxml, 사이트 파서가 찾는 요소의 하위 트리만 생성)
+            parse_only = SITE_STRAINERS[domain] if restrict else None
+            soup = BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+            return site_parser(soup, url)
+    return "Unsupported URL"
+
 
 def fetch_content(url):
     try:
         # 웹페이지 요청
-        response = requests.get(url)
+        response = _session.get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()  # HTTP 오류 발생 시 예외 발생
 
-        # HTML 파싱
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        if "hankyung.com" in url:
-            return fetch_hankyung_content(soup, url)
-        elif "mk.co.kr" in url:
-            return fetch_maeil_content(soup, url)
-        elif "naver.com" in url:
-            return fetch_naver_content(soup, url)
-        elif "daum.net" in url:
-            return fetch_daum_content(soup, url)
-        else:
-            return "Unsupported URL"
+        return parse_content(response.text, url)
 
     except requests.exceptions.RequestException as e:
         raise RuntimeError(f"Failed to fetch the URL: {e}")
 
 
+async def fetch_content_async(url, fetcher: AsyncFetcher, cache: Optional[FetchCache] = None):
+    """
+    Non-blocking variant of fetch_content for the async service.
+    The request goes through the shared AsyncFetcher (pooled connections, timeouts, retries,
+    per-host limit) and HTML parsing runs in a worker thread.
+    With a FetchCache, fresh entries skip the request and stale entries are revalidated
+    with a conditional GET (304 skips download and parsing). Cache file reads and writes
+    also run in worker threads so disk I/O never blocks the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    entry = await loop.run_in_executor(None, cache.get, url) if cache is not None else None
+    if entry is not None and cache.is_fresh(entry):
+        cache.record("fresh_hits")
+        return entry["article"]
+
+    headers = FetchCache.conditional_headers(entry) if entry is not None else None
+    response = await fetcher.get(url, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        cache.record("revalidated")
+        await loop.run_in_executor(None, cache.refresh, url, entry)
+        return entry["article"]
+
+    article = await loop.run_in_executor(None, parse_content, response.text, url)
+
+    if cache is not None:
+        cache.record("misses" if entry is None else "stale_refetched")
+        # 본문 추출에 실패한 페이지("No content found ...")는 저장하지 않음
+        if isinstance(article, dict) and not article.get("content", "").startswith("No content found"):
+            await loop.run_in_executor(None, cache.put, url, article,
+                                       response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return article
+
+
 def fetch_hankyung_content(soup, url):
     """
     Fetches the content from 한국경제 articles.
@@ -119,4 +168,49 @@ def fetch_daum_content(soup, url):
         "title": title,
         "date": date,
         "url": url
-    }
\ No newline at end of file
+    }
+
+
+def _element_matcher(targets):
+    """
+    SoupStrainer 용 조건. targets 는 (태그, 속성, 값) 목록이며
+    class 는 여러 클래스 중 하나만 일치해도 되도록 토큰 단위로 비교한다.
+    """
+    def match(name, attrs):
+        for tag, attr, value in targets:
+            if name != tag:
+                continue
+            actual = attrs.get(attr)
+            if actual is None:
+                continue
+            tokens = actual.split() if isinstance(actual, str) else actual
+            if value in tokens:
+                return True
+        return False
+    return match
+
+
+# 도메인별 사이트 파서
+SITE_PARSERS = [
+    ("hankyung.com", fetch_hankyung_content),
+    ("mk.co.kr", fetch_maeil_content),
+    ("naver.com", fetch_naver_content),
+    ("daum.net", fetch_daum_content),
+]
+
+# 사이트 파서가 찾는 요소(본문 / 제목 / 날짜)만 남기는 제한 파싱 조건
+SITE_STRAINERS = {
+    "hankyung.com": SoupStrainer(_element_matcher([
+        ("div", "id", "articletxt"), ("h1", "class", "headline"), ("span", "class", "txt-date")
+    ])),
+    "mk.co.kr": SoupStrainer(_element_matcher([
+        ("div", "class", "news_cnt_detail_wrap"), ("h2", "class", "news_ttl"), ("dl", "class", "registration")
+    ])),
+    "naver.com": SoupStrainer(_element_matcher([
+        ("article", "id", "dic_area"), ("h2", "id", "title_area"),
+        ("span", "class", "media_end_head_info_datestamp_time")
+    ])),
+    "daum.net": SoupStrainer(_element_matcher([
+        ("div", "class", "news_view"), ("h3", "class", "tit_view"), ("span", "class", "num_date")
+    ])),
+}
@@ -3,7 +3,7 @@
 from koalanlp.proc import Tagger
 from koalanlp import API
 from koalanlp.Util import initialize, finalize
-import kss
+from src.sentence_segmenter import split_sentences as _split_sentences
 from typing import Any, List, Tuple
 
 # JVM 초기화 상태 플래그
@@ -40,7 +40,7 @@ def load_article(file_path):
 # --- 문장 분리 ---
 def split_sentences(document):
     """
-    문서를 문장 리스트로 분리합니다. KSS를 사용합니다.
+    문서를 문장 리스트로 분리합니다. 규칙 기반 분리를 사용하고 애매한 문단만 KSS로 처리합니다.
 
     Args:
         document (str): 입력 문서 텍스트.
@@ -48,7 +48,7 @@ def split_sentences(document):
     Returns:
         List[str]: 분리된 문장들의 리스트.
     """
-    return list(kss.split_sentences(document))
+    return _split_sentences(document)
 
 # --- 동사와 명사 추출 ---
 def extract_verbs_and_nouns(sentence: Any) -> Tuple[List[str], List[str]]:
@@ -1,37 +1,5 @@
 # give.py
-import json
-
-def load_dictionary(file_path):
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return {}
-
-# 띄어쓰기 제거 및 정의 검색
-def search_definition(word, data):
-    # 띄어쓰기를 제거한 형태
-    word_cleaned = word.replace(" ", "").lower()
-
-    # 이미 사전에 있는 경우
-    if word_cleaned in data:
-        return data[word_cleaned]
-
-    for key in data.keys():
-        # 괄호 앞의 용어 확인
-        key_cleaned = key.split("(")[0].replace(" ", "").lower()
-
-        if key_cleaned == word_cleaned:
-            return data[key]
-
-        # 괄호 안의 용어 확인
-        if "(" in key:
-            inside_parentheses = key.split("(")[1].rstrip(")").lower()
-            for item in inside_parentheses.split(","):
-                if item.strip() == word_cleaned:
-                    return data[key]
-
-    return None
+from src.dictionary_index import DictionaryIndex
 
 
 def get_word_definition(words, dictionary_file_path):
@@ -45,14 +13,14 @@ def get_word_definition(words, dictionary_file_path):
     # 결과를 저장할 딕셔너리
     definitions = {}
 
-    # 기존 사전 로드
-    dictionary = load_dictionary(dictionary_file_path)
+    # 공유 사전 색인 (최초 1회만 로드, 파일 변경 시 자동 재로딩)
+    dictionary_index = DictionaryIndex.shared(dictionary_file_path)
 
     # 각 단어에 대해 정의 검색
     for word in words:
-        # 사전에 없는 경우, 띄어쓰기를 제거하고 사전에서 검색
+        # 띄어쓰기를 제거한 표제어 / 괄호 안 별칭으로 색인 조회
         # print(f"'{word}'에 대한 정의를 사전에서 검색 중...")
-        found_definition = search_definition(word, dictionary)
+        found_definition = dictionary_index.definition(word)
 
         if found_definition:
             print(f"{word}: 사전에서 정의를 찾았습니다.")
@@ -1,35 +1,41 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 from typing import List, Dict, Optional, Union
 from kiwipiepy import Kiwi
-from sentence_transformers import util
-from transformers import AutoTokenizer, AutoModel
-from keybert import KeyBERT
 from pathlib import Path
 import logging
-import torch
 import numpy as np
 from collections import Counter
 import re
 
+from src.embedding_table import EmbeddingTable, DEFAULT_TABLE_DIR
+from src.encoder_service import EncoderService
+from src.pattern_matcher import compile_patterns
+from src.tfidf_model import NOUNS, TfidfModel, extract_nouns, DEFAULT_NOUN_MODEL_PATH as DEFAULT_TFIDF_MODEL_PATH
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class KeywordExtractor:
-    def __init__(self, article_path: str):
+    def __init__(self, article_path: str, encoder: Optional[EncoderService] = None,
+                 embedding_table_dir: str = DEFAULT_TABLE_DIR,
+                 tfidf_model_path: str = DEFAULT_TFIDF_MODEL_PATH):
         """
         키워드 추출기 초기화
 
         Args:
             article_path (str): 기사 텍스트 파일 경로
+            encoder (Optional[EncoderService]): 공유 임베딩 서비스 (없으면 새로 생성)
+            embedding_table_dir (str): 미리 계산된 어휘 임베딩 테이블 경로
+            tfidf_model_path (str): 코퍼스 명사열로 학습된 TF-IDF 모델 경로 (--representation nouns)
         """
         self.article_path = Path(article_path)
-        self.tokenizer = AutoTokenizer.from_pretrained("upskyy/kf-deberta-multitask")
-        self.model = AutoModel.from_pretrained("upskyy/kf-deberta-multitask").to(
-            "cuda" if torch.cuda.is_available() else "cpu")
         self.kiwi = Kiwi()
-        self.keybert_model = KeyBERT("multi-qa-mpnet-base-cos-v1")
+        self.encoder = encoder or EncoderService(
+            embedding_table=EmbeddingTable.load(embedding_table_dir)
+        )
+        self.tfidf_model = TfidfModel.load(tfidf_model_path, representation=NOUNS)
 
     def extract_article_text(self) -> str:
         """
@@ -59,12 +65,8 @@ class KeywordExtractor:
             List[str]: 추출된 명사 리스트
         """
         try:
-            # Kiwi를 이용한 형태소 분석
-            tokens = self.kiwi.analyze(text)[0][0]
-
-            # 명사 추출 (NNG: 일반명사, NNP: 고유명사)
-            nouns = [token[0] for token in tokens if token[1].startswith('NN')]
-            return nouns
+            # Kiwi를 이용한 형태소 분석 후 명사 추출 (TF-IDF 모델 학습과 같은 규칙)
+            return extract_nouns(self.kiwi, text)
 
         except Exception as e:
             logger.error(f"명사 추출 중 오류 발생: {e}")
@@ -83,34 +85,17 @@ class KeywordExtractor:
             List[str]: 추출된 키워드 리스트
         """
         try:
-            # 텍스트 인코딩
-            text_encoding = self.tokenizer(
-                text,
-                padding=True,
-                truncation=True,
-                max_length=512,
-                return_tensors='pt'
-            ).to(self.model.device)
-
-            # 명사 인코딩
-            noun_encodings = self.tokenizer(
-                nouns,
-                padding=True,
-                truncation=True,
-                max_length=128,
-                return_tensors='pt'
-            ).to(self.model.device)
-
-            # 텍스트 임베딩 생성
-            with torch.no_grad():
-                text_embedding = self.model(**text_encoding).last_hidden_state.mean(dim=1)
-                noun_embeddings = self.model(**noun_encodings).last_hidden_state.mean(dim=1)
-
-            # 코사인 유사도 계산
-            similarities = util.pytorch_cos_sim(text_embedding, noun_embeddings)[0]
+            # 텍스트 임베딩 생성 (공유 서비스에서 텍스트당 1회만 계산)
+            text_embedding = self.encoder.deberta_document(text)
+
+            # 명사 임베딩: 어휘 테이블 조회, 테이블에 없는 명사만 모델 계산
+            noun_embeddings = self.encoder.deberta_terms(nouns)
+
+            # 코사인 유사도 계산 (정규화된 벡터의 내적)
+            similarities = noun_embeddings @ text_embedding
 
             # 상위 키워드 선택
-            top_indices = similarities.argsort(descending=True)[:top_n]
+            top_indices = np.argsort(-similarities, kind='stable')[:top_n]
             return [nouns[idx] for idx in top_indices if len(nouns[idx]) > 1]
 
         except Exception as e:
@@ -133,17 +118,21 @@ class KeywordExtractor:
             nouns = self.extract_nouns(text)
             noun_text = ' '.join(nouns)
 
-            # TF-IDF 벡터라이저 초기화 및 적용
-            vectorizer = TfidfVectorizer(
-                min_df=1,
-                max_features=1000,
-                token_pattern=r'(?u)\b\w+\b'
-            )
-            tfidf_matrix = vectorizer.fit_transform([noun_text])
-
-            # 단어별 TF-IDF 점수 계산
-            feature_names = vectorizer.get_feature_names_out()
-            scores = zip(feature_names, tfidf_matrix.toarray()[0])
+            if self.tfidf_model is not None:
+                # 코퍼스 명사열로 학습된 IDF 로 transform 만 수행
+                scores = self.tfidf_model.scores(noun_text).items()
+            else:
+                # 학습된 모델이 없으면 문서 단위로 벡터라이저 적용
+                vectorizer = TfidfVectorizer(
+                    min_df=1,
+                    max_features=1000,
+                    token_pattern=r'(?u)\b\w+\b'
+                )
+                tfidf_matrix = vectorizer.fit_transform([noun_text])
+                feature_names = vectorizer.get_feature_names_out()
+                scores = zip(feature_names, tfidf_matrix.toarray()[0])
+
+            # 단어별 TF-IDF 점수 정렬
             sorted_scores = sorted(scores, key=lambda x: x[1], reverse=True)
 
             # 상위 키워드 선택 (2글자 이상)
@@ -196,10 +185,11 @@ class KeywordExtractor:
         # 문장 분리
         sentences = re.split(r'[.!?]\s*', text)
 
-        # 키워드가 2개 이상 포함된 문장 필터링
+        # 키워드가 2개 이상 포함된 문장 필터링 (키워드 오토마톤으로 문장당 한 번만 훑음)
+        keyword_matcher = compile_patterns(keywords)
         relevant_sentences = []
         for sentence in sentences:
-            matched_keywords = [keyword for keyword in keywords if keyword in sentence]
+            matched_keywords = keyword_matcher.matched(sentence)
             if len(matched_keywords) >= 2:
                 relevant_sentences.append({
                     "sentence": sentence.strip(),
@@ -235,10 +225,9 @@ class KeywordExtractor:
             results['kf-deberta'] = self._extract_similarity_keywords(article_text, nouns, top_n)
 
         if 'keybert' in methods:
+            # 후보는 이미 추출한 명사로 제한하고, 임베딩은 공유 서비스에서 미리 계산
             keybert_keywords = [
-                kw[0] for kw in self.keybert_model.extract_keywords(
-                    article_text, top_n=top_n, stop_words=None
-                )
+                kw[0] for kw in self.encoder.extract_keywords(article_text, nouns, top_n)
             ]
             results['keybert'] = [kw for kw in self.extract_nouns(' '.join(keybert_keywords)) if len(kw) > 1]
 
@@ -0,0 +1,229 @@
+# src/link_candidates.py
+# 문서 간 연결 후보 생성 (모든 문서 쌍 대신 주요 키워드를 공유하거나 거의 공유하는 쌍만 PMI 계산)
+# - 역색인: 키워드 → 문서. 두 문서의 주요 노드(top-k)가 같거나, 어떤 문서에서 함께 나온 적이 있으면 후보
+#   PKMProcessor 는 창 공출현이 0 인 키워드 쌍을 연결하지 않는다. 본문 통계(위치)는 문서의 노드에 대해서만
+#   계산하므로 창 공출현이 있으려면 두 키워드가 같은 문서의 노드여야 하고, 그런 주요 노드 쌍이 하나도 없는
+#   문서 쌍은 비교할 필요가 없다 (전체 비교와 같은 엣지).
+# - MinHash LSH: 문서 노드 집합의 MinHash 서명을 밴드로 나눠 버킷에 넣고, 한 밴드라도 같으면 후보
+#   (노드 구성이 거의 같은 문서)
+# - CorpusLinkIndex: 저장된 전체 기사의 후보 색인과 PMI 분모(출현 수 / 토큰 수 합계)를 서버 메모리에 두고
+#   저장·삭제 때 문서 하나만 갱신. 저장 시 연결은 후보 문서와 공출현 근거 문서의 본문 통계만 DB 에서 읽는다.
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+import numpy as np
+
+# 2^32 보다 큰 소수 (32비트 해시값 x 에 대해 a*x + b 가 uint64 범위 안에 들어오도록 a, b < 2^31)
+_MINHASH_PRIME = np.uint64(4294967311)
+
+
+class MinHasher:
+    """키워드 집합 → MinHash 서명 (num_perm 개의 (a*x + b) mod p 해시 최솟값)"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, 2 ** 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31, size=num_perm).astype(np.uint64)
+
+    def signature(self, keywords: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(keyword.encode("utf-8")) for keyword in set(keywords)), dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        return ((np.outer(hashes, self._a) + self._b) % _MINHASH_PRIME).min(axis=0)
+
+
+class LinkCandidateIndex:
+    """
+    문서별 (주요 노드, 전체 노드) 를 넣고, 어떤 문서와 연결 후보가 될 문서를 조회
+    bands × rows = num_perm. 자카드 유사도 s 인 두 문서가 LSH 후보가 될 확률은 1 - (1 - s^rows)^bands
+    (기본 16 × 4: s=0.3 → 약 12%, s=0.5 → 약 65%, s=0.7 → 약 99%)
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 의 배수여야 합니다")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm, seed)
+        self._doc_nodes: Dict[Hashable, List[str]] = {}
+        self._doc_top: Dict[Hashable, List[str]] = {}
+        self._top_docs: Dict[str, Set[Hashable]] = defaultdict(set)  # 주요 노드 → 문서
+        self._node_docs: Dict[str, Set[Hashable]] = defaultdict(set)  # 전체 노드 → 문서
+        self._buckets: Dict[Tuple[int, bytes], Set[Hashable]] = defaultdict(set)
+
+    def _band_keys(self, keywords: Iterable[str]) -> List[Tuple[int, bytes]]:
+        signature = self._hasher.signature(keywords)
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def add(self, doc_id: Hashable, top_keywords: Iterable[str], keywords: Iterable[str]) -> None:
+        """문서 색인 (이미 있는 문서면 기존 항목을 지우고 다시 색인)"""
+        self.remove(doc_id)
+        keywords = list(dict.fromkeys(keywords))
+        top_keywords = list(top_keywords)
+        self._doc_nodes[doc_id] = keywords
+        self._doc_top[doc_id] = top_keywords
+        for keyword in top_keywords:
+            self._top_docs[keyword].add(doc_id)
+        for keyword in keywords:
+            self._node_docs[keyword].add(doc_id)
+        if keywords:
+            for band_key in self._band_keys(keywords):
+                self._buckets[band_key].add(doc_id)
+
+    def remove(self, doc_id: Hashable) -> bool:
+        """색인에서 문서 제거 (없으면 False)"""
+        keywords = self._doc_nodes.pop(doc_id, None)
+        if keywords is None:
+            return False
+        self._discard(self._top_docs, self._doc_top.pop(doc_id, []), doc_id)
+        self._discard(self._node_docs, keywords, doc_id)
+        if keywords:
+            self._discard(self._buckets, self._band_keys(keywords), doc_id)
+        return True
+
+    @staticmethod
+    def _discard(index: Dict, keys: Iterable, doc_id: Hashable) -> None:
+        for key in keys:
+            docs = index.get(key)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del index[key]
+
+    def nodes(self, doc_id: Hashable) -> List[str]:
+        return self._doc_nodes.get(doc_id, [])
+
+    def top_keywords(self, doc_id: Hashable) -> List[str]:
+        return self._doc_top.get(doc_id, [])
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_nodes
+
+    def __len__(self) -> int:
+        return len(self._doc_nodes)
+
+    def docs_with(self, keyword: str) -> Set[Hashable]:
+        """키워드가 노드인 문서"""
+        return self._node_docs.get(keyword, set())
+
+    def related_keywords(self, top_keywords: Iterable[str]) -> Set[str]:
+        """주요 노드와 같은 문서에 함께 나온 적이 있는 키워드 (주요 노드 자신 포함)"""
+        related = set(top_keywords)
+        for keyword in list(related):
+            for doc_id in self._node_docs.get(keyword, ()):
+                related.update(self._doc_nodes[doc_id])
+        return related
+
+    def query(self, top_keywords: Iterable[str], keywords: Iterable[str]) -> Set[Hashable]:
+        """색인된 문서 중 후보 (주요 노드가 related_keywords 에 있거나 LSH 밴드가 같은 문서)"""
+        candidates: Set[Hashable] = set()
+        for keyword in self.related_keywords(top_keywords):
+            candidates.update(self._top_docs.get(keyword, ()))
+        keywords = list(keywords)
+        if keywords:
+            for band_key in self._band_keys(keywords):
+                candidates.update(self._buckets.get(band_key, ()))
+        return candidates
+
+
+def candidate_pairs(docs: List[Tuple[Hashable, List[str], List[str]]], num_perm: int = 64,
+                    bands: int = 16) -> Set[Tuple[Hashable, Hashable]]:
+    """
+    (문서 id, 주요 노드, 전체 노드) 목록 → 후보 문서 쌍 (목록 순서 기준 (앞 문서, 뒤 문서))
+    공출현 근거가 뒤 문서에 있을 수도 있으므로 전체 문서를 먼저 색인한 뒤 조회한다.
+    """
+    index = LinkCandidateIndex(num_perm=num_perm, bands=bands)
+    for doc_id, top_keywords, keywords in docs:
+        index.add(doc_id, top_keywords, keywords)
+
+    order = {doc_id: position for position, (doc_id, _, _) in enumerate(docs)}
+    pairs = set()
+    for doc_id, top_keywords, keywords in docs:
+        for other_id in index.query(top_keywords, keywords):
+            if order[other_id] < order[doc_id]:
+                pairs.add((other_id, doc_id))
+    return pairs
+
+
+class CorpusLinkIndex:
+    """
+    저장된 전체 기사에 대한 문서 간 연결 상태 (문서 추가 / 제거 시 그 문서 몫만 갱신)
+    - 후보 색인 (LinkCandidateIndex)
+    - 저장 순서: 처음 추가된 순서 (같은 문서를 다시 추가해도 유지)
+    - 말뭉치 합계: 전체 토큰 수, 키워드별 출현 수 (본문 통계 positions 길이의 합, PositionalIndex 와 같은 기준)
+    본문 위치는 보관하지 않으므로 창 공출현은 evidence_docs 의 본문 통계로 따로 계산한다.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        self._candidates = LinkCandidateIndex(num_perm=num_perm, bands=bands, seed=seed)
+        self._order: Dict[Hashable, int] = {}
+        self._next_order = 0
+        self._doc_totals: Dict[Hashable, Tuple[int, Dict[str, int]]] = {}  # 문서 → (토큰 수, 키워드별 출현 수)
+        self._counts: Dict[str, int] = defaultdict(int)
+        self.total_tokens = 0
+
+    def add(self, doc_id: Hashable, top_keywords: Iterable[str], keywords: Iterable[str], stats: Dict) -> None:
+        """문서 추가 (이미 있으면 새 내용으로 교체하고 저장 순서는 유지)"""
+        self._remove_totals(doc_id)
+        if doc_id not in self._order:
+            self._order[doc_id] = self._next_order
+            self._next_order += 1
+        self._candidates.add(doc_id, top_keywords, keywords)
+
+        token_count = stats.get("token_count", 0)
+        counts = {keyword: len(positions) for keyword, positions in stats.get("positions", {}).items() if positions}
+        self._doc_totals[doc_id] = (token_count, counts)
+        self.total_tokens += token_count
+        for keyword, count in counts.items():
+            self._counts[keyword] += count
+
+    def remove(self, doc_id: Hashable) -> bool:
+        self._order.pop(doc_id, None)
+        self._remove_totals(doc_id)
+        return self._candidates.remove(doc_id)
+
+    def _remove_totals(self, doc_id: Hashable) -> None:
+        totals = self._doc_totals.pop(doc_id, None)
+        if totals is None:
+            return
+        token_count, counts = totals
+        self.total_tokens -= token_count
+        for keyword, count in counts.items():
+            self._counts[keyword] -= count
+            if self._counts[keyword] <= 0:
+                del self._counts[keyword]
+
+    def count(self, keyword: str) -> int:
+        return self._counts.get(keyword, 0)
+
+    def top_keywords(self, doc_id: Hashable) -> List[str]:
+        return self._candidates.top_keywords(doc_id)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._candidates
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def candidates(self, doc_id: Hashable) -> List[Hashable]:
+        """문서와 연결 후보인 다른 문서 (저장 순서)"""
+        found = self._candidates.query(self._candidates.top_keywords(doc_id), self._candidates.nodes(doc_id))
+        found.discard(doc_id)
+        return sorted(found, key=self._order.__getitem__)
+
+    def evidence_docs(self, doc_id: Hashable, candidate_ids: Iterable[Hashable]) -> Set[Hashable]:
+        """
+        doc_id 의 주요 노드 b 와 후보 문서의 주요 노드 a 에 대해, a 와 b 가 모두 노드인 문서
+        (창 공출현은 이 문서들에서만 생기므로 PMI 계산에는 이 문서들의 본문 통계만 있으면 된다)
+        """
+        sources = set()
+        for candidate_id in candidate_ids:
+            sources.update(self._candidates.top_keywords(candidate_id))
+        evidence = set()
+        for keyword in self._candidates.top_keywords(doc_id):
+            for other_id in self._candidates.docs_with(keyword):
+                if other_id not in evidence and not sources.isdisjoint(self._candidates.nodes(other_id)):
+                    evidence.add(other_id)
+        return evidence
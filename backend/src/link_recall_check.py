@@ -0,0 +1,116 @@
+# src/link_recall_check.py
+# 문서 간 연결 후보 생성(역색인 + MinHash LSH)의 재현율 확인
+# 합성 기사 라이브러리에서 모든 문서 쌍 비교(기존)와 후보 쌍 비교 결과를 비교한다.
+#   - 엣지 재현율: 전체 비교로 찾은 문서 간 엣지(문서 쌍, 연결 노드) 중 후보 비교에서도 찾은 비율
+#   - 후보 재현율: 전체 비교로 찾은 엣지의 문서 쌍 중 후보 쌍에 포함된 비율
+# 키워드 출현은 --particle-rate 확률로 조사를 붙여 넣는다 (예: "금리가").
+# 두 비교의 엣지가 완전히 같지 않으면(재현율 100% 미만이거나 후보 비교에만 있는 엣지) 0 이 아닌 코드로 종료한다.
+# 관계 분류(HGNN)는 비교 대상이 아니므로 고정 카테고리를 반환하는 분류기를 사용한다.
+#
+# 사용 예 (backend 디렉터리에서):
+#   python -m src.link_recall_check --docs 3000 --topics 300
+#   python -m src.link_recall_check --particle-rate 0.5
+import argparse
+import random
+import time
+
+from src.link_candidates import candidate_pairs
+from src.pkm_processor import PKMProcessor
+from src.text_stats import compute_text_stats
+
+
+# 명사 뒤에 붙는 조사 (붙으면 한 토큰이 되어 \b키워드\b 로는 세지 않고 위치에는 잡힘)
+PARTICLES = ("가", "이", "를", "은", "는", "의", "에", "에서", "으로", "와")
+
+
+class ConstantRelationClassifier:
+    def classify_relations(self, graph_data: dict) -> dict:
+        return {"edges": [dict(edge, category="기타", confidence=1.0) for edge in graph_data["edges"]]}
+
+
+def build_library(num_docs: int, num_topics: int, topic_vocab: int, shared_vocab: int, seed: int,
+                  particle_rate: float = 0.0):
+    """
+    주제별 어휘에서 노드를 뽑고, 노드와 일반 단어를 섞어 본문을 만든 합성 기사 목록
+    일부 기사는 두 번째 주제 어휘와 공통 어휘를 섞어 주제 간 연결이 생기도록 한다.
+    키워드 출현은 particle_rate 확률로 조사를 붙여 넣는다 (예: "공통용어3가").
+    """
+    rng = random.Random(seed)
+    topics = [[f"주제{topic}_용어{index}" for index in range(topic_vocab)] for topic in range(num_topics)]
+    shared = [f"공통용어{index}" for index in range(shared_vocab)]
+    filler = [f"단어{index}" for index in range(2000)]
+
+    articles = []
+    for doc in range(num_docs):
+        topic = rng.randrange(num_topics)
+        keywords = rng.sample(topics[topic], rng.randint(6, 12))
+        if rng.random() < 0.3:
+            keywords += rng.sample(topics[rng.randrange(num_topics)], rng.randint(1, 4))
+        keywords += rng.sample(shared, rng.randint(0, 2))
+        keywords = list(dict.fromkeys(keywords))
+
+        # 키워드는 서로 다른 위치에 넣어 모든 노드가 본문에 한 번 이상 나오도록 함
+        words = [rng.choice(filler) for _ in range(rng.randint(150, 400))]
+        occurrences = [keyword for keyword in keywords for _ in range(rng.randint(1, 5))]
+        for position, keyword in zip(rng.sample(range(len(words)), len(occurrences)), occurrences):
+            words[position] = keyword + rng.choice(PARTICLES) if rng.random() < particle_rate else keyword
+        content = " ".join(words)
+
+        nodes = [{"id": keyword, "importance": round(rng.random(), 4)} for keyword in keywords]
+        articles.append({
+            "_id": f"doc{doc:05d}",
+            "hypergraph_data": {"nodes": nodes, "edges": []},
+            "text_stats": compute_text_stats(content, keywords)
+        })
+    return articles
+
+
+def edge_pairs(edges):
+    """(앞 문서, 뒤 문서) → 연결한 노드 쌍"""
+    return {(edge["source_doc"], edge["target_doc"]): tuple(edge["nodes"]) for edge in edges}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문서 간 연결 후보 생성 재현율 확인")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--topic-vocab", type=int, default=40)
+    parser.add_argument("--shared-vocab", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--particle-rate", type=float, default=0.3,
+                        help="키워드 출현 중 조사를 붙여 넣는 비율 (0 이면 조사 없음)")
+    args = parser.parse_args()
+
+    articles = build_library(args.docs, args.topics, args.topic_vocab, args.shared_vocab, args.seed,
+                             args.particle_rate)
+    print(f"합성 기사 {len(articles)}건 (주제 {args.topics}개, 조사 결합 비율 {args.particle_rate:.0%})")
+
+    results = {}
+    for name, use_candidates in (("전체 비교", False), ("후보 비교", True)):
+        started = time.perf_counter()
+        edges = PKMProcessor(ConstantRelationClassifier(), use_candidates=use_candidates).find_all_edges(articles)
+        results[name] = (edge_pairs(edges), time.perf_counter() - started)
+        print(f"{name}: 엣지 {len(edges)}개, {results[name][1]:.2f}초")
+
+    processor = PKMProcessor(ConstantRelationClassifier())
+    candidates = candidate_pairs([(article["_id"], processor._top_nodes(article), processor._node_ids(article))
+                                  for article in articles])
+    total_pairs = len(articles) * (len(articles) - 1) // 2
+
+    exhaustive, exhaustive_s = results["전체 비교"]
+    candidate, candidate_s = results["후보 비교"]
+    found_pairs = set(exhaustive) & set(candidates)
+    found_edges = set(exhaustive.items()) & set(candidate.items())
+    edge_recall = len(found_edges) / max(len(exhaustive), 1)
+    extra = set(candidate.items()) - set(exhaustive.items())
+
+    print(f"후보 쌍: {len(candidates)} / {total_pairs} ({len(candidates) / max(total_pairs, 1):.2%})")
+    print(f"후보 재현율: {len(found_pairs) / max(len(exhaustive), 1):.2%}")
+    print(f"엣지 재현율: {edge_recall:.2%} ({len(found_edges)} / {len(exhaustive)})")
+    print(f"후보 비교에만 있는 엣지: {len(extra)}개, 속도: {exhaustive_s / max(candidate_s, 1e-9):.1f}배")
+    if edge_recall < 1 or extra:
+        raise SystemExit("오류: 후보 비교 결과가 전체 비교와 다릅니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# src/micro_batcher.py
+# 동시에 들어온 임베딩 요청을 짧은 시간 동안 모아 한 번의 패딩된 forward 로 처리하는 스케줄러
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+LATENCY_MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """고정 버킷 누적 히스토그램 (스레드 안전)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._count += 1
+            self._sum += value
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[idx] += 1
+                    return
+            self._counts[-1] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            buckets = {f"<={bound}": count for bound, count in zip(self.buckets, self._counts)}
+            buckets["+Inf"] = self._counts[-1]
+            return {
+                "buckets": buckets,
+                "count": self._count,
+                "sum": round(self._sum, 3),
+                "mean": round(self._sum / self._count, 3) if self._count else 0.0
+            }
+
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    인코더 앞단의 마이크로 배칭 스케줄러
+
+    요청 스레드는 submit() 으로 텍스트 목록을 넣고 Future 로 결과를 받는다.
+    전용 워커 스레드가 큐에서 요청을 꺼내 최대 max_batch_size 행까지 모은 뒤
+    batch_fn 을 한 번 호출하고, 결과 행을 요청별로 나누어 돌려준다.
+
+    최근 배치가 단일 요청으로만 이루어졌다면(동시 부하 없음) 대기 없이 바로 실행하므로
+    단일 요청 지연은 늘어나지 않고, 동시 요청이 관측될 때만 max_wait_ms 동안 모은다.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[str]], np.ndarray], name: str = "encoder",
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.batch_fn = batch_fn
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.latency_histogram = Histogram(LATENCY_MS_BUCKETS)
+        self.queue_wait_histogram = Histogram(LATENCY_MS_BUCKETS)
+
+        # 최근 배치당 요청 수의 지수 이동 평균 (동시 부하 추정)
+        self._recent_requests_per_batch = 1.0
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._ensure_worker()
+
+    def _ensure_worker(self) -> None:
+        """
+        워커 스레드 시작. 스레드는 fork 후 자식 프로세스로 복제되지 않으므로
+        (gunicorn preload 후 워커 프로세스) 프로세스가 바뀌면 큐와 스레드를 새로 만든다.
+        """
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._start_lock:
+            if self._worker_pid == pid:
+                return
+            if self._worker_pid is not None:
+                self._queue = queue.Queue()
+            self._worker = threading.Thread(target=self._run, args=(self._queue,),
+                                            name=f"micro-batcher-{self.name}", daemon=True)
+            self._worker.start()
+            self._worker_pid = pid
+
+    def submit(self, texts: List[str]) -> Future:
+        """텍스트 목록을 큐에 넣고, (len(texts), dim) 행렬을 결과로 갖는 Future 반환"""
+        request = _Request(list(texts))
+        if not request.texts:
+            request.future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return request.future
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """submit() 후 결과를 기다리는 동기 호출"""
+        return self.submit(texts).result()
+
+    def close(self) -> None:
+        if self._worker_pid != os.getpid():
+            return
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": self._queue.qsize(),
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "latency_ms": self.latency_histogram.snapshot(),
+            "queue_wait_ms": self.queue_wait_histogram.snapshot()
+        }
+
+    # --- 워커 ---
+    def _collect(self, work_queue: "queue.Queue", first: _Request) -> List[_Request]:
+        """첫 요청 이후 큐에 쌓인 요청을 모음. 동시 부하가 관측될 때만 max_wait 동안 대기"""
+        pending = [first]
+        rows = len(first.texts)
+        wait = self.max_wait if self._recent_requests_per_batch > 1.05 else 0.0
+        deadline = first.enqueued_at + wait
+
+        while rows < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    request = work_queue.get(timeout=timeout)
+                else:
+                    request = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                # 종료 신호는 현재 배치 처리 후 반영
+                work_queue.put(None)
+                break
+            pending.append(request)
+            rows += len(request.texts)
+        return pending
+
+    def _run(self, work_queue: "queue.Queue") -> None:
+        while True:
+            first = work_queue.get()
+            if first is None:
+                return
+
+            pending = self._collect(work_queue, first)
+            started_at = time.monotonic()
+            texts = [text for request in pending for text in request.texts]
+
+            try:
+                vectors = self.batch_fn(texts)
+            except Exception as e:
+                for request in pending:
+                    request.future.set_exception(e)
+                continue
+
+            finished_at = time.monotonic()
+            offset = 0
+            for request in pending:
+                size = len(request.texts)
+                request.future.set_result(vectors[offset:offset + size])
+                offset += size
+                self.queue_wait_histogram.observe((started_at - request.enqueued_at) * 1000.0)
+                self.latency_histogram.observe((finished_at - request.enqueued_at) * 1000.0)
+
+            self.batch_size_histogram.observe(len(texts))
+            self._recent_requests_per_batch = 0.8 * self._recent_requests_per_batch + 0.2 * len(pending)
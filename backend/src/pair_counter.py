@@ -0,0 +1,142 @@
+# src/pair_counter.py
+# 동사별 명사 쌍 빈도 집계 (정수 id 배열 기반)
+# 기사마다 명사/동사를 정수 id 로 인터닝하고, (동사, 명사쌍) 을 int64 키 하나로 묶어
+# NumPy 로 집계한다. 문장마다 O(동사 수 x 명사쌍 수) 개의 튜플/Counter 갱신을 만들지 않는다.
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+# 키 구성: [동사 id (21bit)][작은 명사 id (21bit)][큰 명사 id (21bit)]
+_ID_BITS = 21
+_ID_LIMIT = 1 << _ID_BITS
+_ID_MASK = _ID_LIMIT - 1
+
+DEFAULT_MAX_NOUNS_PER_SENTENCE = 40
+
+
+def cap_candidate_nouns(nouns: Sequence[str], economic_mask: np.ndarray,
+                        limit: int) -> Tuple[List[str], np.ndarray]:
+    """
+    문장당 후보 명사 수 제한. 경제 용어를 우선으로 남기고 원래 순서는 유지
+    (limit 이하인 문장은 그대로 반환)
+    """
+    if limit is None or len(nouns) <= limit:
+        return list(nouns), economic_mask
+    ranked = np.concatenate([np.flatnonzero(economic_mask), np.flatnonzero(~economic_mask)])
+    keep = np.sort(ranked[:limit])
+    return [nouns[idx] for idx in keep], economic_mask[keep]
+
+
+class VerbPairCounter:
+    """기사 하나의 동사 빈도와 동사별 명사쌍 가중 빈도"""
+
+    def __init__(self, economic_terms: Set[str],
+                 max_nouns_per_sentence: int = DEFAULT_MAX_NOUNS_PER_SENTENCE):
+        self.economic_terms = economic_terms
+        self.max_nouns_per_sentence = max_nouns_per_sentence
+        self.verb_counter: Counter = Counter()
+
+        self._noun_ids: Dict[str, int] = {}
+        self._nouns: List[str] = []
+        self._verb_ids: Dict[str, int] = {}
+        self._key_chunks: List[np.ndarray] = []
+        self._weight_chunks: List[np.ndarray] = []
+        self._aggregated = None
+
+    def _intern(self, table: Dict[str, int], term: str, reverse: List[str] = None) -> int:
+        term_id = table.get(term)
+        if term_id is None:
+            term_id = len(table)
+            if term_id >= _ID_LIMIT:
+                raise ValueError("기사 하나의 고유 명사/동사 수가 키 범위를 넘었습니다")
+            table[term] = term_id
+            if reverse is not None:
+                reverse.append(term)
+        return term_id
+
+    def add_sentence(self, verbs: Sequence[str], nouns: Sequence[str]) -> None:
+        """
+        문장 하나 반영. 기존 규칙과 동일:
+        - 명사 2개 미만이거나 2글자 이상 동사가 없으면 제외
+        - 경제 용어가 있는 문장은 경제 용어가 포함된 쌍만 가중치 2, 그 외 문장은 모든 쌍 가중치 1
+        """
+        if len(nouns) < 2:
+            return
+        filtered_verbs = [verb for verb in verbs if len(verb) >= 2]
+        if not filtered_verbs:
+            return
+        self.verb_counter.update(filtered_verbs)
+
+        economic_mask = np.fromiter((noun in self.economic_terms for noun in nouns),
+                                    dtype=bool, count=len(nouns))
+        nouns, economic_mask = cap_candidate_nouns(nouns, economic_mask, self.max_nouns_per_sentence)
+        ids = np.fromiter((self._intern(self._noun_ids, noun, self._nouns) for noun in nouns),
+                          dtype=np.int64, count=len(nouns))
+
+        # i < j 쌍 (중첩 루프와 같은 순서)
+        first, second = np.triu_indices(len(nouns), k=1)
+        if economic_mask.any():
+            keep = economic_mask[first] | economic_mask[second]
+            first, second = first[keep], second[keep]
+            weight = 2
+        else:
+            weight = 1
+        if first.size == 0:
+            return
+
+        left, right = ids[first], ids[second]
+        pair_keys = (np.minimum(left, right) << _ID_BITS) | np.maximum(left, right)
+        verb_ids = np.fromiter((self._intern(self._verb_ids, verb) for verb in filtered_verbs),
+                               dtype=np.int64, count=len(filtered_verbs))
+
+        # 동사별로 같은 쌍 목록을 반복 (동사 → 쌍 순서 유지)
+        keys = np.repeat(verb_ids << (2 * _ID_BITS), pair_keys.size) | np.tile(pair_keys, verb_ids.size)
+        self._key_chunks.append(keys)
+        self._weight_chunks.append(np.full(keys.size, weight, dtype=np.int64))
+        self._aggregated = None
+
+    def add_sentences(self, tagged_sentences: Iterable[Tuple[Sequence[str], Sequence[str]]]) -> None:
+        for verbs, nouns in tagged_sentences:
+            self.add_sentence(verbs, nouns)
+
+    def _aggregate(self):
+        if self._aggregated is None:
+            if self._key_chunks:
+                keys = np.concatenate(self._key_chunks)
+                weights = np.concatenate(self._weight_chunks)
+                # return_index: 각 키가 처음 나온 위치 = Counter 삽입 순서
+                unique_keys, first_seen, inverse = np.unique(keys, return_index=True, return_inverse=True)
+                counts = np.bincount(inverse.ravel(), weights=weights).astype(np.int64)
+            else:
+                unique_keys = first_seen = counts = np.zeros(0, dtype=np.int64)
+            self._aggregated = (unique_keys, first_seen, counts)
+        return self._aggregated
+
+    def _decode_pair(self, key: int) -> Tuple[str, str]:
+        first = self._nouns[(key >> _ID_BITS) & _ID_MASK]
+        second = self._nouns[key & _ID_MASK]
+        return tuple(sorted((first, second)))
+
+    def most_common_pairs(self, verb: str) -> Iterable[Tuple[Tuple[str, str], int]]:
+        """Counter.most_common() 과 같은 순서 (빈도 내림차순, 동률은 처음 나온 순서)"""
+        verb_id = self._verb_ids.get(verb)
+        if verb_id is None:
+            return
+        unique_keys, first_seen, counts = self._aggregate()
+        rows = np.flatnonzero((unique_keys >> (2 * _ID_BITS)) == verb_id)
+        order = rows[np.lexsort((first_seen[rows], -counts[rows]))]
+        for row in order:
+            yield self._decode_pair(int(unique_keys[row])), int(counts[row])
+
+    def select_pairs(self, verb: str, max_pairs: int) -> List[Tuple[str, str]]:
+        """경제 용어가 포함된 쌍을 우선으로 동사당 최대 max_pairs 개 선택"""
+        economic_pairs, normal_pairs = [], []
+        for pair, _ in self.most_common_pairs(verb):
+            if any(term in self.economic_terms for term in pair):
+                economic_pairs.append(pair)
+                if len(economic_pairs) >= max_pairs:
+                    break
+            elif len(normal_pairs) < max_pairs:
+                normal_pairs.append(pair)
+        return (economic_pairs + normal_pairs)[:max_pairs]
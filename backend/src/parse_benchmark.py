@@ -0,0 +1,96 @@
+# src/parse_benchmark.py
+# 저장해 둔 기사 HTML 로 파싱 방식 비교 (시간 / 메모리 / 추출 결과 일치 여부)
+#   - 기존: html.parser 로 페이지 전체 트리 생성
+#   - 현재: lxml(있으면) + 사이트별 SoupStrainer 로 필요한 요소만 생성
+# 디렉터리 구조: <fixtures>/<도메인>/*.html  (예: data/html_fixtures/naver.com/001.html)
+# 사이트별 페이지가 없거나 제한 파싱 결과가 전체 파싱과 다르면 실패로 종료한다.
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup
+
+from src.fetch_content import HTML_PARSER, SITE_PARSERS, SITE_STRAINERS
+
+DEFAULT_FIXTURES_DIR = "data/html_fixtures"
+
+
+def parse_full(html: str, domain: str, url: str) -> dict:
+    site_parser = dict(SITE_PARSERS)[domain]
+    return site_parser(BeautifulSoup(html, "html.parser"), url)
+
+
+def parse_restricted(html: str, domain: str, url: str) -> dict:
+    site_parser = dict(SITE_PARSERS)[domain]
+    return site_parser(BeautifulSoup(html, HTML_PARSER, parse_only=SITE_STRAINERS[domain]), url)
+
+
+def measure(parse_fn, html: str, domain: str, url: str, repeat: int):
+    """(중앙값 ms, 최대 할당 KB, 결과)"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = parse_fn(html, domain, url)
+        times.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    parse_fn(html, domain, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024, result
+
+
+def load_fixtures(fixtures_dir: str = DEFAULT_FIXTURES_DIR) -> List[Tuple[str, str, str]]:
+    """
+    (도메인, 파일 이름, HTML) 목록
+    SITE_STRAINERS 의 사이트마다 저장된 페이지가 하나 이상 있어야 하며, 없으면 FileNotFoundError
+    """
+    fixtures, missing = [], []
+    for domain in SITE_STRAINERS:
+        site_dir = os.path.join(fixtures_dir, domain)
+        file_names = sorted(name for name in os.listdir(site_dir) if name.endswith(".html")) \
+            if os.path.isdir(site_dir) else []
+        if not file_names:
+            missing.append(domain)
+        for file_name in file_names:
+            with open(os.path.join(site_dir, file_name), 'r', encoding='utf-8') as f:
+                fixtures.append((domain, file_name, f.read()))
+    if missing:
+        raise FileNotFoundError(f"{fixtures_dir} 에 저장된 기사 페이지가 없는 사이트: {', '.join(missing)}")
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사이트별 HTML 파싱 방식 벤치마크")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        fixtures = load_fixtures(args.fixtures)
+    except FileNotFoundError as e:
+        raise SystemExit(f"오류: {e}")
+
+    print(f"제한 파싱 백엔드: {HTML_PARSER}")
+    print(f"{'사이트':<14}{'파일':<24}{'전체(ms)':>10}{'제한(ms)':>10}{'전체(KB)':>11}{'제한(KB)':>11}  결과")
+    mismatches = []
+    for domain, file_name, html in fixtures:
+        url = f"https://{domain}/{file_name}"
+        full_ms, full_kb, expected = measure(parse_full, html, domain, url, args.repeat)
+        restricted_ms, restricted_kb, actual = measure(parse_restricted, html, domain, url, args.repeat)
+        if actual != expected:
+            mismatches.append(f"{domain}/{file_name}")
+        status = "일치" if actual == expected else "불일치"
+        print(f"{domain:<14}{file_name:<24}{full_ms:>10.1f}{restricted_ms:>10.1f}"
+              f"{full_kb:>11.0f}{restricted_kb:>11.0f}  {status}")
+
+    # 제한 파싱은 결과가 같을 때만 의미가 있으므로 불일치가 있으면 실패로 종료
+    if mismatches:
+        raise SystemExit(f"오류: 제한 파싱 결과가 전체 파싱과 다름: {', '.join(mismatches)}")
+
+
+if __name__ == "__main__":
+    main()
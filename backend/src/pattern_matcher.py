@@ -0,0 +1,160 @@
+# src/pattern_matcher.py
+# Aho–Corasick 다중 패턴 검색기
+# 용어/키워드/동사 목록을 한 번 오토마톤으로 컴파일해 두고, 문장을 한 번만 훑어서
+# 포함된 모든 패턴(겹치는 경우 포함)을 위치와 함께 찾는다.
+# `[term for term in terms if term in sentence]` 와 같은 결과를 O(문장 길이 + 매칭 수)로 계산.
+import random
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+class PatternMatcher:
+    """컴파일된 Aho–Corasick 오토마톤"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = tuple(patterns)
+
+        # 같은 패턴이 목록에 여러 번 있으면 원래 위치를 모두 기억 (결과 순서/중복 보존)
+        self.unique_patterns: List[str] = []
+        self.positions: List[List[int]] = []
+        pattern_ids: Dict[str, int] = {}
+        self.empty_positions: List[int] = []
+        for position, pattern in enumerate(self.patterns):
+            if not pattern:
+                # 빈 문자열은 `"" in sentence` 처럼 항상 포함된 것으로 취급
+                self.empty_positions.append(position)
+                continue
+            pattern_id = pattern_ids.get(pattern)
+            if pattern_id is None:
+                pattern_id = len(self.unique_patterns)
+                pattern_ids[pattern] = pattern_id
+                self.unique_patterns.append(pattern)
+                self.positions.append([])
+            self.positions[pattern_id].append(position)
+
+        self._build()
+
+    def _build(self) -> None:
+        # 1. 트라이 구성
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(self.unique_patterns):
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    output.append([])
+                state = next_state
+            output[state].append(pattern_id)
+
+        # 2. 실패 링크 (BFS) 및 출력 병합
+        # 루트의 자식은 루트로 실패하므로 그 다음 깊이부터 계산
+        fail = [0] * len(goto)
+        bfs = deque(goto[0].values())
+        while bfs:
+            state = bfs.popleft()
+            for char, next_state in goto[state].items():
+                bfs.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                output[next_state] = output[next_state] + output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = [tuple(ids) for ids in output]
+        self._lengths = [len(pattern) for pattern in self.unique_patterns]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _iter_ids(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(끝 위치, 패턴 id) 를 텍스트를 한 번 훑으며 생성"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for pattern_id in output[state]:
+                    yield index + 1, pattern_id
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """모든 매칭을 (시작, 끝, 패턴) 으로 생성 (겹치는 매칭 포함, 끝 위치 순)"""
+        lengths, patterns = self._lengths, self.unique_patterns
+        for end, pattern_id in self._iter_ids(text):
+            yield end - lengths[pattern_id], end, patterns[pattern_id]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        return list(self.finditer(text))
+
+    def matched(self, text: str) -> List[str]:
+        """
+        텍스트에 포함된 패턴 목록
+
+        `[pattern for pattern in patterns if pattern in text]` 와 같은 결과
+        (원래 목록 순서, 중복 항목 포함)
+        """
+        found = {pattern_id for _, pattern_id in self._iter_ids(text)}
+        positions = list(self.empty_positions)
+        for pattern_id in found:
+            positions.extend(self.positions[pattern_id])
+        positions.sort()
+        return [self.patterns[position] for position in positions]
+
+
+@lru_cache(maxsize=64)
+def _compile(patterns: Tuple[str, ...]) -> PatternMatcher:
+    return PatternMatcher(patterns)
+
+
+def compile_patterns(patterns: Iterable[str]) -> PatternMatcher:
+    """패턴 목록별로 한 번만 오토마톤을 만들고 캐시된 검색기를 반환"""
+    return _compile(tuple(patterns))
+
+
+def main():
+    """article_terms.json 용어로 중첩 루프(`term in sentence`)와 오토마톤 검색 속도 비교"""
+    import json
+
+    with open("data/json/article_terms.json", 'r', encoding='utf-8') as f:
+        terms = json.load(f)["terms"]
+
+    # 실제 용어를 섞은 합성 문장 생성
+    rng = random.Random(42)
+    filler = ["정부는", "이번", "발표에서", "시장의", "우려가", "커지면서", "전망했다.", "관계자는", "밝혔다."]
+    sentences = []
+    for _ in range(500):
+        words = [rng.choice(filler) for _ in range(rng.randint(8, 20))]
+        for _ in range(rng.randint(1, 4)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(terms))
+        sentences.append(" ".join(words))
+
+    start = time.perf_counter()
+    expected = [[term for term in terms if term in sentence] for sentence in sentences]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = compile_patterns(terms)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [matcher.matched(sentence) for sentence in sentences]
+    scan_time = time.perf_counter() - start
+
+    assert actual == expected, "오토마톤 결과가 중첩 루프 결과와 다릅니다"
+    print(f"용어 {len(terms)}개, 문장 {len(sentences)}개")
+    print(f"중첩 루프     : {loop_time * 1000:.1f} ms")
+    print(f"오토마톤 빌드 : {build_time * 1000:.1f} ms (어휘당 1회)")
+    print(f"오토마톤 검색 : {scan_time * 1000:.1f} ms ({loop_time / max(scan_time, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,42 @@
 # pkm_processor.py
-from typing import List, Dict
-import re
+from typing import List, Dict, Optional
 import numpy as np
 from collections import defaultdict
-from functools import lru_cache
+
+from src.link_candidates import CorpusLinkIndex, LinkCandidateIndex, candidate_pairs
+from src.text_stats import DEFAULT_WINDOW_SIZE, PositionalIndex, compute_text_stats
 
 
 class PKMProcessor:
     """문서 간 관계를 분석하고 통합하는 프로세서"""
 
-    def __init__(self, relation_processor):
+    def __init__(self, relation_processor, use_candidates: bool = True):
         self.relation_processor = relation_processor
+        # True 면 주요 노드 역색인 + MinHash LSH 로 고른 후보 문서 쌍만 비교 (False 면 모든 쌍)
+        self.use_candidates = use_candidates
         self.processed_docs = {}  # 문서 전처리 결과 저장
         self.pmi_cache = {}  # PMI 결과 캐싱
+        self._index = None  # processed_docs 로 만든 위치 역색인
+        self._totals = None  # 출현 수 / 전체 토큰 수를 processed_docs 대신 가져올 곳 (CorpusLinkIndex)
 
-    def _preprocess_text(self, text: str) -> Dict:
-        """텍스트 전처리"""
-        words = text.split()
-        return {
-            'words': words,
-            'word_count': len(words)
-        }
-
-    def _calculate_pmi(self, kw1: str, kw2: str, window_size: int = 20) -> float:
-        """두 키워드 간의 PMI 계산"""
+    def _calculate_pmi(self, kw1: str, kw2: str, window_size: int = DEFAULT_WINDOW_SIZE) -> float:
+        """두 키워드 간의 PMI 계산 (저장된 본문 통계의 위치 역색인만 사용)"""
         # 캐시 키 생성
         cache_key = (kw1, kw2)
         if cache_key in self.pmi_cache:
             return self.pmi_cache[cache_key]
 
-        def count_keyword_occurrences(text: str, keyword: str) -> int:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            return len(re.findall(pattern, text))
-
-        def count_co_occurrences(words: List[str], kw1: str, kw2: str, window_size: int) -> int:
-            co_count = 0
-            for i in range(len(words)):
-                window = words[max(0, i - window_size):min(len(words), i + window_size + 1)]
-                window_text = ' '.join(window)
-                if kw1 in window_text and kw2 in window_text:
-                    co_count += 1
-            return co_count
-
-        # 전처리된 문서 데이터 사용
-        total_kw1_count = 0
-        total_kw2_count = 0
-        total_co_count = 0
-        total_words = 0
-
-        for doc_id, doc_info in self.processed_docs.items():
-            text = doc_info['text']
-            words = doc_info['words']
-            total_kw1_count += count_keyword_occurrences(text, kw1)
-            total_kw2_count += count_keyword_occurrences(text, kw2)
-            total_co_count += count_co_occurrences(words, kw1, kw2, window_size)
-            total_words += doc_info['word_count']
-
-        if total_words == 0:
+        # 위치 역색인 사용 (두 키워드가 모두 나온 문서만 병합)
+        index = self._corpus_index()
+        totals = self._totals if self._totals is not None else index
+        total_kw1_count = totals.count(kw1)
+        total_kw2_count = totals.count(kw2)
+        total_co_count = index.co_occurrence(kw1, kw2, window_size)
+        total_words = totals.total_tokens
+
+        # 창 공출현이 없는 쌍은 연결 근거가 없으므로 제외 (스무딩만으로 PMI 가 임계값을 넘지 않도록)
+        # 후보 생성(src/link_candidates.py)도 이 조건을 전제로 하므로 전체 비교와 결과가 같다.
+        if total_words == 0 or total_co_count == 0:
             result = float('-inf')
         else:
             p_kw1 = (total_kw1_count + 1e-10) / total_words
@@ -68,6 +48,71 @@ class PKMProcessor:
         self.pmi_cache[cache_key] = result
         return result
 
+    def _corpus_index(self) -> PositionalIndex:
+        if self._index is None:
+            self._index = PositionalIndex(self.processed_docs)
+        return self._index
+
+    @staticmethod
+    def _top_nodes(doc: Dict, limit: int = 3) -> List[str]:
+        """문서의 가장 중요한 노드들"""
+        graph_data = doc.get('hypergraph_data') or {}
+        nodes = {node['id']: node['importance'] for node in graph_data.get('nodes', [])}
+        return [node for node, _ in sorted(nodes.items(), key=lambda x: x[1], reverse=True)[:limit]]
+
+    @staticmethod
+    def _node_ids(doc: Dict) -> List[str]:
+        graph_data = doc.get('hypergraph_data') or {}
+        return [node['id'] for node in graph_data.get('nodes', [])]
+
+    def _best_connection(self, doc1_id: str, nodes1: List[str], doc2_id: str, nodes2: List[str],
+                         processed_pairs: set, pmi_threshold: float) -> Optional[Dict]:
+        """두 문서의 주요 노드 쌍 중 PMI 가 가장 높은 쌍을 HGNN 으로 분류한 문서 간 엣지 (없으면 None)"""
+        best_connection = None
+        best_pmi = float('-inf')
+
+        for node1 in nodes1:
+            for node2 in nodes2:
+                pair_key = tuple(sorted([node1, node2]))
+                if pair_key in processed_pairs:
+                    continue
+                processed_pairs.add(pair_key)
+
+                try:
+                    # 수정된 PMI 계산 호출
+                    pmi_score = self._calculate_pmi(node1, node2)
+
+                    if pmi_score > best_pmi and pmi_score > pmi_threshold:
+                        # HGNN으로 관계 예측
+                        prediction = self.relation_processor.classify_relations({
+                            "nodes": [],
+                            "edges": [{
+                                "nodes": [node1, node2],
+                                "description": "문서간연결",
+                                "importance": 1.0
+                            }]
+                        })
+                        category_info = prediction['edges'][0]
+
+                        best_pmi = pmi_score
+                        best_connection = {
+                            # 문서 쌍으로 정해지는 id (저장 후 다시 읽어도 같은 값)
+                            "id": f"cross_edge_{doc1_id}_{doc2_id}",
+                            "nodes": [node1, node2],
+                            "description": "문서간연결",
+                            "importance": 1.0,
+                            "category": category_info['category'],
+                            "confidence": category_info['confidence'],
+                            "pmi_score": pmi_score,
+                            "source_doc": doc1_id,
+                            "target_doc": doc2_id
+                        }
+                except Exception as e:
+                    print(f"Error calculating PMI for {node1} and {node2}: {str(e)}")
+                    continue
+
+        return best_connection
+
     def _find_cross_document_edges(self, docs: List[Dict], pmi_threshold: float = 0.5) -> List[Dict]:
         """문서 간 엣지 찾기"""
         try:
@@ -75,106 +120,157 @@ class PKMProcessor:
             doc_nodes = {}  # doc_id -> nodes
             for doc in docs:
                 if 'hypergraph_data' in doc and 'nodes' in doc['hypergraph_data']:
-                    graph_data = doc['hypergraph_data']
-                    nodes = {node['id']: node['importance'] for node in graph_data['nodes']}
-                    doc_nodes[str(doc['_id'])] = nodes
+                    doc_nodes[str(doc['_id'])] = self._top_nodes(doc)
 
             cross_edges = []
-            next_edge_id = 1
-            processed_pairs = set()
 
-            # 문서 쌍별로 처리
+            # 문서 쌍별로 처리 (후보 생성 시 후보 쌍만)
+            # 저장 시 연결(link_article)과 같은 결과가 되도록 뒤 문서별로 앞 문서들을 저장 순서대로 비교하고,
+            # 이미 시도한 노드 쌍 기록(processed_pairs)도 뒤 문서마다 새로 시작한다.
             doc_ids = list(doc_nodes.keys())
-            for i, doc1_id in enumerate(doc_ids[:-1]):
-                for doc2_id in doc_ids[i + 1:]:
-                    # 각 문서의 가장 중요한 노드들 간 PMI 계산
-                    nodes1 = sorted(doc_nodes[doc1_id].items(), key=lambda x: x[1], reverse=True)[:3]
-                    nodes2 = sorted(doc_nodes[doc2_id].items(), key=lambda x: x[1], reverse=True)[:3]
-
-                    best_connection = None
-                    best_pmi = float('-inf')
-
-                    for node1, _ in nodes1:
-                        for node2, _ in nodes2:
-                            pair_key = tuple(sorted([node1, node2]))
-                            if pair_key in processed_pairs:
-                                continue
-                            processed_pairs.add(pair_key)
-
-                            try:
-                                # 수정된 PMI 계산 호출
-                                pmi_score = self._calculate_pmi(node1, node2)
-
-                                if pmi_score > best_pmi and pmi_score > pmi_threshold:
-                                    # HGNN으로 관계 예측
-                                    prediction = self.relation_processor.classify_relations({
-                                        "nodes": [],
-                                        "edges": [{
-                                            "nodes": [node1, node2],
-                                            "description": "문서간연결",
-                                            "importance": 1.0
-                                        }]
-                                    })
-                                    category_info = prediction['edges'][0]
-
-                                    best_pmi = pmi_score
-                                    best_connection = {
-                                        "id": f"cross_edge_{next_edge_id}",
-                                        "nodes": [node1, node2],
-                                        "description": "문서간연결",
-                                        "importance": 1.0,
-                                        "category": category_info['category'],
-                                        "confidence": category_info['confidence'],
-                                        "pmi_score": pmi_score,
-                                        "source_doc": doc1_id,
-                                        "target_doc": doc2_id
-                                    }
-                            except Exception as e:
-                                print(f"Error calculating PMI for {node1} and {node2}: {str(e)}")
-                                continue
-
-                    if best_connection:
-                        cross_edges.append(best_connection)
-                        next_edge_id += 1
+            order = {doc_id: position for position, doc_id in enumerate(doc_ids)}
+            if self.use_candidates:
+                node_sets = {str(doc['_id']): self._node_ids(doc) for doc in docs}
+                pairs = candidate_pairs([(doc_id, doc_nodes[doc_id], node_sets[doc_id]) for doc_id in doc_ids])
+            else:
+                pairs = [(doc1_id, doc2_id) for i, doc1_id in enumerate(doc_ids[:-1]) for doc2_id in doc_ids[i + 1:]]
+
+            processed_pairs = set()
+            current_target = None
+            for doc1_id, doc2_id in sorted(pairs, key=lambda pair: (order[pair[1]], order[pair[0]])):
+                if doc2_id != current_target:
+                    current_target = doc2_id
+                    processed_pairs = set()
+                best_connection = self._best_connection(doc1_id, doc_nodes[doc1_id], doc2_id,
+                                                        doc_nodes[doc2_id], processed_pairs, pmi_threshold)
+                if best_connection:
+                    cross_edges.append(best_connection)
 
             return cross_edges
         except Exception as e:
             print(f"Error in _find_cross_document_edges: {str(e)}")
             return []
 
-    def process_articles(self, articles: List[Dict]) -> List[Dict]:
-        """문서들을 처리하고 문서 간 연결 추가"""
-        if not articles:
-            return []
+    @staticmethod
+    def _article_stats(doc: Dict) -> Dict:
+        """저장 시 계산된 본문 통계 (통계가 없는 이전 문서만 본문에서 계산)"""
+        stats = doc.get('text_stats')
+        if stats is None:
+            nodes = doc.get('hypergraph_data', {}).get('nodes', [])
+            stats = compute_text_stats(doc.get('content', ''), [node['id'] for node in nodes])
+        return stats
 
-        # 문서 전처리
+    def _load_corpus(self, articles: List[Dict]) -> None:
         self.processed_docs.clear()  # 이전 캐시 클리어
+        self.pmi_cache.clear()
+        self._index = None
+        self._totals = None
         for doc in articles:
-            text = doc.get('content', '')
-            self.processed_docs[str(doc['_id'])] = {
-                **self._preprocess_text(text),
-                'text': text
-            }
+            self.processed_docs[str(doc['_id'])] = self._article_stats(doc)
 
-        # 문서 간 엣지 찾기
-        cross_edges = self._find_cross_document_edges(articles)
+    @classmethod
+    def index_article(cls, corpus: CorpusLinkIndex, doc: Dict) -> None:
+        """저장된 문서를 연결 색인에 추가 (이미 있으면 교체)"""
+        corpus.add(str(doc['_id']), cls._top_nodes(doc), cls._node_ids(doc), cls._article_stats(doc))
+
+    def link_article(self, article: Dict, others: List[Dict], pmi_threshold: float = 0.5) -> List[Dict]:
+        """
+        새로 저장된 문서와 기존 문서들 사이의 엣지만 계산 (후보 문서만 비교)
+        PMI 통계는 새 문서를 포함한 전체 문서 기준. 새 문서가 가장 나중 문서이므로 target_doc 이 된다.
+        """
+        self._load_corpus(list(others) + [article])
+        article_id = str(article['_id'])
+        nodes = self._top_nodes(article)
+        if not nodes:
+            return []
+
+        if self.use_candidates:
+            index = LinkCandidateIndex()
+            # 새 문서 안의 공출현도 후보 근거가 되므로 새 문서도 색인
+            for doc in list(others) + [article]:
+                index.add(str(doc['_id']), self._top_nodes(doc), self._node_ids(doc))
+            candidates = index.query(nodes, self._node_ids(article))
+            others = [other for other in others if str(other['_id']) in candidates]
+
+        cross_edges = []
+        processed_pairs = set()
+        for other in others:
+            other_id = str(other['_id'])
+            if other_id == article_id:
+                continue
+            try:
+                best_connection = self._best_connection(other_id, self._top_nodes(other), article_id, nodes,
+                                                        processed_pairs, pmi_threshold)
+            except Exception as e:
+                print(f"Error linking {article_id} and {other_id}: {str(e)}")
+                continue
+            if best_connection:
+                cross_edges.append(best_connection)
+        return cross_edges
+
+    def link_indexed_article(self, article: Dict, corpus: CorpusLinkIndex, evidence: List[Dict],
+                             pmi_threshold: float = 0.5) -> List[Dict]:
+        """
+        link_article 과 같은 엣지를 전체 문서의 본문 통계 없이 계산
+        corpus 는 article 을 포함한 저장된 전체 문서의 연결 색인이고, evidence 는
+        corpus.evidence_docs(article, corpus.candidates(article)) 문서들 (본문 통계 포함).
+        출현 수와 전체 토큰 수는 corpus 의 합계, 창 공출현은 evidence 의 위치로 계산한다.
+        """
+        article_id = str(article['_id'])
+        self._load_corpus([doc for doc in evidence if str(doc['_id']) != article_id] + [article])
+        self._totals = corpus
+        nodes = corpus.top_keywords(article_id)
+        if not nodes:
+            return []
+
+        cross_edges = []
+        processed_pairs = set()
+        for other_id in corpus.candidates(article_id):
+            try:
+                best_connection = self._best_connection(other_id, corpus.top_keywords(other_id), article_id, nodes,
+                                                        processed_pairs, pmi_threshold)
+            except Exception as e:
+                print(f"Error linking {article_id} and {other_id}: {str(e)}")
+                continue
+            if best_connection:
+                cross_edges.append(best_connection)
+        return cross_edges
+
+    def find_all_edges(self, articles: List[Dict]) -> List[Dict]:
+        """
+        전체 문서 간 엣지를 처음부터 다시 계산 (저장된 엣지 재구성용)
+        articles 를 저장 순서로 주면 각 문서를 저장 순서대로 link_article 로 연결한 것과 같은 규칙을 따른다.
+        다만 PMI 통계와 후보 색인은 저장 당시가 아니라 현재 전체 문서 기준이므로, 이후 저장된 문서 때문에
+        PMI 가 임계값을 넘거나 못 넘게 된 쌍은 저장 시 연결 결과와 달라질 수 있다.
+        """
+        self._load_corpus(articles)
+        return self._find_cross_document_edges(articles)
+
+    @staticmethod
+    def attach_cross_edges(articles: List[Dict], cross_edges: List[Dict]) -> List[Dict]:
+        """각 문서의 hypergraph_data 에 관련 문서 간 엣지 추가"""
+        edges_by_doc = defaultdict(list)
+        for edge in cross_edges:
+            edges_by_doc[edge['source_doc']].append(edge)
+            edges_by_doc[edge['target_doc']].append(edge)
 
-        # 각 문서의 hypergraph_data에 cross_edges 추가
         processed_articles = []
         for article in articles:
             article_copy = dict(article)
-            if 'hypergraph_data' not in article_copy:
-                article_copy['hypergraph_data'] = {'nodes': [], 'edges': []}
-
-            # 이 문서와 관련된 cross_edges 찾기
-            doc_id = str(article_copy['_id'])
-            relevant_edges = [
-                edge for edge in cross_edges
-                if edge['source_doc'] == doc_id or edge['target_doc'] == doc_id
-            ]
-
+            article_copy.pop('text_stats', None)
+            hypergraph_data = dict(article_copy.get('hypergraph_data') or {'nodes': [], 'edges': []})
             # 기존 엣지에 cross_edges 추가
-            article_copy['hypergraph_data']['edges'].extend(relevant_edges)
+            hypergraph_data['edges'] = list(hypergraph_data.get('edges', [])) + edges_by_doc[str(article_copy['_id'])]
+            article_copy['hypergraph_data'] = hypergraph_data
             processed_articles.append(article_copy)
 
-        return processed_articles
\ No newline at end of file
+        return processed_articles
+
+    def process_articles(self, articles: List[Dict]) -> List[Dict]:
+        """문서들을 처리하고 문서 간 연결 추가"""
+        if not articles:
+            return []
+
+        # 문서 간 엣지 찾기
+        cross_edges = self.find_all_edges(articles)
+        return self.attach_cross_edges(articles, cross_edges)
@@ -4,6 +4,7 @@ from koalanlp import API
 from koalanlp.Util import initialize, finalize
 from koalanlp.types import POS
 import json
+from src.pattern_matcher import PatternMatcher
 
 # JVM 초기화 상태를 확인하는 플래그
 jvm_initialized = False
@@ -20,13 +21,25 @@ initialize_jvm()
 # 사전 초기화
 KDict = Dictionary(API.KKMA)  # KKMA 분석기 사용
 
+# 사용자 정의 동사 오토마톤 (처음 쓸 때 한 번 만들고, 사전에 동사를 추가하면 다시 만듦)
+_custom_verb_matcher = None
+
+def custom_verb_matcher():
+    global _custom_verb_matcher
+    if _custom_verb_matcher is None:
+        custom_verbs = [entry[0] for entry in KDict.getItems() if entry[1] == POS.VV]
+        _custom_verb_matcher = PatternMatcher(custom_verbs)
+    return _custom_verb_matcher
+
 def load_custom_verbs(file_path):
+    global _custom_verb_matcher
     try:
         with open(file_path, "r", encoding="utf-8") as file:
             data = json.load(file)
         custom_verbs = data.get("yes_verbs", [])
         for verb in custom_verbs:
             KDict.addUserDictionary((verb, POS.VV))  # 사용자 정의 동사 추가
+        _custom_verb_matcher = None
         print(f"사용자 동사 {len(custom_verbs)}개가 사전에 추가되었습니다.")
     except FileNotFoundError:
         print(f"파일을 찾을 수 없습니다: {file_path}")
@@ -63,9 +76,8 @@ def extract_verbs(sentence, not_verbs, yes_verbs, verb_mapping=None):
                     if combined not in not_verbs or combined in yes_verbs:
                         verbs.append(combined)
 
-    # 사용자 정의 사전에서 동사 추가
-    custom_verbs = [entry[0] for entry in KDict.getItems() if entry[1] == POS.VV]
-    verbs.extend([verb for verb in custom_verbs if verb in sentence])
+    # 사용자 정의 사전에서 동사 추가 (동사 목록 오토마톤으로 문장을 한 번만 훑음)
+    verbs.extend(custom_verb_matcher().matched(sentence))
 
     unique_verbs = list(set(verbs))
     if verb_mapping:
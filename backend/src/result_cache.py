@@ -0,0 +1,115 @@
+# src/result_cache.py
+# /service 분석 결과 캐시
+# - 키: 정규화 URL 해시 ("url:...") 와 본문 해시 ("content:...")
+#   → 같은 URL 재요청은 크롤링도 건너뛰고, URL 이 달라도 본문이 같으면 분석을 건너뜀
+# - 1단계: 프로세스 메모리 LRU, 2단계: 주입받은 영구 저장소 (서비스에서는 Database, MongoDB analysis_cache 컬렉션)
+# - 버전: 모델/PMI/사전 파일 상태의 해시. 파일이 바뀌면 이전 항목은 조회되지 않음
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.url_utils import content_hash, url_hash
+
+# 파이프라인 코드가 결과 형식을 바꾸면 올려서 기존 캐시를 무효화
+PIPELINE_VERSION = "1"
+
+
+def compute_cache_version(paths: Iterable[str], pipeline_version: str = PIPELINE_VERSION) -> str:
+    """결과에 영향을 주는 파일들의 (경로, 크기, 수정 시각) 해시"""
+    digest = hashlib.sha1(pipeline_version.encode("utf-8"))
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state = f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            state = f"{path}:missing"
+        digest.update(state.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def url_key(url: str) -> str:
+    return "url:" + url_hash(url)
+
+
+def content_key(content: str) -> str:
+    return "content:" + content_hash(content)
+
+
+class ResultCache:
+    """
+    메모리 LRU + 영구 저장소 2단계 분석 결과 캐시
+    store 는 async get_cached_result(key, version) / save_cached_result(key, version, result) 를 제공
+    (없으면 메모리만 사용)
+    """
+
+    def __init__(self, version: str, max_entries: int = 256, store: Optional[Any] = None):
+        self.version = version
+        self.max_entries = max_entries
+        self.store = store
+        self._memory: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "mongo_hits": 0, "misses": 0}
+
+    def set_version(self, version: str) -> None:
+        """버전이 바뀌면 메모리 캐시를 비움 (Mongo 항목은 버전 조건으로 걸러짐)"""
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self._memory.clear()
+
+    def _get_memory(self, key: str) -> Optional[dict]:
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+            return result
+
+    def _put_memory(self, key: str, result: dict) -> None:
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Tuple[Optional[dict], Optional[str]]:
+        """(결과, 적중 계층) 반환. 없으면 (None, None)"""
+        result = self._get_memory(key)
+        if result is not None:
+            self._count("memory_hits")
+            return copy.deepcopy(result), "memory"
+
+        if self.store is not None:
+            try:
+                result = await self.store.get_cached_result(key, self.version)
+            except Exception as e:
+                print(f"분석 캐시 조회 중 오류 발생: {e}")
+                result = None
+            if result is not None:
+                self._put_memory(key, result)
+                self._count("mongo_hits")
+                return copy.deepcopy(result), "mongo"
+
+        self._count("misses")
+        return None, None
+
+    async def put(self, keys: Iterable[str], result: dict) -> None:
+        """같은 결과를 여러 키(URL, 본문)로 저장"""
+        result = copy.deepcopy(result)
+        for key in keys:
+            self._put_memory(key, result)
+            if self.store is not None:
+                try:
+                    await self.store.save_cached_result(key, self.version, result)
+                except Exception as e:
+                    print(f"분석 캐시 저장 중 오류 발생: {e}")
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return dict(self._stats, version=self.version, memory_entries=len(self._memory))
@@ -0,0 +1,152 @@
+# src/sentence_segmenter.py
+# 문장 분리 계층
+# - fast : 잘 정돈된 뉴스 문장을 위한 규칙 기반 분리 ("~다." 등 한글 뒤 종결 부호 기준)
+# - kss  : 항상 kss 사용
+# - auto : 규칙 기반으로 분리하되, 판단이 애매한 문단만 kss 로 대체 (기본값)
+# 분리 결과는 문단 해시 단위로 캐싱한다.
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# 한글 음절 뒤의 종결 부호 (+ 닫는 따옴표/괄호)
+_SENTENCE_END = re.compile(r'[가-힣][.?!]+["\'”’)\]]*')
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n|\n')
+_CLOSING_CHARS = '"\'”’)]'
+
+MAX_SENTENCE_LENGTH = 400
+MAX_TRAILING_FRAGMENT = 80
+
+
+def _is_boundary(text: str, end: int) -> bool:
+    """종결 부호 뒤가 공백/문단 끝이거나, 붙어 있는 다음 문장의 시작인지 확인"""
+    if end >= len(text):
+        return True
+    next_char = text[end]
+    if next_char.isspace():
+        return True
+    # 닫는 따옴표 뒤에 바로 조사가 붙으면 인용문 내부의 종결 ("어렵다."는)
+    if text[end - 1] in _CLOSING_CHARS:
+        return False
+    # get_text(strip=True) 로 요소가 붙은 본문 ("했다.그러나") 도 경계로 취급.
+    # 숫자/영문 소문자가 바로 붙으면 소수점·도메인 등일 수 있으므로 경계가 아님
+    return not (next_char.isdigit() or ('a' <= next_char <= 'z'))
+
+
+def _has_unbalanced_quotes(sentence: str) -> bool:
+    return (sentence.count('"') % 2 == 1
+            or sentence.count('“') != sentence.count('”')
+            or sentence.count('(') != sentence.count(')'))
+
+
+def _rule_split(paragraph: str) -> List[str]:
+    """한글 뒤 종결 부호를 기준으로 문장 분리"""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(paragraph):
+        end = match.end()
+        if not _is_boundary(paragraph, end):
+            continue
+        sentence = paragraph[start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = end
+
+    tail = paragraph[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _is_ambiguous(sentences: List[str]) -> bool:
+    """
+    규칙 기반 결과를 믿기 어려운 경우
+    - 너무 긴 문장이 남은 경우 (구두점이 빠진 텍스트)
+    - 따옴표/괄호가 문장 경계를 넘어가는 경우 (인용문 내부의 마침표)
+    - 마지막 조각이 종결 부호 없이 긴 경우 (바이라인 같은 짧은 꼬리는 허용)
+    """
+    if not sentences:
+        return False
+    tail = sentences[-1]
+    if len(tail) > MAX_TRAILING_FRAGMENT and tail.rstrip(_CLOSING_CHARS)[-1:] not in ".?!":
+        return True
+    return any(len(sentence) > MAX_SENTENCE_LENGTH or _has_unbalanced_quotes(sentence)
+               for sentence in sentences)
+
+
+def split_rule_based(paragraph: str) -> Optional[List[str]]:
+    """규칙 기반 문장 분리. 결과가 애매하면 None 을 반환하여 kss 로 대체하게 함"""
+    sentences = _rule_split(paragraph)
+    return None if _is_ambiguous(sentences) else sentences
+
+
+def split_with_kss(paragraph: str) -> List[str]:
+    import kss
+
+    return [sentence.strip() for sentence in kss.split_sentences(paragraph) if sentence.strip()]
+
+
+class SentenceSegmenter:
+    """문단 해시 캐시를 가진 문장 분리기"""
+
+    MODES = ("auto", "fast", "kss")
+
+    def __init__(self, mode: str = "auto", cache_size: int = 4096):
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 문장 분리 모드입니다: {mode}")
+        self.mode = mode
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"cache_hits": 0, "rule_based": 0, "kss": 0}
+
+    def split(self, text: str, mode: Optional[str] = None) -> List[str]:
+        mode = mode or self.mode
+        sentences: List[str] = []
+        for paragraph in _PARAGRAPH_BREAK.split(text):
+            paragraph = paragraph.strip()
+            if paragraph:
+                sentences.extend(self._split_paragraph(paragraph, mode))
+        return sentences
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, cached_paragraphs=len(self._cache))
+
+    def _split_paragraph(self, paragraph: str, mode: str) -> Tuple[str, ...]:
+        key = (mode, hashlib.sha1(paragraph.encode('utf-8')).hexdigest())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return cached
+
+        sentences = None
+        if mode == "fast":
+            # fast 모드는 애매해도 kss 를 쓰지 않고 규칙 기반 결과를 그대로 사용
+            sentences = _rule_split(paragraph)
+        elif mode == "auto":
+            sentences = split_rule_based(paragraph)
+        if sentences is None:
+            sentences = split_with_kss(paragraph)
+            stat = "kss"
+        else:
+            stat = "rule_based"
+
+        result = tuple(sentences)
+        with self._lock:
+            self._stats[stat] += 1
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+
+default_segmenter = SentenceSegmenter()
+
+
+def split_sentences(text: str, mode: Optional[str] = None) -> List[str]:
+    """기본 분리기(auto 모드, 프로세스 공유 캐시)로 문장 분리"""
+    return default_segmenter.split(text, mode)
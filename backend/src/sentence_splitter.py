@@ -1,6 +1,6 @@
 # src/sentence_splitter.py
-# KSS를 사용하여 문서를 문장 단위로 분리하여 리스트로 반환
-import kss
+# 문서를 문장 단위로 분리하여 리스트로 반환 (규칙 기반 분리 + 애매한 문단만 KSS, 결과 캐싱)
+from src.sentence_segmenter import split_sentences as _split_sentences
 
 def split_sentences(document):
-    return list(kss.split_sentences(document))
+    return _split_sentences(document)
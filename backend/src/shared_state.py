@@ -0,0 +1,161 @@
+# src/shared_state.py
+# 여러 워커 프로세스가 공유하는 관계 분류(HGNN) 읽기 전용 상태
+# - PMI 키워드 어휘, 특징 행렬(CSR), 정규화 라플라시안 L(CSR) 을 .npy 파일로 내보내고
+# - 워커는 np.load(mmap_mode='r') 로 열어 OS 페이지 캐시를 프로세스 간에 공유한다.
+# 조밀한 특징 행렬(키워드 수^2 float64, 수 GB)을 프로세스마다 만들지 않는다.
+# 어휘 임베딩 테이블(src/embedding_table)도 같은 방식으로 mmap 으로 열린다.
+import argparse
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from src.matrix_processor4 import generate_normalized_laplacian
+
+DEFAULT_STATE_DIR = "data/shared/relation"
+MANIFEST_FILE = "manifest.json"
+_CSR_PARTS = ("data", "indices", "indptr")
+
+
+class RelationState(NamedTuple):
+    keywords: List[str]
+    feature_matrix: sparse.csr_matrix
+    laplacian: sparse.csr_matrix
+    manifest: Dict
+
+
+def extract_keywords(pmi_data: dict) -> List[str]:
+    """PMI 데이터의 키워드 목록 (내보낼 때 한 번 순서를 고정하여 모든 워커가 같은 인덱스를 사용)"""
+    keywords = {kw for pairs in pmi_data.values()
+                for pair in pairs.keys()
+                for kw in pair.split(" | ")}
+    return sorted(keywords)
+
+
+def build_relation_matrices(pmi_data: dict, keyword_to_idx: Dict[str, int]
+                            ) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+    """
+    matrix_processor4 의 create_feature_matrix / create_hypergraph_structure 와 같은 값을
+    조밀한 행렬 없이 희소 행렬로 계산 (같은 위치에 여러 번 대입되면 마지막 값 유지)
+    """
+    n = len(keyword_to_idx)
+    features: Dict[Tuple[int, int], float] = {}
+    hyperedges: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+    edge_weights: Dict[str, float] = {}
+
+    for category, pairs in pmi_data.items():
+        for pair, pmi_value in pairs.items():
+            kw1, kw2 = pair.split(" | ")
+            if kw1 in keyword_to_idx and kw2 in keyword_to_idx:
+                idx1, idx2 = keyword_to_idx[kw1], keyword_to_idx[kw2]
+                features[(idx1, idx2)] = pmi_value
+                features[(idx2, idx1)] = pmi_value
+
+                edge_id = f"{category}_{kw1}_{kw2}"
+                hyperedges[edge_id] = (idx1, idx2)
+                edge_weights[edge_id] = pmi_value
+
+    rows = np.fromiter((i for i, _ in features), dtype=np.int64, count=len(features))
+    cols = np.fromiter((j for _, j in features), dtype=np.int64, count=len(features))
+    values = np.fromiter(features.values(), dtype=np.float64, count=len(features))
+    feature_matrix = sparse.csr_matrix((values, (rows, cols)), shape=(n, n))
+
+    # 인시던스 행렬 H (자기 쌍은 한 칸만 1) 와 엣지 가중치 W
+    h_rows, h_cols = [], []
+    for edge_idx, nodes in enumerate(hyperedges.values()):
+        for node_idx in set(nodes):
+            h_rows.append(node_idx)
+            h_cols.append(edge_idx)
+    H = sparse.csr_matrix((np.ones(len(h_rows)), (h_rows, h_cols)), shape=(n, len(hyperedges)))
+    W = np.array([edge_weights[edge_id] for edge_id in hyperedges], dtype=np.float64)
+
+    laplacian = sparse.csr_matrix(generate_normalized_laplacian(H, W))
+    return feature_matrix, laplacian
+
+
+def _save_csr(matrix: sparse.csr_matrix, state_dir: str, name: str, dtype) -> None:
+    matrix = sparse.csr_matrix(matrix)
+    matrix.sort_indices()
+    arrays = {
+        "data": matrix.data.astype(dtype),
+        # scipy 가 인덱스를 int32 로 다시 변환(복사)하지 않도록 가능한 경우 int32 로 저장
+        "indices": matrix.indices.astype(np.int32),
+        "indptr": matrix.indptr.astype(np.int32 if matrix.nnz < 2 ** 31 else np.int64)
+    }
+    for part, array in arrays.items():
+        path = os.path.join(state_dir, f"{name}_{part}.npy")
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, array)
+        os.replace(tmp_path, path)
+
+
+def _load_csr(state_dir: str, name: str, shape: Tuple[int, int]) -> sparse.csr_matrix:
+    data, indices, indptr = (np.load(os.path.join(state_dir, f"{name}_{part}.npy"), mmap_mode='r')
+                             for part in _CSR_PARTS)
+    # copy=False: mmap 배열을 그대로 참조 (프로세스별 복사 없음)
+    return sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def export_relation_state(pmi_path: str, state_dir: str = DEFAULT_STATE_DIR) -> Dict:
+    """PMI 파일로 공유 상태를 만들어 저장. manifest 는 마지막에 기록하여 완성된 상태만 읽히게 함"""
+    with open(pmi_path, 'r', encoding='utf-8') as f:
+        pmi_data = json.load(f)
+    keywords = extract_keywords(pmi_data)
+    keyword_to_idx = {kw: idx for idx, kw in enumerate(keywords)}
+    feature_matrix, laplacian = build_relation_matrices(pmi_data, keyword_to_idx)
+
+    os.makedirs(state_dir, exist_ok=True)
+    _save_csr(feature_matrix, state_dir, "feature", np.float64)
+    # L 은 모델 입력 시 float32 로 변환되므로 float32 로 저장
+    _save_csr(laplacian, state_dir, "laplacian", np.float32)
+
+    stat = os.stat(pmi_path)
+    manifest = {
+        "pmi_path": pmi_path,
+        "pmi_size": stat.st_size,
+        "pmi_mtime_ns": stat.st_mtime_ns,
+        "keywords": keywords,
+        "feature_shape": list(feature_matrix.shape),
+        "feature_nnz": int(feature_matrix.nnz),
+        "laplacian_shape": list(laplacian.shape),
+        "laplacian_nnz": int(laplacian.nnz)
+    }
+    manifest_path = os.path.join(state_dir, MANIFEST_FILE)
+    with open(manifest_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    print(f"공유 상태 저장 완료: {state_dir} (키워드 {len(keywords)}개, "
+          f"특징 nnz {feature_matrix.nnz}, L nnz {laplacian.nnz})")
+    return manifest
+
+
+def load_relation_state(state_dir: str = DEFAULT_STATE_DIR) -> RelationState:
+    """내보낸 공유 상태를 mmap 으로 로드"""
+    with open(os.path.join(state_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    pmi_path = manifest["pmi_path"]
+    if os.path.exists(pmi_path) and os.stat(pmi_path).st_mtime_ns != manifest["pmi_mtime_ns"]:
+        print(f"경고: {pmi_path} 가 공유 상태를 만든 뒤 변경되었습니다. 다시 내보내세요.")
+
+    return RelationState(
+        keywords=manifest["keywords"],
+        feature_matrix=_load_csr(state_dir, "feature", tuple(manifest["feature_shape"])),
+        laplacian=_load_csr(state_dir, "laplacian", tuple(manifest["laplacian_shape"])),
+        manifest=manifest
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멀티 워커용 관계 분류 공유 상태 내보내기")
+    parser.add_argument("--pmi", default="data/pairwise_pmi_values3.json")
+    parser.add_argument("--output", default=DEFAULT_STATE_DIR)
+    args = parser.parse_args()
+    export_relation_state(args.pmi, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 # src/term_extractor.py
+from src.pattern_matcher import PatternMatcher
+
 #문장에서 금융 용어만 추출하여 리스트로 반환
-def extract_terms(sentence, article_terms):
-    return [term for term in article_terms if term in sentence]
+#term_matcher 는 호출하는 쪽에서 기사마다 한 번 compile_patterns(article_terms) 로 만들어 문장마다 재사용
+def extract_terms(sentence, term_matcher: PatternMatcher):
+    return term_matcher.matched(sentence)
@@ -0,0 +1,129 @@
+# src/text_stats.py
+# 기사 저장 시 한 번 계산해 두는 본문 통계 (문서 간 PMI 를 본문 재처리 없이 계산하기 위함)
+# - token_count: 공백 기준 토큰 수
+# - positions: 노드별 출현 토큰 위치 (오름차순, 키워드가 여러 토큰이면 시작 위치)
+#   토큰에 키워드가 포함되면 출현으로 본다 (조사가 붙은 "금리가" 도 "금리" 의 출현)
+# - counts: 노드별 출현 횟수 (positions 의 길이. 출현 수와 공출현이 같은 기준이 되도록 함)
+#
+# 공출현 정의는 기존 PKMProcessor 와 같다: 토큰 i 를 중심으로 한 ±window 창에 두 키워드가 모두 있으면 1
+# 위치 p(길이 k 토큰)의 출현은 i ∈ [p+k-1-window, p+window] 인 창에 포함되므로,
+# 키워드별로 이 구간들의 합집합을 만든 뒤 두 합집합의 교집합 길이를 세면 된다 (본문 없이 위치만으로 계산).
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_WINDOW_SIZE = 20
+
+
+def compute_text_stats(content: str, keywords: Iterable[str]) -> Dict:
+    words = (content or "").split()
+    counts: Dict[str, int] = {}
+    positions: Dict[str, List[int]] = {}
+    for keyword in set(keywords):
+        if not keyword:
+            continue
+        span = keyword_span(keyword)
+        if span == 1:
+            positions[keyword] = [index for index, word in enumerate(words) if keyword in word]
+        else:
+            positions[keyword] = [index for index in range(len(words))
+                                  if keyword in ' '.join(words[index:index + span])]
+        counts[keyword] = len(positions[keyword])
+    return {"token_count": len(words), "counts": counts, "positions": positions}
+
+
+def keyword_span(keyword: str) -> int:
+    return max(1, len(keyword.split()))
+
+
+def coverage_intervals(positions: List[int], span: int, token_count: int,
+                       window_size: int = DEFAULT_WINDOW_SIZE) -> List[Tuple[int, int]]:
+    """키워드가 창 안에 들어오는 중심 토큰 i 의 구간들 (겹치는 구간은 합쳐서 반환, 양 끝 포함)"""
+    merged: List[Tuple[int, int]] = []
+    last = token_count - 1
+    for position in positions:
+        start = max(0, position + span - 1 - window_size)
+        end = min(last, position + window_size)
+        if start > end:
+            continue
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intersection_length(intervals1: List[Tuple[int, int]], intervals2: List[Tuple[int, int]]) -> int:
+    """정렬·병합된 두 구간 목록의 교집합 길이 (두 포인터)"""
+    total = 0
+    i = j = 0
+    while i < len(intervals1) and j < len(intervals2):
+        start = max(intervals1[i][0], intervals2[j][0])
+        end = min(intervals1[i][1], intervals2[j][1])
+        if start <= end:
+            total += end - start + 1
+        if intervals1[i][1] < intervals2[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+def co_occurrence_count(stats: Dict, keyword1: str, keyword2: str,
+                        window_size: int = DEFAULT_WINDOW_SIZE) -> int:
+    """저장된 통계로 두 키워드의 창 공출현 수 계산"""
+    positions = stats.get("positions", {})
+    positions1 = positions.get(keyword1)
+    positions2 = positions.get(keyword2)
+    if not positions1 or not positions2:
+        return 0
+    token_count = stats["token_count"]
+    return intersection_length(
+        coverage_intervals(positions1, keyword_span(keyword1), token_count, window_size),
+        coverage_intervals(positions2, keyword_span(keyword2), token_count, window_size)
+    )
+
+
+class PositionalIndex:
+    """
+    여러 문서의 본문 통계로 한 번 만드는 위치 역색인 (키워드 → 문서별 정렬된 위치)
+    - 키워드 출현 수: 문서별 위치 수를 미리 합산
+    - 창 공출현: 두 키워드의 posting 이 모두 있는 문서만 골라 구간 병합 후 교집합 길이 합산
+    문서별 구간 병합 결과는 (키워드, 창 크기) 단위로 재사용한다.
+    """
+
+    def __init__(self, docs_stats: Dict[str, Dict]):
+        self.total_tokens = 0
+        self._token_counts: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._intervals: Dict[Tuple[str, int], Dict[str, List[Tuple[int, int]]]] = {}
+        for doc_id, stats in docs_stats.items():
+            token_count = stats.get("token_count", 0)
+            self.total_tokens += token_count
+            self._token_counts[doc_id] = token_count
+            # 출현 수는 저장된 counts 대신 위치 수로 합산 (이전에 정규식으로 센 counts 가 저장된 문서도 같은 기준)
+            for keyword, positions in stats.get("positions", {}).items():
+                if positions:
+                    self._counts[keyword] = self._counts.get(keyword, 0) + len(positions)
+                    self._postings.setdefault(keyword, {})[doc_id] = positions
+
+    def count(self, keyword: str) -> int:
+        return self._counts.get(keyword, 0)
+
+    def _keyword_intervals(self, keyword: str, window_size: int) -> Dict[str, List[Tuple[int, int]]]:
+        key = (keyword, window_size)
+        intervals = self._intervals.get(key)
+        if intervals is None:
+            span = keyword_span(keyword)
+            intervals = {doc_id: coverage_intervals(positions, span, self._token_counts[doc_id], window_size)
+                         for doc_id, positions in self._postings.get(keyword, {}).items()}
+            self._intervals[key] = intervals
+        return intervals
+
+    def co_occurrence(self, keyword1: str, keyword2: str, window_size: int = DEFAULT_WINDOW_SIZE) -> int:
+        intervals1 = self._keyword_intervals(keyword1, window_size)
+        intervals2 = self._keyword_intervals(keyword2, window_size)
+        if len(intervals1) > len(intervals2):
+            intervals1, intervals2 = intervals2, intervals1
+        return sum(intersection_length(doc_intervals, intervals2[doc_id])
+                   for doc_id, doc_intervals in intervals1.items() if doc_id in intervals2)
@@ -0,0 +1,229 @@
+# src/tfidf_model.py
+# 저장된 기사 코퍼스 전체로 IDF 를 한 번 학습해 두는 TF-IDF 모델
+# 요청 처리 시에는 문서 하나로 fit_transform 하지 않고 transform 만 수행하여
+# 의미 있는 IDF 가중치를 얻는다. 코퍼스가 늘면 오프라인 작업을 다시 실행해 갱신.
+# 학습과 변환은 같은 표현이어야 하므로 모델마다 표현(원문 / 명사열)을 함께 저장한다.
+# - raw  : 원문 그대로 (NLPProcessor)
+# - nouns: Kiwi 명사만 공백으로 이은 텍스트 (KeywordExtractor)
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+DEFAULT_MODEL_PATH = "data/models/tfidf_vectorizer.joblib"
+DEFAULT_NOUN_MODEL_PATH = "data/models/tfidf_noun_vectorizer.joblib"
+
+RAW = "raw"
+NOUNS = "nouns"
+REPRESENTATIONS = (RAW, NOUNS)
+
+
+def extract_nouns(kiwi, text: str) -> List[str]:
+    """Kiwi 형태소 분석 결과의 명사 (NNG: 일반명사, NNP: 고유명사 등)"""
+    tokens = kiwi.analyze(text)[0][0]
+    return [token[0] for token in tokens if token[1].startswith('NN')]
+
+
+def iter_noun_texts(documents: Iterable[str]) -> Iterator[str]:
+    """문서를 명사열 텍스트로 바꿔 순회 (KeywordExtractor 가 transform 하는 표현과 동일)"""
+    from kiwipiepy import Kiwi
+
+    kiwi = Kiwi()
+    for doc in documents:
+        yield ' '.join(extract_nouns(kiwi, doc)) if doc else doc
+
+
+def create_vectorizer(max_features: int = 50000, min_df: int = 2) -> TfidfVectorizer:
+    """서비스와 같은 토큰 규칙을 쓰는 코퍼스용 벡터라이저"""
+    return TfidfVectorizer(
+        min_df=min_df,
+        max_features=max_features,
+        token_pattern=r'(?u)\b\w+\b'
+    )
+
+
+def fit_tfidf_model(documents: Iterable[str], output_path: str = DEFAULT_MODEL_PATH,
+                    max_features: int = 50000, min_df: int = 2,
+                    representation: str = RAW) -> TfidfVectorizer:
+    """
+    코퍼스로 IDF 를 학습하고 저장
+
+    documents 는 원문이며 한 번만 순회하므로 제너레이터로 스트리밍해도 된다.
+    representation 이 nouns 이면 명사열로 바꿔 학습한다.
+    임시 파일에 저장한 뒤 교체하므로 서비스 중인 프로세스는 갱신된 파일을 다시 로드한다.
+    """
+    counter = {"documents": 0}
+
+    def counted(docs: Iterable[str]) -> Iterator[str]:
+        for doc in docs:
+            if doc:
+                counter["documents"] += 1
+                yield doc
+
+    if representation not in REPRESENTATIONS:
+        raise ValueError(f"알 수 없는 표현입니다: {representation}")
+    if representation == NOUNS:
+        documents = iter_noun_texts(documents)
+
+    vectorizer = create_vectorizer(max_features=max_features, min_df=min_df)
+    vectorizer.fit(counted(documents))
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    joblib.dump({
+        "vectorizer": vectorizer,
+        "n_documents": counter["documents"],
+        "representation": representation,
+        "fitted_at": datetime.datetime.utcnow().isoformat()
+    }, tmp_path)
+    os.replace(tmp_path, output_path)
+    print(f"TF-IDF 모델 저장 완료: {output_path} "
+          f"({representation}, 문서 {counter['documents']}개, 어휘 {len(vectorizer.vocabulary_)}개)")
+    return vectorizer
+
+
+class TfidfModel:
+    """학습된 TF-IDF 모델 (transform 만 수행, 파일이 갱신되면 자동으로 다시 로드)"""
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, reload_interval: float = 60.0):
+        self.model_path = model_path
+        self.reload_interval = reload_interval
+        self.n_documents = 0
+        self.representation = RAW
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._vectorizer: Optional[TfidfVectorizer] = None
+        self._feature_names = None
+        self.reload()
+
+    @classmethod
+    def load(cls, model_path: str = DEFAULT_MODEL_PATH, representation: str = RAW) -> Optional["TfidfModel"]:
+        """
+        저장된 모델 로드. 없거나 학습한 표현이 representation 과 다르면
+        None 을 반환하여 문서 단위 fit_transform 으로 대체
+        """
+        if not os.path.exists(model_path):
+            print(f"TF-IDF 모델이 없습니다: {model_path} (문서 단위 계산으로 대체)")
+            return None
+        model = cls(model_path)
+        if model.representation != representation:
+            print(f"TF-IDF 모델 표현이 다릅니다: {model_path} ({model.representation}, 필요: {representation}) "
+                  f"(문서 단위 계산으로 대체)")
+            return None
+        return model
+
+    def reload(self) -> None:
+        with self._lock:
+            mtime = os.path.getmtime(self.model_path)
+            saved = joblib.load(self.model_path)
+            vectorizer = saved["vectorizer"]
+            self._vectorizer, self._feature_names = vectorizer, vectorizer.get_feature_names_out()
+            self.n_documents = saved.get("n_documents", 0)
+            # 표현을 저장하기 전의 모델은 원문으로 학습됨
+            self.representation = saved.get("representation", RAW)
+            self._mtime = mtime
+            self._last_check = time.monotonic()
+            print(f"TF-IDF 모델 로드: {self.representation}, 문서 {self.n_documents}개, "
+                  f"어휘 {len(self._feature_names)}개")
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            if os.path.getmtime(self.model_path) != self._mtime:
+                self.reload()
+        except OSError:
+            pass
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """문서에 등장한 단어의 TF-IDF 점수 (0 이 아닌 항목만, text 는 모델과 같은 표현)"""
+        self._maybe_reload()
+        vectorizer, feature_names = self._vectorizer, self._feature_names
+        row = vectorizer.transform([text])
+        return {feature_names[idx]: float(value) for idx, value in zip(row.indices, row.data)}
+
+
+def iter_documents_from_json(path: str) -> Iterator[str]:
+    """기사 JSON (리스트 또는 딕셔너리) 에서 본문 텍스트를 순회"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    articles = data.values() if isinstance(data, dict) else data
+    for article in articles:
+        if isinstance(article, str):
+            yield article
+        elif isinstance(article, dict):
+            yield article.get("content") or article.get("contents") or ""
+
+
+def iter_documents_from_db(buffer_size: int = 100) -> Iterator[str]:
+    """
+    MongoDB 에 저장된 기사 본문을 커서로 읽으며 하나씩 반환 (본문 필드만 조회)
+    커서는 별도 스레드의 이벤트 루프에서 읽고, 크기가 제한된 큐로 넘겨 벡터라이저가 읽는 만큼만 가져온다.
+    """
+    from database import Database
+
+    documents: "queue.Queue" = queue.Queue(maxsize=buffer_size)
+    done = object()
+
+    async def produce():
+        await Database.connect_db()
+        try:
+            async for article in Database.iter_articles({"content": 1}, batch_size=buffer_size):
+                documents.put(article.get("content", ""))
+        finally:
+            await Database.close_db()
+
+    def run():
+        try:
+            asyncio.run(produce())
+        except Exception as e:
+            documents.put(e)
+        finally:
+            documents.put(done)
+
+    threading.Thread(target=run, name="tfidf-db-reader", daemon=True).start()
+    while True:
+        item = documents.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def main():
+    parser = argparse.ArgumentParser(description="코퍼스 TF-IDF 모델 학습")
+    parser.add_argument("--source", choices=["db", "json"], default="db")
+    parser.add_argument("--input", help="--source json 일 때 기사 JSON 경로")
+    parser.add_argument("--representation", choices=REPRESENTATIONS, default=RAW,
+                        help="raw: 원문 (NLPProcessor), nouns: 명사열 (KeywordExtractor)")
+    parser.add_argument("--output", help=f"기본값: {DEFAULT_MODEL_PATH} / {DEFAULT_NOUN_MODEL_PATH}")
+    parser.add_argument("--max-features", type=int, default=50000)
+    parser.add_argument("--min-df", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.source == "json":
+        if not args.input:
+            parser.error("--source json 에는 --input 이 필요합니다")
+        documents = iter_documents_from_json(args.input)
+    else:
+        documents = iter_documents_from_db()
+
+    output = args.output or (DEFAULT_NOUN_MODEL_PATH if args.representation == NOUNS else DEFAULT_MODEL_PATH)
+    fit_tfidf_model(documents, output, max_features=args.max_features, min_df=args.min_df,
+                    representation=args.representation)
+
+
+if __name__ == "__main__":
+    main()
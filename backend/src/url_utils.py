@@ -0,0 +1,48 @@
+# src/url_utils.py
+# 캐시/중복 제거용 URL 정규화와 해시
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 같은 기사를 가리키지만 유입 경로만 다른 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {"fbclid", "gclid", "ref", "sns", "cmpid"}
+_TRACKING_PREFIXES = ("utm_",)
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in _TRACKING_PARAMS or name.startswith(_TRACKING_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """
+    같은 기사 URL 을 하나의 문자열로 정규화
+    - 스킴/호스트 소문자화, 기본 포트·프래그먼트 제거
+    - 추적용 쿼리 파라미터 제거 후 정렬 (기사 id 같은 파라미터는 유지)
+    - 경로 끝의 / 제거
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = "https://" + url
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _is_tracking_param(name)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def url_hash(url: str) -> str:
+    """정규화된 URL 의 sha256"""
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def content_hash(content: str) -> str:
+    """본문 텍스트의 sha256 (앞뒤 공백은 무시)"""
+    return hashlib.sha256((content or "").strip().encode("utf-8")).hexdigest()
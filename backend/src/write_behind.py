@@ -0,0 +1,138 @@
+# src/write_behind.py
+# 쓰기 지연 버퍼 (write-behind)
+# - put() 은 항목을 메모리에 넣고 바로 반환 (요청은 DB 왕복을 기다리지 않음)
+# - 백그라운드 태스크가 max_batch 개가 모이거나 max_delay 초가 지나면 flush_fn 으로 한 번에 기록
+# - 실패한 묶음은 지수 백오프로 재시도하고, 그래도 실패하면 버퍼 앞쪽에 되돌려 다음 주기에 다시 시도
+# - close() 는 남은 항목을 모두 기록한 뒤 종료 (서버 종료 시 호출)
+# - 기록 중인 묶음은 버퍼에서 빠져 있으므로, 삭제 전에 wait_written() 으로 기록이 끝나기를 기다림
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+class WriteBehindBuffer:
+    """항목을 모아 flush_fn(list) 로 묶음 기록하는 비동기 버퍼"""
+
+    def __init__(self,
+                 flush_fn: Callable[[List[Any]], Awaitable[Any]],
+                 max_batch: int = 50,
+                 max_delay: float = 0.2,
+                 max_pending: int = 1000,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 5.0):
+        if max_batch < 1:
+            raise ValueError("max_batch 는 1 이상이어야 합니다")
+        self.flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._items: List[Any] = []
+        # flush_fn 으로 기록 중인 묶음
+        self._in_flight: List[Any] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._closed = False
+        self._stats = {"queued": 0, "written": 0, "batches": 0, "retries": 0, "failed_batches": 0,
+                       "removed": 0, "max_batch_ms": 0.0}
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(self, item: Any) -> None:
+        if self._closed:
+            raise RuntimeError("이미 종료된 버퍼입니다")
+        self._items.append(item)
+        self._stats["queued"] += 1
+        if len(self._items) >= self.max_batch:
+            self._wakeup.set()
+        # DB 장애로 항목이 계속 쌓이면 요청 쪽에서 기록을 기다리게 해 메모리 사용을 제한
+        # 기록에 실패해도 항목은 버퍼에 남아 다음 주기에 재시도되므로 요청은 실패로 돌려주지 않음
+        if len(self._items) >= self.max_pending:
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[쓰기 버퍼] 대기 항목 {len(self._items)}건 기록 실패, 다음 주기에 재시도: {e}")
+
+    def remove(self, predicate: Callable[[Any], bool]) -> int:
+        """아직 기록되지 않은 항목 중 조건에 맞는 것을 버림 (기록 전에 삭제된 경우)"""
+        kept = [item for item in self._items if not predicate(item)]
+        removed = len(self._items) - len(kept)
+        self._items[:] = kept
+        self._stats["removed"] += removed
+        return removed
+
+    async def wait_written(self, predicate: Callable[[Any], bool]) -> None:
+        """
+        조건에 맞는 항목이 기록 중이면 그 flush 가 끝날 때까지 기다림
+        기록에 실패한 묶음은 버퍼로 되돌아오므로, 기다린 뒤 remove() 로 다시 확인해야 함
+        """
+        if any(predicate(item) for item in self._in_flight):
+            async with self._flush_lock:
+                pass
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[쓰기 버퍼] 기록 실패, 다음 주기에 재시도: {e}")
+
+    async def flush(self) -> None:
+        """버퍼의 항목을 max_batch 개씩 기록. 재시도 후에도 실패한 묶음은 되돌려 놓고 예외를 올림"""
+        async with self._flush_lock:
+            while self._items:
+                batch = self._items[:self.max_batch]
+                del self._items[:len(batch)]
+                self._in_flight = batch
+                try:
+                    await self._write(batch)
+                except Exception:
+                    self._items[:0] = batch
+                    self._stats["failed_batches"] += 1
+                    raise
+                finally:
+                    self._in_flight = []
+
+    async def _write(self, batch: List[Any]) -> None:
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                await self.flush_fn(batch)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                self._stats["retries"] += 1
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                print(f"[쓰기 버퍼] {len(batch)}건 기록 실패, {delay:.1f}초 후 재시도: {e}")
+                await asyncio.sleep(delay)
+                continue
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["max_batch_ms"] = max(self._stats["max_batch_ms"],
+                                              round((time.perf_counter() - started) * 1000, 1))
+            return
+
+    async def close(self) -> None:
+        """백그라운드 태스크를 멈추고 남은 항목을 기록"""
+        self._closed = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats, pending=len(self._items), max_batch=self.max_batch,
+                    max_delay_ms=round(self.max_delay * 1000, 1))
@@ -0,0 +1,90 @@
+# tests/test_article_saved_hooks.py
+# 기사 저장 후 훅: 기록이 끝난 뒤 저장된 id(같은 URL 재저장 시 기존 문서 id)와 기록한 문서로 호출되는지 확인
+import asyncio
+import datetime
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from database import Database
+
+URL = "https://n.news.naver.com/mnews/article/015/0005066001"
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    database = AsyncMongoMockClient()["articles_db"]
+    monkeypatch.setattr(Database, "client", database.client)
+    monkeypatch.setattr(Database, "article_collection", database["articles"])
+    monkeypatch.setattr(Database, "cross_edge_collection", database["cross_edges"])
+    monkeypatch.setattr(Database, "connected", True)
+    monkeypatch.setattr(Database, "write_buffer", None)
+    monkeypatch.setattr(Database, "_id_aliases", {})
+    calls = []
+    monkeypatch.setattr(Database, "article_saved_hooks", [lambda article_id, article: calls.append((article_id, article))])
+    monkeypatch.setattr(Database, "article_deleted_hooks", [lambda article_id: calls.append((article_id, None))])
+    return calls
+
+
+def article_data(content, url=URL):
+    return {"title": "기준금리 인하", "date": "2024.11.28", "url": url, "content": content,
+            "hypergraph_data": {"nodes": [{"id": "금리", "importance": 0.9}], "edges": []}}
+
+
+def test_hook_receives_stored_id_and_text_stats(saved):
+    async def run():
+        first = await Database.save_article(article_data("금리 인하"))
+        second = await Database.save_article(article_data("금리 금리 동결"))
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert [article_id for article_id, _ in saved] == [first, first]
+    assert saved[1][1]["text_stats"]["counts"] == {"금리": 2}
+
+
+def test_write_behind_hook_runs_after_flush_with_existing_id(saved):
+    async def run():
+        existing = await Database.save_article(article_data("금리 인하"))
+        Database.enable_write_behind(max_batch=10, max_delay=60)
+        try:
+            client_id = await Database.save_article(article_data("금리 동결"))
+            calls_before_flush = len(saved)
+            await Database.write_buffer.flush()
+            # mongomock 은 unordered bulk_write 의 upserted 인덱스를 잘못 돌려주므로 새 기사는 따로 기록
+            other_id = await Database.save_article(article_data("환율", url="https://www.hankyung.com/article/1"))
+            await Database.write_buffer.flush()
+        finally:
+            await Database.write_buffer.close()
+            Database.write_buffer = None
+        return existing, client_id, other_id, calls_before_flush
+
+    existing, client_id, other_id, calls_before_flush = asyncio.run(run())
+    assert calls_before_flush == 1
+    # 재저장은 새로 만든 클라이언트 id 가 아니라 기존 문서 id 로 연결해야 함
+    assert client_id != existing
+    assert Database.resolve_article_id(client_id) == existing
+    assert [article_id for article_id, _ in saved[1:]] == [existing, other_id]
+    assert saved[1][1]["content"] == "금리 동결"
+
+
+def test_delete_hook_and_incremental_link_candidates(saved):
+    async def run():
+        first = await Database.save_article(article_data("금리 인하"))
+        # Mongo 는 시각을 밀리초 단위로 저장하므로 같은 밀리초에 들지 않도록 띄움
+        await asyncio.sleep(0.01)
+        since = datetime.datetime.utcnow()
+        second = await Database.save_article(article_data("환율 상승", url="https://www.hankyung.com/article/1"))
+        recent = await Database.get_link_candidates(since=since)
+        selected = await Database.get_link_candidates(ids=[first])
+        deleted = await Database.delete_article(second)
+        existing = await Database.get_existing_article_ids([first, second])
+        return first, second, recent, selected, deleted, existing
+
+    first, second, recent, selected, deleted, existing = asyncio.run(run())
+    assert [article["_id"] for article in recent] == [second]
+    assert [article["_id"] for article in selected] == [first]
+    assert deleted
+    # 삭제 훅은 DB 에서 지운 뒤 한 번만 호출
+    assert saved[-1] == (second, None)
+    assert existing == [first]
@@ -0,0 +1,198 @@
+# tests/test_async_fetcher.py
+# AsyncFetcher 시간 제한 / 재시도 / 실패 처리 / 호스트별 동시성 제한 테스트
+# - 시간 제한: 127.0.0.1 의 로컬 http.server (응답 전에 대기) 와 닫힌 포트
+# - 재시도·동시성: httpx.MockTransport
+import asyncio
+import http.server
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+
+from src import async_fetcher
+from src.async_fetcher import AsyncFetcher, FetchError
+
+
+class SlowHandler(http.server.BaseHTTPRequestHandler):
+    delay = 1.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = b"late"
+        try:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """백오프 대기 시간을 기록하고 실제로는 기다리지 않음"""
+    recorded = []
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(async_fetcher.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def fetch(fetcher: AsyncFetcher, url: str) -> httpx.Response:
+    async def run():
+        try:
+            return await fetcher.get(url)
+        finally:
+            await fetcher.aclose()
+    return asyncio.run(run())
+
+
+def mock_fetcher(handler, **kwargs) -> AsyncFetcher:
+    return AsyncFetcher(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_read_timeout_is_retried_then_fails(slow_server):
+    fetcher = AsyncFetcher(read_timeout=0.2, max_retries=1, backoff_base=0.01)
+    started = time.perf_counter()
+    with pytest.raises(FetchError, match="after 2 attempts: ReadTimeout"):
+        fetch(fetcher, slow_server)
+    assert time.perf_counter() - started < SlowHandler.delay * 2
+    assert fetcher.stats()["requests"] == 2
+    assert fetcher.stats()["retries"] == 1
+    assert fetcher.stats()["failures"] == 1
+
+
+def test_connection_refused_is_retried(closed_port_url, sleeps):
+    fetcher = AsyncFetcher(connect_timeout=0.5, max_retries=2)
+    with pytest.raises(FetchError, match="after 3 attempts"):
+        fetch(fetcher, closed_port_url)
+    assert fetcher.stats()["requests"] == 3
+    assert len(sleeps) == 2
+
+
+def test_connect_timeout_is_retried(sleeps):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url)
+        if len(attempts) == 1:
+            raise httpx.ConnectTimeout("connect timed out", request=request)
+        return httpx.Response(200, text="ok")
+
+    fetcher = mock_fetcher(handler, max_retries=2)
+    response = fetch(fetcher, "http://news.example/a")
+    assert response.text == "ok"
+    assert len(attempts) == 2
+    assert fetcher.stats()["retries"] == 1
+
+
+def test_5xx_retries_with_jittered_exponential_backoff(sleeps, monkeypatch):
+    statuses = iter([503, 502, 500, 200])
+    monkeypatch.setattr(async_fetcher.random, "uniform", lambda low, high: high * 0.5)
+
+    fetcher = mock_fetcher(lambda request: httpx.Response(next(statuses), text="body"),
+                           max_retries=3, backoff_base=0.5, backoff_max=1.5)
+    response = fetch(fetcher, "http://news.example/a")
+    assert response.status_code == 200
+    # full jitter: uniform(0, min(backoff_max, base * 2^attempt)) → 절반 값으로 고정
+    assert sleeps == [0.25, 0.5, 0.75]
+    assert fetcher.stats()["retries"] == 3
+    assert fetcher.stats()["bytes"] == len(b"body")
+
+
+def test_backoff_jitter_stays_within_bounds():
+    fetcher = AsyncFetcher(backoff_base=0.5, backoff_max=2.0)
+    for attempt in range(5):
+        delays = [fetcher._backoff(attempt) for _ in range(200)]
+        cap = min(2.0, 0.5 * (2 ** attempt))
+        assert all(0 <= delay <= cap for delay in delays)
+        assert len(set(delays)) > 1
+    asyncio.run(fetcher.aclose())
+
+
+def test_retry_after_header_is_honored(sleeps):
+    statuses = iter([429, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, headers={"Retry-After": "3"} if status == 429 else {})
+
+    fetch(mock_fetcher(handler, max_retries=1, backoff_max=8.0), "http://news.example/a")
+    assert sleeps == [3.0]
+
+
+def test_5xx_exhausts_retries(sleeps):
+    fetcher = mock_fetcher(lambda request: httpx.Response(500), max_retries=2)
+    with pytest.raises(FetchError, match="after 3 attempts: HTTP 500"):
+        fetch(fetcher, "http://news.example/a")
+    assert fetcher.stats()["failures"] == 1
+
+
+@pytest.mark.parametrize("status", [400, 403, 404, 410])
+def test_4xx_fails_fast_without_retry(status, sleeps):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(status)
+
+    fetcher = mock_fetcher(handler, max_retries=3)
+    with pytest.raises(FetchError, match=f"HTTP {status}"):
+        fetch(fetcher, "http://news.example/a")
+    assert len(attempts) == 1
+    assert sleeps == []
+    assert fetcher.stats()["retries"] == 0
+
+
+def test_per_host_concurrency_limit():
+    in_flight = {}
+    peak = {}
+
+    async def handler(request):
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.02)
+        in_flight[host] -= 1
+        return httpx.Response(200)
+
+    async def run():
+        fetcher = mock_fetcher(handler, per_host_limit=2)
+        try:
+            urls = [f"http://a.example/{index}" for index in range(8)]
+            urls += [f"http://b.example/{index}" for index in range(3)]
+            await asyncio.gather(*(fetcher.get(url) for url in urls))
+            return fetcher.stats()
+        finally:
+            await fetcher.aclose()
+
+    stats = asyncio.run(run())
+    assert peak == {"a.example": 2, "b.example": 2}
+    assert stats["hosts"] == 2
+    assert stats["requests"] == 11
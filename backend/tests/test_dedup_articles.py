@@ -0,0 +1,99 @@
+# tests/test_dedup_articles.py
+# URL 중복 기사 정리 마이그레이션 (mongomock-motor 컬렉션 사용)
+import asyncio
+import datetime
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import DuplicateKeyError
+
+from database import Database
+from src.dedup_articles import dedup_articles
+from src.url_utils import url_hash
+
+URL = "https://n.news.naver.com/mnews/article/015/0005066001"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = AsyncMongoMockClient()["articles_db"]
+    monkeypatch.setattr(Database, "client", database.client)
+    monkeypatch.setattr(Database, "article_collection", database["articles"])
+    monkeypatch.setattr(Database, "cache_collection", database["analysis_cache"])
+    monkeypatch.setattr(Database, "cross_edge_collection", database["cross_edges"])
+    monkeypatch.setattr(Database, "connected", True)
+    return database
+
+
+def article(url, day, **fields):
+    return dict({"_id": ObjectId(), "url": url, "title": f"{url} {day}",
+                 "created_at": datetime.datetime(2024, 11, day)}, **fields)
+
+
+def seed(db):
+    """같은 기사 URL 의 변형 3건(추적 파라미터 / 끝 슬래시) + 중복 없는 기사 1건 + url 없는 문서 1건"""
+    duplicates = [article(URL, 1), article(URL + "?utm_source=kakao", 3), article(URL + "/", 2)]
+    unique = article("https://www.hankyung.com/article/2024112800001", 1)
+    no_url = {"_id": ObjectId(), "title": "메모"}
+    asyncio.run(db["articles"].insert_many(duplicates + [unique, no_url]))
+    return duplicates, unique, no_url
+
+
+def test_dedup_keeps_newest_and_fills_url_hash(db):
+    duplicates, unique, no_url = seed(db)
+
+    summary = asyncio.run(dedup_articles(db["articles"]))
+    assert summary == {"scanned": 5, "deleted": 2, "hash_updated": 2, "cross_edges_deleted": 0}
+
+    remaining = {doc["_id"]: doc for doc in asyncio.run(db["articles"].find({}).to_list(None))}
+    # 가장 늦게 저장된(created_at 이 가장 큰) 문서만 남음
+    assert set(remaining) == {duplicates[1]["_id"], unique["_id"], no_url["_id"]}
+    assert remaining[duplicates[1]["_id"]]["url_hash"] == url_hash(URL)
+    assert remaining[unique["_id"]]["url_hash"] == url_hash(unique["url"])
+    assert "url_hash" not in remaining[no_url["_id"]]
+
+
+def test_dry_run_changes_nothing(db):
+    seed(db)
+    summary = asyncio.run(dedup_articles(db["articles"], dry_run=True))
+    assert summary["deleted"] == 2
+    assert asyncio.run(db["articles"].count_documents({})) == 5
+    assert asyncio.run(db["articles"].count_documents({"url_hash": {"$exists": True}})) == 0
+
+
+def test_ensure_indexes_after_dedup_creates_unique_url_hash_index(db):
+    seed(db)
+    asyncio.run(dedup_articles(db["articles"]))
+    asyncio.run(Database.ensure_indexes())
+
+    indexes = asyncio.run(db["articles"].index_information())
+    assert indexes["url_hash_unique"]["unique"] is True
+    assert indexes["url_hash_unique"]["key"] == [("url_hash", 1)]
+    with pytest.raises(DuplicateKeyError):
+        asyncio.run(db["articles"].insert_one(article(URL + "#comments", 5, url_hash=url_hash(URL))))
+
+
+def test_second_run_is_a_no_op(db):
+    seed(db)
+    asyncio.run(dedup_articles(db["articles"]))
+    before = asyncio.run(db["articles"].find({}).to_list(None))
+
+    summary = asyncio.run(dedup_articles(db["articles"]))
+    assert summary == {"scanned": 3, "deleted": 0, "hash_updated": 0, "cross_edges_deleted": 0}
+    assert asyncio.run(db["articles"].find({}).to_list(None)) == before
+
+
+def test_dedup_deletes_cross_edges_of_removed_articles(db):
+    duplicates, unique, _ = seed(db)
+    kept, removed = str(duplicates[1]["_id"]), [str(duplicates[0]["_id"]), str(duplicates[2]["_id"])]
+    asyncio.run(db["cross_edges"].insert_many([
+        {"source_doc": removed[0], "target_doc": str(unique["_id"]), "nodes": ["금리", "환율"]},
+        {"source_doc": str(unique["_id"]), "target_doc": removed[1], "nodes": ["금리", "물가"]},
+        {"source_doc": kept, "target_doc": str(unique["_id"]), "nodes": ["금리", "채권"]},
+    ]))
+
+    summary = asyncio.run(dedup_articles(db["articles"], cross_edge_collection=db["cross_edges"]))
+    assert summary["cross_edges_deleted"] == 2
+    remaining = asyncio.run(db["cross_edges"].find({}, {"_id": 0}).to_list(None))
+    assert [(edge["source_doc"], edge["target_doc"]) for edge in remaining] == [(kept, str(unique["_id"]))]
@@ -0,0 +1,32 @@
+# tests/test_parse_benchmark.py
+# 저장된 기사 페이지에서 제한 파싱(SoupStrainer) 결과가 전체 파싱 결과와 같은지 확인
+import os
+
+import pytest
+
+from src.fetch_content import SITE_STRAINERS, parse_content
+from src.parse_benchmark import load_fixtures, parse_full, parse_restricted
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "html_fixtures")
+FIXTURES = load_fixtures(FIXTURES_DIR)
+
+
+def test_every_site_has_a_fixture():
+    assert {domain for domain, _, _ in FIXTURES} == set(SITE_STRAINERS)
+
+
+@pytest.mark.parametrize("domain,file_name,html", FIXTURES, ids=[f"{d}/{f}" for d, f, _ in FIXTURES])
+def test_restricted_parse_matches_full_parse(domain, file_name, html):
+    url = f"https://{domain}/{file_name}"
+    expected = parse_full(html, domain, url)
+    assert not expected["content"].startswith("No content found")
+    assert expected["title"] != "No title found."
+    assert expected["date"] != "No date found."
+    assert parse_restricted(html, domain, url) == expected
+    assert parse_content(html, url) == expected
+
+
+def test_missing_fixtures_fail_loudly(tmp_path):
+    (tmp_path / "naver.com").mkdir()
+    with pytest.raises(FileNotFoundError, match="naver.com"):
+        load_fixtures(str(tmp_path))
@@ -0,0 +1,110 @@
+# tests/test_pkm_processor.py
+# 문서 간 엣지: 전체 재구성(find_all_edges)과 저장 시 연결(link_article)이 같은 규칙을 따르는지 확인
+import pytest
+
+from src.link_recall_check import ConstantRelationClassifier, build_library
+from src.link_candidates import CorpusLinkIndex
+from src.pkm_processor import PKMProcessor
+from src.text_stats import compute_text_stats
+
+
+def edge_keys(edges):
+    return sorted((edge["source_doc"], edge["target_doc"], tuple(edge["nodes"])) for edge in edges)
+
+
+def article(doc_id, keywords, content):
+    nodes = [{"id": keyword, "importance": 1.0 - index * 0.1} for index, keyword in enumerate(keywords)]
+    return {"_id": doc_id, "hypergraph_data": {"nodes": nodes, "edges": []},
+            "text_stats": compute_text_stats(content, keywords)}
+
+
+@pytest.mark.parametrize("use_candidates", [False, True])
+def test_rebuild_matches_linking_each_article_in_save_order(use_candidates):
+    articles = build_library(num_docs=40, num_topics=4, topic_vocab=15, shared_vocab=10, seed=3)
+    processor = PKMProcessor(ConstantRelationClassifier(), use_candidates=use_candidates)
+
+    linked = 0
+    for position in range(1, len(articles)):
+        corpus = articles[:position + 1]
+        target = corpus[-1]["_id"]
+        # 같은 문서 집합이면 PMI 통계와 후보 색인이 같으므로 마지막 문서에 닿는 엣지는 같아야 함
+        rebuilt = [edge for edge in processor.find_all_edges(corpus) if edge["target_doc"] == target]
+        incremental = processor.link_article(corpus[-1], corpus[:-1])
+        assert edge_keys(rebuilt) == edge_keys(incremental)
+        linked += len(incremental)
+    assert linked > 0
+
+
+def test_node_pair_can_link_a_later_article_again():
+    # 세 문서가 같은 주요 노드를 가지면 저장 시 연결은 B→A, C→A 를 모두 만든다 (재구성도 같아야 함)
+    content = "금리 환율 " * 5 + "물가 " * 30
+    articles = [article(doc_id, ["금리", "환율"], content) for doc_id in ("a", "b", "c")]
+    articles.append(article("d", ["물가"], "물가 " * 40 + "채권 " * 40))
+
+    edges = PKMProcessor(ConstantRelationClassifier()).find_all_edges(articles)
+    assert ("a", "b") in {(edge["source_doc"], edge["target_doc"]) for edge in edges}
+    assert ("a", "c") in {(edge["source_doc"], edge["target_doc"]) for edge in edges}
+
+
+@pytest.mark.parametrize("particle_rate", [0.0, 0.3, 0.9])
+def test_candidate_edges_equal_exhaustive_edges(particle_rate):
+    # 조사가 붙은 출현(출현 수 0 이던 경우 포함)에서도 후보 비교가 전체 비교와 같은 엣지를 찾아야 함
+    articles = build_library(num_docs=200, num_topics=20, topic_vocab=20, shared_vocab=20, seed=11,
+                             particle_rate=particle_rate)
+    exhaustive = PKMProcessor(ConstantRelationClassifier(), use_candidates=False).find_all_edges(articles)
+    candidate = PKMProcessor(ConstantRelationClassifier(), use_candidates=True).find_all_edges(articles)
+    assert len(exhaustive) > 0
+    assert edge_keys(candidate) == edge_keys(exhaustive)
+
+
+def test_pair_without_window_co_occurrence_is_not_linked():
+    # 두 키워드가 창(±20 토큰) 안에서 함께 나온 적이 없으면 출현 수가 적어도 연결하지 않음
+    far = "금리가 " + "단어 " * 60 + "환율이"
+    articles = [article("a", ["금리"], far), article("b", ["환율"], far)]
+    processor = PKMProcessor(ConstantRelationClassifier(), use_candidates=False)
+    assert processor.find_all_edges(articles) == []
+
+
+def link_with_corpus_index(processor, corpus, docs_by_id, doc):
+    """저장 시 연결 경로: 색인에서 후보 / 근거 문서를 고르고 근거 문서의 본문 통계만 사용"""
+    doc_id = doc["_id"]
+    evidence_ids = corpus.evidence_docs(doc_id, corpus.candidates(doc_id))
+    return processor.link_indexed_article(doc, corpus, [docs_by_id[other_id] for other_id in evidence_ids])
+
+
+def test_indexed_linking_matches_full_corpus_linking():
+    articles = build_library(num_docs=80, num_topics=6, topic_vocab=15, shared_vocab=10, seed=5, particle_rate=0.3)
+    docs_by_id = {doc["_id"]: doc for doc in articles}
+    processor = PKMProcessor(ConstantRelationClassifier())
+    corpus = CorpusLinkIndex()
+
+    linked = 0
+    for position, doc in enumerate(articles):
+        PKMProcessor.index_article(corpus, doc)
+        incremental = link_with_corpus_index(processor, corpus, docs_by_id, doc)
+        assert edge_keys(incremental) == edge_keys(processor.link_article(doc, articles[:position]))
+        linked += len(incremental)
+    assert linked > 0
+
+    # 삭제 후에는 남은 문서만으로 계산한 결과와 같아야 함 (출현 수 / 토큰 수 합계도 갱신)
+    removed = articles[10:30]
+    for doc in removed:
+        assert corpus.remove(doc["_id"])
+    remaining = [doc for doc in articles if doc not in removed]
+    assert len(corpus) == len(remaining)
+    assert corpus.total_tokens == sum(doc["text_stats"]["token_count"] for doc in remaining)
+    for doc in remaining[-10:]:
+        others = [other for other in remaining if other is not doc]
+        assert edge_keys(link_with_corpus_index(processor, corpus, docs_by_id, doc)) == \
+            edge_keys(processor.link_article(doc, others))
+
+
+def test_re_adding_a_document_keeps_its_save_order():
+    corpus = CorpusLinkIndex()
+    for doc_id in ("a", "b", "c"):
+        corpus.add(doc_id, ["금리"], ["금리", "환율"], compute_text_stats("금리 환율", ["금리", "환율"]))
+    corpus.add("a", ["금리"], ["금리", "물가"], compute_text_stats("금리 물가 물가", ["금리", "물가"]))
+    assert corpus.candidates("c") == ["a", "b"]
+    assert corpus.count("환율") == 2
+    assert corpus.count("물가") == 2
+    assert corpus.total_tokens == 7
@@ -0,0 +1,47 @@
+# tests/test_text_stats.py
+# 저장용 본문 통계: 출현 수와 위치가 같은 기준인지, 위치 역색인의 공출현이 창 단위 계산과 같은지 확인
+from src.text_stats import PositionalIndex, co_occurrence_count, compute_text_stats
+
+
+def window_co_occurrence(content, keyword1, keyword2, window_size=20):
+    """기존 방식: 토큰마다 ±window 창 문자열에 두 키워드가 모두 있으면 1"""
+    words = content.split()
+    total = 0
+    for index in range(len(words)):
+        window = ' '.join(words[max(0, index - window_size):index + window_size + 1])
+        if keyword1 in window and keyword2 in window:
+            total += 1
+    return total
+
+
+def test_particle_attached_keyword_is_counted():
+    content = "한국은행은 기준금리를 내렸다. 금리가 내려가면 환율이 오를 수 있다. 금리 인하"
+    stats = compute_text_stats(content, ["금리", "환율"])
+    assert stats["positions"]["금리"] == [1, 3, 9]
+    assert stats["counts"] == {"금리": 3, "환율": 1}
+
+
+def test_counts_match_positions():
+    content = "금리가 오르고 금리는 다시 금리 동결 환율의 변동 환율 금리의"
+    stats = compute_text_stats(content, ["금리", "환율", "물가", "금리 동결"])
+    assert stats["counts"] == {keyword: len(positions) for keyword, positions in stats["positions"].items()}
+    assert stats["counts"]["물가"] == 0
+    assert stats["counts"]["금리 동결"] == 1
+
+
+def test_index_counts_ignore_stored_regex_counts():
+    # 이전 방식(\\b금리\\b 정규식)으로 저장된 counts 는 조사가 붙은 출현을 세지 않음
+    stats = compute_text_stats("금리가 오르면 환율이 내린다", ["금리", "환율"])
+    legacy = dict(stats, counts={"금리": 0, "환율": 0})
+    index = PositionalIndex({"a": legacy, "b": stats})
+    assert index.count("금리") == 2
+    assert index.count("환율") == 2
+
+
+def test_co_occurrence_matches_window_scan():
+    content = " ".join(["금리가"] + ["단어"] * 30 + ["환율이", "단어", "금리"] + ["단어"] * 40 + ["환율"])
+    stats = compute_text_stats(content, ["금리", "환율"])
+    expected = window_co_occurrence(content, "금리", "환율")
+    assert expected > 0
+    assert co_occurrence_count(stats, "금리", "환율") == expected
+    assert PositionalIndex({"a": stats}).co_occurrence("금리", "환율") == expected
@@ -0,0 +1,94 @@
+# tests/test_write_behind.py
+# 쓰기 지연 버퍼: 기록 중인 기사를 삭제해도 뒤늦은 기록으로 되살아나지 않는지,
+# 대기 한도에서 기록이 실패해도 put 이 항목을 남긴 채 정상 반환하는지 확인
+import asyncio
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from database import Database
+from src.write_behind import WriteBehindBuffer
+
+URL = "https://n.news.naver.com/mnews/article/015/0005066001"
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = AsyncMongoMockClient()["articles_db"]
+    monkeypatch.setattr(Database, "client", database.client)
+    monkeypatch.setattr(Database, "article_collection", database["articles"])
+    monkeypatch.setattr(Database, "cross_edge_collection", database["cross_edges"])
+    monkeypatch.setattr(Database, "connected", True)
+    monkeypatch.setattr(Database, "write_buffer", None)
+    monkeypatch.setattr(Database, "_id_aliases", {})
+    monkeypatch.setattr(Database, "article_saved_hooks", [])
+    monkeypatch.setattr(Database, "article_deleted_hooks", [])
+    return database
+
+
+def article_data(content="금리 인하"):
+    return {"title": "기준금리 인하", "date": "2024.11.28", "url": URL, "content": content,
+            "hypergraph_data": {"nodes": [{"id": "금리", "importance": 0.9}], "edges": []}}
+
+
+def slow_upsert(monkeypatch, fail=False):
+    """기록이 시작되면 started 를 세우고 release 가 설정될 때까지 기록을 붙잡는 _upsert_articles"""
+    started, release = asyncio.Event(), asyncio.Event()
+    upsert = Database._upsert_articles
+
+    async def upsert_articles(cls, articles):
+        started.set()
+        await release.wait()
+        if fail:
+            raise RuntimeError("기록 실패")
+        return await upsert(articles)
+
+    monkeypatch.setattr(Database, "_upsert_articles", classmethod(upsert_articles))
+    return started, release
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_delete_during_flush_does_not_resurrect_article(database, monkeypatch, fail):
+    async def run():
+        started, release = slow_upsert(monkeypatch, fail=fail)
+        Database.enable_write_behind(max_batch=10, max_delay=60)
+        Database.write_buffer.max_retries = 0
+        try:
+            article_id = await Database.save_article(article_data())
+            flush = asyncio.ensure_future(Database.write_buffer.flush())
+            await started.wait()
+            delete = asyncio.ensure_future(Database.delete_article(article_id))
+            await asyncio.sleep(0.01)
+            # 기록이 끝나기 전에는 삭제가 끝나면 안 됨
+            assert not delete.done()
+            release.set()
+            flushed = await asyncio.gather(flush, return_exceptions=True)
+            deleted = await delete
+            pending = Database.write_buffer.stats()["pending"]
+        finally:
+            release.set()
+            await Database.write_buffer.close()
+            Database.write_buffer = None
+        return flushed, deleted, pending, await database["articles"].count_documents({})
+
+    flushed, deleted, pending, stored = asyncio.run(run())
+    assert isinstance(flushed[0], RuntimeError) == fail
+    assert deleted
+    assert pending == 0
+    assert stored == 0
+
+
+def test_put_at_max_pending_keeps_item_when_flush_fails():
+    async def failing_write(items):
+        raise RuntimeError("DB 장애")
+
+    async def run():
+        buffer = WriteBehindBuffer(failing_write, max_batch=10, max_delay=60, max_pending=2, max_retries=0)
+        await buffer.put("a")
+        # 대기 한도에 닿아 기록을 시도하지만 실패는 요청으로 올리지 않음
+        await buffer.put("b")
+        return buffer.stats()
+
+    stats = asyncio.run(run())
+    assert stats["pending"] == 2
+    assert stats["failed_batches"] == 1